@@ -9,7 +9,7 @@ import hashlib
 from datetime import datetime
 from core.models.structures import (
     SwingPointInfo, RawBreakoutInfo, B2BZoneInfo,
-    SwingType, SignalDirection, DetectionConfig, generate_zone_id
+    SwingType, SignalDirection, DetectionConfig, zone_keys, bar_times_ns, ns_times
 )
 
 def detect_b2b_zones(
@@ -29,11 +29,12 @@ def detect_b2b_zones(
         config = DetectionConfig()
 
     closes = df['close'].values
-    times = df['time'].values
+    times = bar_times_ns(df)
     n = len(closes)
     
-    # Pre-render timestamps for performance
-    py_times = [pd.Timestamp(t).to_pydatetime() for t in times]
+    # Swing times as int64 ns once; P4 bar times are materialized only for the emitted zones
+    st = np.array([s.time for s in swings], dtype='datetime64[ns]').view(np.int64)
+    stl = st.tolist() # Scalar comparisons in the candidate loops
     
     candidates = []
 
@@ -50,7 +51,7 @@ def detect_b2b_zones(
         p2 = None
         p2_idx = -1
         for j in range(i + 1, len(swings)):
-            if swings[j].time > p1.time and swings[j].type == SwingType.LOW:
+            if stl[j] > stl[i] and swings[j].type == SwingType.LOW:
                 p2 = swings[j]
                 p2_idx = j
                 break
@@ -60,7 +61,7 @@ def detect_b2b_zones(
         p3 = None
         p3_idx = -1
         for j in range(p2_idx + 1, len(swings)):
-            if swings[j].time > p2.time and swings[j].type == SwingType.HIGH:
+            if stl[j] > stl[p2_idx] and swings[j].type == SwingType.HIGH:
                 p3 = swings[j]
                 p3_idx = j
                 break
@@ -69,7 +70,7 @@ def detect_b2b_zones(
         # Find P5 (Older Low before P1 with price < P2)
         p5 = None
         for j in range(i - 1, -1, -1):
-            if swings[j].time < p1.time and swings[j].type == SwingType.LOW and swings[j].price < p2.price:
+            if stl[j] < stl[i] and swings[j].type == SwingType.LOW and swings[j].price < p2.price:
                 p5 = swings[j]
                 break
         if not p5: continue
@@ -83,21 +84,14 @@ def detect_b2b_zones(
             
         if len(p4_hits) > 0:
             p4_bar_idx = p3.bar_index + 1 + p4_hits[0]
-            p4_time = py_times[p4_bar_idx]
+            p4_time = times[p4_bar_idx]
         
-        if not p4_time: continue
+        if p4_time is None: continue
 
         # V5.1.2: No Interruption Check (No new swings between P3 and P4)
         # Optimized: Only check swings whose index is between p3 and p4
-        interrupted = False
-        # We can use the index in the swings list to quickly check
-        # But for robustness, we use the timestamp logic with NumPy if swings were converted
-        # For now, let's keep it simple but faster
-        for s in swings[i+1:]: # Only check swings AFTER P1
-            if s.time > p3.time and s.time < p4_time:
-                interrupted = True
-                break
-        if interrupted: continue
+        later = st[i + 1:] # Only check swings AFTER P1
+        if np.any((later > st[p3_idx]) & (later < p4_time)): continue
 
         # Early Fade Check: L2 price must not be broken (close-based) between P3 and P4
         l2_price = max(p1.price, p3.price)
@@ -122,7 +116,7 @@ def detect_b2b_zones(
         p2 = None
         p2_idx = -1
         for j in range(i + 1, len(swings)):
-            if swings[j].time > p1.time and swings[j].type == SwingType.HIGH:
+            if stl[j] > stl[i] and swings[j].type == SwingType.HIGH:
                 p2 = swings[j]
                 p2_idx = j
                 break
@@ -132,7 +126,7 @@ def detect_b2b_zones(
         p3 = None
         p3_idx = -1
         for j in range(p2_idx + 1, len(swings)):
-            if swings[j].time > p2.time and swings[j].type == SwingType.LOW:
+            if stl[j] > stl[p2_idx] and swings[j].type == SwingType.LOW:
                 p3 = swings[j]
                 p3_idx = j
                 break
@@ -141,7 +135,7 @@ def detect_b2b_zones(
         # Find P5 (Older High before P1 with price > P2)
         p5 = None
         for j in range(i - 1, -1, -1):
-            if swings[j].time < p1.time and swings[j].type == SwingType.HIGH and swings[j].price > p2.price:
+            if stl[j] < stl[i] and swings[j].type == SwingType.HIGH and swings[j].price > p2.price:
                 p5 = swings[j]
                 break
         if not p5: continue
@@ -155,17 +149,13 @@ def detect_b2b_zones(
             
         if len(p4_hits) > 0:
             p4_bar_idx = p3.bar_index + 1 + p4_hits[0]
-            p4_time = py_times[p4_bar_idx]
+            p4_time = times[p4_bar_idx]
         
-        if not p4_time: continue
+        if p4_time is None: continue
 
         # V5.1.2: No Interruption Check
-        interrupted = False
-        for s in swings[i+1:]:
-            if s.time > p3.time and s.time < p4_time:
-                interrupted = True
-                break
-        if interrupted: continue
+        later = st[i + 1:] # Only check swings AFTER P1
+        if np.any((later > st[p3_idx]) & (later < p4_time)): continue
 
         # Early Fade Check: L2 (min of P1, P3) must not be broken between P3 and P4
         l2_price = min(p1.price, p3.price)
@@ -184,20 +174,30 @@ def detect_b2b_zones(
     # =========================================================================
     # PASS 2: GENERATE B2B ZONE OBJECTS (NO GLOBAL SELECTION)
     # =========================================================================
-    zones = []
+    levels = []
     for c in candidates:
-        p1, p2, p3, p5 = c['p1'], c['p2'], c['p3'], c['p5']
+        p1, p3 = c['p1'], c['p3']
         direction = c['direction']
-        
         # Calculate L2 (The Stop level)
         l2_price = max(p1.price, p3.price) if direction == SignalDirection.BEARISH else min(p1.price, p3.price)
         l2_time = p1.time if (direction == SignalDirection.BEARISH and p1.price >= p3.price) or \
                             (direction == SignalDirection.BULLISH and p1.price <= p3.price) else p3.time
-                            
-        l1_price = p2.price
-        
+        levels.append((c['p2'].price, l2_price, l2_time))
+
+    # Keys and creation times for all zones in one vectorized pass each
+    created = ns_times([c['p4_time'] for c in candidates])
+    keys = zone_keys(
+        [l[0] for l in levels], [l[1] for l in levels], tf, [c['direction'] for c in candidates],
+        np.array([l[2] for l in levels], dtype='datetime64[ns]').view(np.int64),
+    ).tolist() if candidates else []
+
+    zones = []
+    for c, (l1_price, l2_price, l2_time), created_time, key in zip(candidates, levels, created, keys):
+        p2, p5 = c['p2'], c['p5']
+        direction = c['direction']
+
         zone = B2BZoneInfo(
-            zone_id=generate_zone_id(l1_price, l2_price, tf, direction, l2_time),
+            zone_id=key,
             timeframe=tf,
             direction=direction,
             L1_price=l1_price,
@@ -211,7 +211,7 @@ def detect_b2b_zones(
             second_barrier_bar_index=p5.bar_index,
             swing_between_price=l2_price,
             swing_between_time=l2_time,
-            zone_created_time=c['p4_time'],
+            zone_created_time=created_time,
             created_bar_index=c['p4_idx']
         )
         zones.append(zone)
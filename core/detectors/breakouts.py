@@ -3,10 +3,11 @@ SIGMA Raw Breakout Detector
 Port of RawBreakoutDetector.mqh → Python.
 Scans bars left-to-right, checks if each bar's close breaks any unbroken swing.
 """
+import numpy as np
 import pandas as pd
 from core.models.structures import (
     SwingPointInfo, RawBreakoutInfo, SwingType,
-    SignalDirection, DetectionConfig,
+    SignalDirection, DetectionConfig, bar_times_ns, ns_times,
 )
 
 
@@ -39,44 +40,51 @@ def detect_breakouts(
         config = DetectionConfig()
 
     closes = df['close'].values
-    times = df['time'].values
+    times = bar_times_ns(df)
     n = len(closes)
-    breakouts = []
-
-    for bar_idx in range(n):
-        bar_close = closes[bar_idx]
-        bar_time = pd.Timestamp(times[bar_idx]).to_pydatetime()
-
-        for swing in swings:
-            if swing.has_been_broken:
-                continue
-            if swing.time is None or swing.time >= bar_time:
-                continue
+    hits = []
+    swing_ns = np.array([s.time for s in swings], dtype='datetime64[ns]').view(np.int64)
 
-            if config.max_breakout_age > 0:
-                age = bar_idx - swing.bar_index
-                if age > config.max_breakout_age:
-                    continue
+    # A swing breaks on the first later bar whose close crosses it, whatever
+    # other swings do, so each swing is one forward search over the closes
+    # (in growing windows; most breaks are near). Times are compared as int64.
+    for order, swing in enumerate(swings):
+        if swing.has_been_broken or swing.time is None:
+            continue
+        start = int(np.searchsorted(times, swing_ns[order], side='right'))
+        end = n
+        if config.max_breakout_age > 0:
+            end = min(n, swing.bar_index + config.max_breakout_age + 1)
+        bullish = swing.type == SwingType.HIGH
+        if not bullish and swing.type != SwingType.LOW:
+            continue
 
-            is_bullish_break = (swing.type == SwingType.HIGH and bar_close > swing.price)
-            is_bearish_break = (swing.type == SwingType.LOW and bar_close < swing.price)
+        lo, width = start, 64
+        while lo < end:
+            hi = min(end, lo + width)
+            window = closes[lo:hi]
+            crossed = np.flatnonzero(window > swing.price if bullish else window < swing.price)
+            if len(crossed):
+                hits.append((lo + int(crossed[0]), order))
+                break
+            lo, width = hi, width * 4
 
-            if not (is_bullish_break or is_bearish_break):
-                continue
-
-            swing.has_been_broken = True
-            direction = SignalDirection.BULLISH if is_bullish_break else SignalDirection.BEARISH
-
-            breakouts.append(RawBreakoutInfo(
-                breakout_bar_time=bar_time,
-                breakout_bar_close_price=float(bar_close),
-                direction=direction,
-                broken_swing_price=swing.price,
-                broken_swing_time=swing.time,
-                broken_swing_close_price=swing.close_price,
-                broken_swing_type=swing.type,
-                breakout_bar_index=bar_idx,
-                broken_swing_bar_index=swing.bar_index,
-            ))
+    hits.sort()
+    bar_times = ns_times(times[[bar_idx for bar_idx, _ in hits]])
+    breakouts = []
+    for (bar_idx, order), bar_time in zip(hits, bar_times):
+        swing = swings[order]
+        swing.has_been_broken = True
+        breakouts.append(RawBreakoutInfo(
+            breakout_bar_time=bar_time,
+            breakout_bar_close_price=float(closes[bar_idx]),
+            direction=SignalDirection.BULLISH if swing.type == SwingType.HIGH else SignalDirection.BEARISH,
+            broken_swing_price=swing.price,
+            broken_swing_time=swing.time,
+            broken_swing_close_price=swing.close_price,
+            broken_swing_type=swing.type,
+            breakout_bar_index=bar_idx,
+            broken_swing_bar_index=swing.bar_index,
+        ))
 
     return breakouts
@@ -4,7 +4,7 @@ Port of B2BConfluence.mqh
 """
 
 from typing import List, Optional
-from ..models.structures import B2BZoneInfo, TF_RANK
+from ..models.structures import B2BZoneInfo, TF_RANK, NO_ZONE
 
 def get_zone_range(zone: B2BZoneInfo) -> tuple[float, float]:
     """Returns (min_price, max_price) for a zone."""
@@ -49,7 +49,7 @@ def detect_confluence(zones: List[B2BZoneInfo]) -> List[B2BZoneInfo]:
     for i, child in enumerate(sorted_zones):
         # Reset parent info
         child.is_inside_parent = False
-        child.parent_zone_id = ""
+        child.parent_zone_id = NO_ZONE
         child.parent_tf = ""
         child.parent_count = 0
         
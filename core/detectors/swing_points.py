@@ -3,46 +3,41 @@ SIGMA Swing Point Detector
 Port of SwingPointDetector.mqh → Vectorized Python.
 Uses CLOSE prices (not high/low) — this is the SIGMA doctrinal rule.
 """
+import numpy as np
 import pandas as pd
-from core.models.structures import SwingPointInfo, SwingType, DetectionConfig
+from core.models.structures import SwingPointInfo, SwingType, DetectionConfig, bar_times_ns, ns_times
 
 
 def detect_swings(df: pd.DataFrame, config: DetectionConfig = None) -> list[SwingPointInfo]:
     """
     Detect swing highs and lows using close prices.
     Uses a 3-bar local extrema check for highest sensitivity (The DNA).
+    Turns are found with array comparisons; datetimes are materialized in
+    one call for the emitted swings only.
     """
     if config is None:
         config = DetectionConfig()
 
     closes = df['close'].values
-    times = df['time'].values
-    n = len(closes)
+    times = bar_times_ns(df)
     swings = []
+    if len(closes) < 3:
+        return swings
 
-    # Bar-by-bar scan for local turns (Pivot logic)
-    for i in range(1, n - 1):
-        prev = closes[i - 1]
-        curr = closes[i]
-        nxt = closes[i + 1]
+    # Local turns (Pivot logic): strictly above/below both neighbours
+    curr = closes[1:-1]
+    peaks = (curr > closes[:-2]) & (curr > closes[2:])
+    valleys = (curr < closes[:-2]) & (curr < closes[2:])
 
-        # Local Peak
-        if curr > prev and curr > nxt:
-            swings.append(SwingPointInfo(
-                price=float(curr),
-                time=pd.Timestamp(times[i]).to_pydatetime(),
-                close_price=float(curr),
-                type=SwingType.HIGH,
-                bar_index=i,
-            ))
-        # Local Valley
-        elif curr < prev and curr < nxt:
-            swings.append(SwingPointInfo(
-                price=float(curr),
-                time=pd.Timestamp(times[i]).to_pydatetime(),
-                close_price=float(curr),
-                type=SwingType.LOW,
-                bar_index=i,
-            ))
+    turns = np.flatnonzero(peaks | valleys) + 1
+    for i, time in zip(turns.tolist(), ns_times(times[turns])):
+        price = float(closes[i])
+        swings.append(SwingPointInfo(
+            price=price,
+            time=time,
+            close_price=price,
+            type=SwingType.HIGH if peaks[i - 1] else SwingType.LOW,
+            bar_index=i,
+        ))
 
     return swings
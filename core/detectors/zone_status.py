@@ -6,6 +6,7 @@ Handles T1 (L1), T2 (50%), T3 (L2) touch tracking and structural invalidation.
 import numpy as np
 import pandas as pd
 from core.models.structures import B2BZoneInfo, SignalDirection
+from core.system.price_index import PriceRangeIndex
 
 def update_active_zones(current_low: float, current_high: float, current_close: float, current_time: pd.Timestamp, active_zones: list[B2BZoneInfo]):
     """
@@ -70,6 +71,167 @@ def update_active_zones(current_low: float, current_high: float, current_close:
         # Update Age
         zone.zone_age_bars += 1
 
+class ZoneStatusBatch:
+    """
+    update_active_zones for the active zones of many symbols in one numpy
+    pass per tick (the PortfolioBacktester's zone book).
+
+    Zone geometry, touch stage and owning symbol live in flat arrays; only
+    zones whose status changes on a tick are written back to their
+    B2BZoneInfo objects. Age increments are accumulated in the table and
+    added to zone_age_bars when a zone is invalidated or flush_ages() runs.
+    """
+
+    def __init__(self):
+        self.zones: list[B2BZoneInfo] = []
+        self.symbol = np.empty(0, dtype=np.int64)
+        self.order = np.empty(0, dtype=np.int64) # Position in the owner's flat active list (tf, admission)
+        self.bearish = np.empty(0, dtype=bool)
+        self.levels = np.empty((0, 3), dtype=np.float64) # L1, 50%, L2
+        self.stage = np.empty(0, dtype=np.int8)          # Touches so far (0..3)
+        self.age = np.empty(0, dtype=np.int64)           # Unflushed zone_age_bars increments
+        self.alive = np.empty(0, dtype=bool)
+        self._seq = 0
+        self._dead = 0
+        self._pending: list[tuple] = []
+
+    def add(self, symbol: int, group: int, zones: list[B2BZoneInfo]):
+        """
+        Adds valid zones of one symbol, in admission order. `group` is the
+        position of their timeframe in the symbol's active-zone dict.
+        Additions are buffered and join the arrays on the next update().
+        """
+        for z in zones:
+            stage = 3 if z.L2_touched else 2 if z.fifty_touched else 1 if z.L1_touched else 0
+            self._pending.append((z, symbol, (group << 40) + self._seq, z.direction == SignalDirection.BEARISH,
+                                  z.L1_price, z.fifty_percent, z.L2_price, stage))
+            self._seq += 1
+
+    def _append_pending(self):
+        zones, symbol, order, bearish, l1, fifty, l2, stage = zip(*self._pending)
+        self._pending = []
+        n = len(zones)
+        self.zones.extend(zones)
+        self.symbol = np.r_[self.symbol, symbol]
+        self.order = np.r_[self.order, order]
+        self.bearish = np.r_[self.bearish, bearish]
+        self.levels = np.vstack([self.levels, np.column_stack([l1, fifty, l2])])
+        self.stage = np.r_[self.stage, np.array(stage, dtype=np.int8)]
+        self.age = np.r_[self.age, np.zeros(n, dtype=np.int64)]
+        self.alive = np.r_[self.alive, np.ones(n, dtype=bool)]
+
+    def update(self, due: np.ndarray, low: np.ndarray, high: np.ndarray, close: np.ndarray,
+               current_time: pd.Timestamp) -> tuple[dict, set]:
+        """
+        Applies one tick to the zones of the `due` symbols (bool per symbol;
+        low/high/close are per-symbol bar prices). Returns ({symbol: zones
+        touched this tick, in active-list order}, symbols with invalidations).
+        """
+        if self._pending:
+            self._append_pending()
+        idx = np.flatnonzero(self.alive & due[self.symbol]) if len(self.zones) else np.empty(0, dtype=np.int64)
+        if not len(idx):
+            return {}, set()
+        sym = self.symbol[idx]
+        bear = self.bearish[idx]
+        l1, fifty, l2 = self.levels[idx].T
+        c = close[sym]
+        invalid = np.where(bear, c > l2, c < l2)
+        probe = np.where(bear, high[sym], low[sym])
+        sign = np.where(bear, 1.0, -1.0) # hit(level): probe reaches level from the zone's approach side
+
+        stage = self.stage[idx]
+        new = stage.copy()
+        ok = ~invalid
+        for k, level in enumerate((l1, fifty, l2)):
+            new[ok & (new == k) & (sign * probe >= sign * level)] = k + 1
+        self.stage[idx] = new
+        self.age[idx[ok]] += 1
+
+        dead = idx[invalid]
+        for k in dead:
+            zone = self.zones[k]
+            zone.is_invalidated = True
+            zone.is_valid = False
+            zone.invalidation_time = current_time
+            zone.zone_age_bars += int(self.age[k])
+        self.age[dead] = 0
+        self.alive[dead] = False
+        self._dead += len(dead)
+
+        touched = {}
+        moved = np.flatnonzero(new != stage)
+        for j in moved[np.lexsort((self.order[idx[moved]], sym[moved]))]:
+            zone = self.zones[idx[j]]
+            if stage[j] < 1 <= new[j]:
+                zone.L1_touched, zone.L1_touch_time = True, current_time
+            if stage[j] < 2 <= new[j]:
+                zone.fifty_touched, zone.fifty_touch_time = True, current_time
+            if new[j] == 3:
+                zone.L2_touched, zone.L2_touch_time = True, current_time
+            zone.touch_count = int(new[j])
+            touched.setdefault(int(sym[j]), []).append(zone)
+
+        if self._dead * 2 > len(self.zones):
+            self._compact()
+        return touched, {int(s) for s in sym[invalid]}
+
+    def flush_ages(self):
+        """Adds the accumulated age increments to zone_age_bars."""
+        for k in np.flatnonzero(self.age):
+            self.zones[k].zone_age_bars += int(self.age[k])
+        self.age[:] = 0
+
+    def _compact(self):
+        keep = self.alive
+        self.zones = [z for z, alive in zip(self.zones, keep) if alive]
+        for name in ('symbol', 'order', 'bearish', 'levels', 'stage', 'age', 'alive'):
+            setattr(self, name, getattr(self, name)[keep])
+        self._dead = 0
+
+
+def replay_zone_statuses(zones: list[B2BZoneInfo], times: pd.DatetimeIndex, wicks: PriceRangeIndex,
+                         closes: PriceRangeIndex, stop: int):
+    """
+    Exact equivalent of calling update_active_zones on every driver bar in
+    [0, stop), with each zone joining on the first bar at or after its
+    creation. Used to start a simulation mid-history with the zone book
+    (touches, invalidations, ages) it would have had; trade flags are left
+    as they are. `wicks` indexes high/low, `closes` indexes close/close.
+    Zones must be as detected.
+    """
+    for zone in zones:
+        if not zone.is_valid:
+            continue
+        start = int(times.searchsorted(zone.zone_created_time, side='left'))
+        if start >= stop:
+            continue
+
+        if zone.direction == SignalDirection.BEARISH:
+            # Invalidation: first close strictly above L2
+            end = closes.first_high_at_or_above(start, np.nextafter(zone.L2_price, np.inf), stop)
+            first_hit = wicks.first_high_at_or_above
+        else:
+            end = closes.first_low_at_or_below(start, np.nextafter(zone.L2_price, -np.inf), stop)
+            first_hit = wicks.first_low_at_or_below
+
+        # Touches progress T1 -> T2 -> T3 (same bar allowed) on bars before the invalidation bar
+        t1 = first_hit(start, zone.L1_price, end)
+        if t1 < end:
+            zone.L1_touched, zone.L1_touch_time, zone.touch_count = True, times[t1], 1
+            t2 = first_hit(t1, zone.fifty_percent, end)
+            if t2 < end:
+                zone.fifty_touched, zone.fifty_touch_time, zone.touch_count = True, times[t2], 2
+                t3 = first_hit(t2, zone.L2_price, end)
+                if t3 < end:
+                    zone.L2_touched, zone.L2_touch_time, zone.touch_count = True, times[t3], 3
+
+        zone.zone_age_bars += end - start
+        if end < stop:
+            zone.is_invalidated = True
+            zone.is_valid = False
+            zone.invalidation_time = times[end]
+
 def update_zone_statuses(df: pd.DataFrame, zones: list[B2BZoneInfo]):
     """
     Vectorized Audit Update: Calculates T1, T2, T3 touches for a list of zones
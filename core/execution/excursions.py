@@ -0,0 +1,67 @@
+"""
+SIGMA Excursion Tracker
+Bar-exact MFE / MAE for closed trades.
+
+Excursions are range queries over the driver high/low arrays between the
+open and close bars (inclusive: the open bar's wick is already live for SL
+checks), answered by a PriceRangeIndex so annotation costs O(1) block
+lookups per trade and never touches the bar loop.
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..system.price_index import PriceRangeIndex
+
+
+class ExcursionTracker:
+    """Fills mfe/mae fields on ClosedTrade records for one driver window."""
+
+    def __init__(self, times: np.ndarray, index: PriceRangeIndex):
+        self.times = np.asarray(times, dtype='datetime64[ns]')
+        self.index = index
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ExcursionTracker":
+        return cls(df.index.values, PriceRangeIndex(df['high'].to_numpy(), df['low'].to_numpy()))
+
+    def _bar(self, t: pd.Timestamp) -> int:
+        return int(np.searchsorted(self.times, np.datetime64(pd.Timestamp(t).as_unit('ns').value, 'ns')))
+
+    def annotate(self, trade, open_bar: Optional[int] = None, close_bar: Optional[int] = None):
+        """Sets MFE/MAE (points and currency) on `trade` in place."""
+        start = self._bar(trade.open_time) if open_bar is None else open_bar
+        stop = (self._bar(trade.close_time) if close_bar is None else min(close_bar, self.index.n - 1)) + 1
+        if stop <= start:
+            return trade
+
+        hi = self.index.range_max(start, stop)
+        lo = self.index.range_min(start, stop)
+        if trade.direction == 'BULLISH':
+            mfe, mae = hi - trade.entry_price, trade.entry_price - lo
+        else:
+            mfe, mae = trade.entry_price - lo, hi - trade.entry_price
+
+        trade.mfe_points = max(mfe, 0.0)
+        trade.mae_points = max(mae, 0.0)
+        trade.max_favorable_excursion = trade.mfe_points * trade.size
+        trade.max_adverse_excursion = trade.mae_points * trade.size
+        return trade
+
+    def annotate_all(self, trades: Iterable):
+        for t in trades:
+            self.annotate(t)
+
+
+class SymbolExcursions:
+    """Routes trades from a shared multi-symbol book to per-symbol trackers."""
+
+    def __init__(self, trackers: Dict[str, ExcursionTracker]):
+        self.trackers = trackers
+
+    def annotate(self, trade, open_bar: Optional[int] = None, close_bar: Optional[int] = None):
+        tracker = self.trackers.get(trade.symbol)
+        if tracker is not None:
+            tracker.annotate(trade, open_bar, close_bar)
+        return trade
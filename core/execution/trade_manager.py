@@ -1,6 +1,7 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from ..models.structures import NO_ZONE, zone_label
 from ..strategy.scanner import TradeSignal
 from ..risk.sizing import RiskCalculator
 
@@ -17,7 +18,7 @@ class Position:
     comment: str
     zone_id: int # Track which zone opened this
     be_active: bool = False # Track if Break-Even was already triggered
-    origin_id: str = "" # V6.0 Redundancy
+    origin_id: int = NO_ZONE # V6.0 Redundancy
     tf: str = ""        # V6.0 Redundancy
 
 @dataclass
@@ -33,8 +34,13 @@ class ClosedTrade:
     close_time: pd.Timestamp
     reason: str        # Exit Reason (SL/TP)
     entry_reason: str # Original Entry Reason (e.g. D1 Flow)
-    origin_id: str = "" # V6.0 Redundancy
+    origin_id: int = NO_ZONE # V6.0 Redundancy
     tf: str = ""        # V6.0 Redundancy
+    # Excursions over [open bar, close bar] (filled by ExcursionTracker)
+    mfe_points: float = 0.0
+    mae_points: float = 0.0
+    max_favorable_excursion: float = 0.0 # mfe_points * size
+    max_adverse_excursion: float = 0.0   # mae_points * size
 
 class TradeManager:
     """
@@ -42,13 +48,49 @@ class TradeManager:
     Replaces OrderManager.mqh & TrailingStopManager.mqh
     """
     
-    def __init__(self, risk_calc: RiskCalculator):
+    def __init__(self, risk_calc: RiskCalculator, ledger_sink=None, initial_balance: float = 10000.0):
         self.positions: List[Position] = []
         self.ledger: List[ClosedTrade] = []
         self._ticket_counter = 1
         self.risk = risk_calc
-        self.account_balance = 10000.0 # Standard Smoke Test Balance
+        self.account_balance = initial_balance # Default: Standard Smoke Test Balance
         self.equity_history: List[dict] = []
+        # Optional LedgerSink: closed trades stream to disk instead of self.ledger
+        self.ledger_sink = ledger_sink
+        # Optional ExcursionTracker: annotates MFE/MAE as trades close
+        self.excursions = None
+
+    def snapshot(self) -> dict:
+        """
+        Account state: balance, ticket counter, open positions, the in-memory
+        ledger and the equity curve (as compact arrays).
+        A streamed ledger is tracked by its sink, not here.
+        """
+        return {
+            'balance': self.account_balance,
+            'ticket': self._ticket_counter,
+            'positions': [replace(p) for p in self.positions],
+            'ledger': list(self.ledger),
+            'equity_times': pd.DatetimeIndex([e['timestamp'] for e in self.equity_history]),
+            'equity': [e['equity'] for e in self.equity_history],
+        }
+
+    def restore(self, snapshot: dict):
+        self.account_balance = snapshot['balance']
+        self._ticket_counter = snapshot['ticket']
+        self.positions = [replace(p) for p in snapshot['positions']]
+        self.ledger = list(snapshot['ledger'])
+        self.equity_history = [
+            {'timestamp': t, 'equity': e} for t, e in zip(snapshot['equity_times'], snapshot['equity'])
+        ]
+
+    def _record(self, trade: ClosedTrade):
+        if self.excursions is not None:
+            self.excursions.annotate(trade)
+        if self.ledger_sink is not None:
+            self.ledger_sink.append(trade)
+        else:
+            self.ledger.append(trade)
         
     def execute(self, signal: TradeSignal):
         """Simulate filling an order applying Risk Rules"""
@@ -70,7 +112,7 @@ class TradeManager:
         if size <= 0: return # Invalid trade
         
         # Avoid redundant trades on SAME ZONE if already open
-        if any(p.zone_id == signal.zone_id for p in self.positions):
+        if any(p.zone_id == signal.zone_id and p.symbol == signal.symbol for p in self.positions):
             return
 
         pos = Position(
@@ -82,7 +124,7 @@ class TradeManager:
             tp=signal.tp_price,
             size=size,
             open_time=signal.timestamp,
-            comment=f"{signal.tf}#{signal.zone_id} {signal.reason}",
+            comment=f"{signal.tf}#{zone_label(signal.zone_id)} {signal.reason}",
             zone_id=signal.zone_id,
             be_active=False,
             origin_id=signal.origin_id,
@@ -91,15 +133,22 @@ class TradeManager:
         self.positions.append(pos)
         self._ticket_counter += 1
         
-    def manage_positions(self, low: float, high: float, current_price: float, current_time: pd.Timestamp) -> List[ClosedTrade]:
+    def manage_positions(self, low: float, high: float, current_price: float, current_time: pd.Timestamp,
+                         symbol: Optional[str] = None) -> List[ClosedTrade]:
         """
         Check SL/TP and Trailing Stops using High/Low for triggers.
         Returns list of trades closed this tick.
+        symbol: Only manage this symbol's positions (shared portfolio book). The
+                caller then records equity once per tick via mark_to_market.
         """
         still_open = []
         just_closed = []
         
         for pos in self.positions:
+            if symbol is not None and pos.symbol != symbol:
+                still_open.append(pos)
+                continue
+
             closed = False
             exit_price = 0.0
             reason = ""
@@ -175,37 +224,49 @@ class TradeManager:
                     origin_id=pos.origin_id, # V6.0
                     tf=pos.tf                # V6.0
                 )
-                self.ledger.append(closed_trade)
+                self._record(closed_trade)
                 just_closed.append(closed_trade)
             else:
                 still_open.append(pos)
                 
         self.positions = still_open
+        if symbol is None:
+            self.mark_to_market(current_time, current_price)
         
-        # Calculate Floating PnL for MtM Equity
+        return just_closed
+
+    def mark_to_market(self, current_time: pd.Timestamp, marks: Union[float, Dict[str, float]]):
+        """
+        Track Equity Point (Mark-to-Market).
+        marks: One price for every position, or a {symbol: price} map.
+        """
         floating_pnl = 0.0
         for pos in self.positions:
+            price = marks[pos.symbol] if isinstance(marks, dict) else marks
             if pos.direction == 'BULLISH':
-                floating_pnl += (current_price - pos.entry_price) * pos.size
+                floating_pnl += (price - pos.entry_price) * pos.size
             else:
-                floating_pnl += (pos.entry_price - current_price) * pos.size
-        
-        # Track Equity Point (Mark-to-Market)
+                floating_pnl += (pos.entry_price - price) * pos.size
+
         self.equity_history.append({
             'timestamp': current_time,
             'equity': self.account_balance + floating_pnl
         })
-        
-        return just_closed
 
-    def force_close_all(self, current_price: float, current_time: pd.Timestamp) -> List[ClosedTrade]:
-        """Force-close all open positions at current market price."""
+    def mark_flat(self, timestamps):
+        """Equity points for bars skipped with no open position (equity == balance)."""
+        equity = self.account_balance + 0.0
+        self.equity_history.extend({'timestamp': t, 'equity': equity} for t in timestamps)
+
+    def force_close_all(self, current_price: Union[float, Dict[str, float]], current_time: pd.Timestamp) -> List[ClosedTrade]:
+        """Force-close all open positions at current market price (or a {symbol: price} map)."""
         closed_trades = []
         for pos in self.positions:
+            price = current_price[pos.symbol] if isinstance(current_price, dict) else current_price
             if pos.direction == 'BULLISH':
-                trade_pnl = (current_price - pos.entry_price) * pos.size
+                trade_pnl = (price - pos.entry_price) * pos.size
             else:
-                trade_pnl = (pos.entry_price - current_price) * pos.size
+                trade_pnl = (pos.entry_price - price) * pos.size
             
             self.account_balance += trade_pnl
             closed_trade = ClosedTrade(
@@ -213,7 +274,7 @@ class TradeManager:
                 symbol=pos.symbol,
                 direction=pos.direction,
                 entry_price=pos.entry_price,
-                exit_price=current_price,
+                exit_price=price,
                 size=pos.size,
                 pnl=trade_pnl,
                 open_time=pos.open_time,
@@ -223,11 +284,8 @@ class TradeManager:
                 origin_id=pos.origin_id, # V6.0
                 tf=pos.tf                # V6.0
             )
-            self.ledger.append(closed_trade)
+            self._record(closed_trade)
             closed_trades.append(closed_trade)
             
         self.positions = []
         return closed_trades
-        self.positions = []
-        # Update final equity
-        self.equity_history.append({'timestamp': current_time, 'equity': self.account_balance})
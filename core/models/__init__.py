@@ -1,5 +1,6 @@
 from core.models.structures import (
-    SwingPointInfo, RawBreakoutInfo, B2BZoneInfo,
+    SwingPointInfo, RawBreakoutInfo, B2BZoneInfo, ZoneTradeOutcome, ZONE_FIELDS, OUTCOME_FIELDS,
     SignalDirection, SwingType, DetectionConfig, DetectionContext,
-    TF_HIERARCHY, TF_RANK, generate_zone_id,
+    TF_HIERARCHY, TF_RANK, NO_ZONE, generate_zone_id, zone_keys, zone_label,
+    bar_times_ns, ns_times,
 )
@@ -3,11 +3,11 @@ SIGMA-Crypto-ASCEND Core Data Models
 Port of V5.0 Structures.mqh → Python dataclasses.
 Only essential fields for detection + backtesting + statistics.
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum, IntEnum
 from typing import Dict, List, Optional
-import hashlib
+import numpy as np
 import pandas as pd
 
 
@@ -27,6 +27,22 @@ TF_HIERARCHY = ["MN1", "W1", "D1", "H4", "H1", "M30", "M15", "M5", "M1"]
 
 TF_RANK = {tf: i for i, tf in enumerate(TF_HIERARCHY)}
 
+NO_ZONE = 0  # Zone key meaning "no zone" (never generated)
+
+
+def bar_times_ns(df: pd.DataFrame) -> np.ndarray:
+    """Bar open times as int64 epoch-ns, from the `time` column or the index."""
+    times = df['time'].to_numpy() if 'time' in df.columns else df.index.to_numpy()
+    return times.astype('datetime64[ns]', copy=False).view(np.int64)
+
+
+def ns_times(ns: np.ndarray) -> list:
+    """
+    Materializes int64 epoch-ns times as datetimes in one vectorized call
+    (only for the structures a detector emits).
+    """
+    return np.asarray(ns, dtype=np.int64).view('datetime64[ns]').astype('datetime64[us]').tolist()
+
 
 @dataclass
 class SwingPointInfo:
@@ -60,9 +76,36 @@ class RawBreakoutInfo:
         return self.direction != SignalDirection.NONE and self.broken_swing_time is not None
 
 
-@dataclass
+@dataclass(slots=True)
+class ZoneTradeOutcome:
+    """Trade result of one zone. Attached on first write: most zones never trade."""
+    entry_level_used: str = ""
+    entry_price: float = 0.0
+    sl_price: float = 0.0
+    tp_price: float = 0.0
+    exit_price: float = 0.0
+    exit_reason: str = ""
+    trade_open_time: datetime = None
+    trade_close_time: datetime = None
+    pnl_points: float = 0.0
+    pnl_money: float = 0.0
+    rr_planned: float = 0.0
+    rr_achieved: float = 0.0
+    max_adverse_excursion: float = 0.0
+    max_favorable_excursion: float = 0.0
+
+
+@dataclass(slots=True)
 class B2BZoneInfo:
-    zone_id: str = ""
+    """
+    One B2B zone: detection geometry, fixed once confirmed, plus the
+    lifecycle state updated bar by bar. Slotted (no per-zone __dict__).
+    The trade-outcome fields (pnl_money, exit_reason, ...) still read and
+    write as attributes, and are accepted as keyword arguments, but live in
+    a ZoneTradeOutcome created on first write; until then they read as
+    their defaults.
+    """
+    zone_id: int = NO_ZONE
     timeframe: str = ""
     direction: SignalDirection = SignalDirection.NONE
 
@@ -91,7 +134,7 @@ class B2BZoneInfo:
 
     has_narrative_parent: bool = False
     has_control_parent: bool = False
-    parent_zone_id: str = ""
+    parent_zone_id: int = NO_ZONE
     is_inside_parent: bool = False
     parent_tf: str = ""
     parent_count: int = 0
@@ -110,25 +153,106 @@ class B2BZoneInfo:
     session_created: str = ""
 
     was_traded: bool = False
-    entry_level_used: str = ""
-    entry_price: float = 0.0
-    sl_price: float = 0.0
-    tp_price: float = 0.0
-    exit_price: float = 0.0
-    exit_reason: str = ""
-    trade_open_time: datetime = None
-    trade_close_time: datetime = None
-    pnl_points: float = 0.0
-    pnl_money: float = 0.0
-    rr_planned: float = 0.0
-    rr_achieved: float = 0.0
-    max_adverse_excursion: float = 0.0
-    max_favorable_excursion: float = 0.0
 
+    # Trade outcome (lazy), after the positional fields
+    outcome: Optional[ZoneTradeOutcome] = field(default=None, kw_only=True)
+
+    @property
+    def label(self) -> str:
+        """Hex display form of zone_id (built on demand, for logs and charts)."""
+        return zone_label(self.zone_id)
+
+    def as_dict(self) -> dict:
+        """Flat {field: value}, trade-outcome fields included (what vars() gave before slots)."""
+        row = {name: getattr(self, name) for name in ZONE_FIELDS}
+        row.update((name, getattr(self, name)) for name in OUTCOME_FIELDS)
+        return row
+
+
+def _outcome_attribute(name: str, default) -> property:
+    def get(zone):
+        outcome = zone.outcome
+        return default if outcome is None else getattr(outcome, name)
 
-def generate_zone_id(L1: float, L2: float, tf: str, direction: SignalDirection, time: datetime) -> str:
-    raw = f"{L1:.8f}_{L2:.8f}_{tf}_{direction.value}_{time}"
-    return hashlib.md5(raw.encode()).hexdigest()[:12]
+    def set_(zone, value):
+        if zone.outcome is None:
+            if value == default:
+                return
+            zone.outcome = ZoneTradeOutcome()
+        setattr(zone.outcome, name, value)
+
+    return property(get, set_, doc=f"ZoneTradeOutcome.{name} (default until the outcome is attached)")
+
+
+def _init_with_outcome(init):
+    """Lets the generated __init__ take the outcome fields as keyword-only arguments."""
+    def __init__(self, *args, **kwargs):
+        outcome = {name: kwargs.pop(name) for name in OUTCOME_FIELDS if name in kwargs}
+        init(self, *args, **kwargs)
+        for name, value in outcome.items():
+            setattr(self, name, value)
+
+    __init__.__qualname__ = init.__qualname__
+    __init__.__doc__ = init.__doc__
+    return __init__
+
+
+ZONE_FIELDS = tuple(f.name for f in fields(B2BZoneInfo) if f.name != 'outcome')
+OUTCOME_FIELDS = tuple(f.name for f in fields(ZoneTradeOutcome))
+for _f in fields(ZoneTradeOutcome):
+    setattr(B2BZoneInfo, _f.name, _outcome_attribute(_f.name, _f.default))
+B2BZoneInfo.__init__ = _init_with_outcome(B2BZoneInfo.__init__)
+
+
+_DIRECTION_CODES = {SignalDirection.NONE: 0, SignalDirection.BULLISH: 1, SignalDirection.BEARISH: 2}
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix64(h: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer on uint64 arrays (wrapping arithmetic)."""
+    h = (h ^ (h >> np.uint64(30))) * _MIX1
+    h = (h ^ (h >> np.uint64(27))) * _MIX2
+    return h ^ (h >> np.uint64(31))
+
+
+def zone_keys(L1, L2, tf: str, direction, time_ns) -> np.ndarray:
+    """
+    Deterministic 64-bit zone keys (int64) for arrays of L1, L2, direction
+    and L2 swing time (int64 epoch ns) on one timeframe. Prices enter at
+    1e-8 resolution, so float noise below that does not change a key.
+    """
+    L1 = np.atleast_1d(np.asarray(L1, dtype=np.float64))
+    if isinstance(direction, SignalDirection):
+        direction = np.full(len(L1), _DIRECTION_CODES[direction], dtype=np.uint64)
+    else:
+        direction = np.array([_DIRECTION_CODES[d] for d in direction], dtype=np.uint64)
+    parts = (
+        np.round(L1 * 1e8).astype(np.int64).view(np.uint64),
+        np.round(np.atleast_1d(np.asarray(L2, dtype=np.float64)) * 1e8).astype(np.int64).view(np.uint64),
+        np.uint64(int.from_bytes(tf.encode()[:8], 'little')),
+        direction,
+        np.atleast_1d(np.asarray(time_ns, dtype=np.int64)).view(np.uint64),
+    )
+    h = np.zeros(len(L1), dtype=np.uint64)
+    for part in parts:
+        h = _mix64((h ^ part) + _GOLDEN)
+    keys = h.view(np.int64)
+    keys[keys == NO_ZONE] = 1
+    return keys
+
+
+def generate_zone_id(L1: float, L2: float, tf: str, direction: SignalDirection, time: datetime) -> int:
+    """Key of a single zone (see zone_keys)."""
+    return int(zone_keys([L1], [L2], tf, direction, [pd.Timestamp(time).value])[0])
+
+
+def zone_label(zone_id) -> str:
+    """Display form of a zone key: 16 hex digits (other ids pass through as text)."""
+    if isinstance(zone_id, (int, np.integer)):
+        return f"{int(zone_id) & 0xFFFFFFFFFFFFFFFF:016x}"
+    return str(zone_id)
 
 
 @dataclass
@@ -137,13 +261,13 @@ class FlowState:
     Snapshot of the Narrative Flow for a specific timeframe.
     Port of MQL5 FlowState struct.
     """
-    origin_id: str = "" # zone_id is string (hex) in Python
+    origin_id: int = NO_ZONE # Zone keys (int64, see zone_keys)
     origin_dir: SignalDirection = SignalDirection.NONE
     origin_touch_time: pd.Timestamp = pd.Timestamp.min
     details_origin_price: float = 0.0
     details_origin_L2: float = 0.0
     
-    magnet_id: str = ""
+    magnet_id: int = NO_ZONE
     magnet_dir: SignalDirection = SignalDirection.NONE
     details_magnet_price: float = 0.0
     details_magnet_L2: float = 0.0
@@ -152,11 +276,11 @@ class FlowState:
     magnet_L2_touched: bool = False
     is_magnet_extreme: bool = False # V5.8
     
-    outpost_id: str = ""
+    outpost_id: int = NO_ZONE
     outpost_touch_time: pd.Timestamp = pd.Timestamp.min
     details_outpost_price: float = 0.0
     
-    roadblock_id: str = ""
+    roadblock_id: int = NO_ZONE
     anchor_is_traded: bool = False # V5.7: Safety Trigger
     is_siege_active: bool = False # V5.5
     is_valid: bool = False
@@ -168,22 +292,22 @@ class FlowState:
 
     def reset(self):
         """Resets the state to initial values (keeps the latch)."""
-        self.origin_id = ""
+        self.origin_id = NO_ZONE
         self.origin_dir = SignalDirection.NONE
         self.origin_touch_time = pd.Timestamp.min
         self.details_origin_price = 0.0
         self.details_origin_L2 = 0.0
-        self.magnet_id = ""
+        self.magnet_id = NO_ZONE
         self.magnet_dir = SignalDirection.NONE
         self.details_magnet_price = 0.0
         self.details_magnet_L2 = 0.0
         self.magnet_fifty_touched = False
         self.magnet_L2_touched = False
         self.is_magnet_extreme = False
-        self.outpost_id = ""
+        self.outpost_id = NO_ZONE
         self.outpost_touch_time = pd.Timestamp.min
         self.details_outpost_price = 0.0
-        self.roadblock_id = ""
+        self.roadblock_id = NO_ZONE
         self.anchor_is_traded = False
         self.is_siege_active = False
         self.is_valid = False
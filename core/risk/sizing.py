@@ -1,5 +1,9 @@
 from dataclasses import dataclass, field
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
+
+# V5.9.1 Diagnosis revealed 123 concurrent trades caused -99% DD.
+# We cap at 10 to prevent "Consensus Overload".
+MAX_CONCURRENT_TRADES = 10
 
 @dataclass
 class RiskConfig:
@@ -18,6 +22,19 @@ class SymbolParams:
     trail_activation: float = 0.0 # Points profit to start trailing
     trail_distance: float = 0.0   # Distance to trail behind price
 
+def default_symbol_params() -> Dict[str, SymbolParams]:
+    """Fresh copy of the built-in symbol table."""
+    return {
+        'BTCUSDT': SymbolParams(
+            sl_buffer=200.0,
+            be_activation=1500.0,
+            be_lockin=150.0,
+            trail_activation=2500.0,
+            trail_distance=1200.0
+        ), 
+        'XAUUSD': SymbolParams(sl_buffer=4.0),    
+    }
+
 class RiskCalculator:
     """
     The SHIELD.
@@ -29,19 +46,15 @@ class RiskCalculator:
     3. Trade Management Parameters
     """
     
-    def __init__(self, config: RiskConfig):
+    def __init__(self, config: RiskConfig, symbols: Optional[Dict[str, SymbolParams]] = None,
+                 max_concurrent: int = MAX_CONCURRENT_TRADES):
         self.cfg = config
         # Symbol Specific definitions (Centralized Risk Parameters)
-        self.symbols: Dict[str, SymbolParams] = {
-            'BTCUSDT': SymbolParams(
-                sl_buffer=200.0,
-                be_activation=1500.0,
-                be_lockin=150.0,
-                trail_activation=2500.0,
-                trail_distance=1200.0
-            ), 
-            'XAUUSD': SymbolParams(sl_buffer=4.0),    
-        }
+        # `symbols` overrides/extends the defaults (e.g. per-perp params for portfolios)
+        self.symbols: Dict[str, SymbolParams] = default_symbol_params()
+        if symbols:
+            self.symbols.update(symbols)
+        self.max_concurrent = max_concurrent
         
     def calculate_sl_and_size(self, symbol: str, entry: float, structure_l2: float, direction: str, account_balance: float) -> Tuple[float, float]:
         """
@@ -87,11 +100,7 @@ class RiskCalculator:
         Returns False if risk limits are exceeded.
         """
         # 1. Hard Cap (Concurrency)
-        # V5.9.1 Diagnosis revealed 123 concurrent trades caused -99% DD.
-        # We cap at 10 to prevent "Consensus Overload".
-        MAX_CONCURRENT_TRADES = 10 
-        
-        if len(current_trades) >= MAX_CONCURRENT_TRADES:
+        if len(current_trades) >= self.max_concurrent:
             return False
             
         # 2. Daily Circuit Breaker (Future expansion)
@@ -1,15 +1,30 @@
 import pandas as pd
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
 from core.models.structures import B2BZoneInfo, SignalDirection
 
 class EfficiencyGovernor:
     """
     Manages Tactical Tier Gating, Temporal Muting, and Structural Gaskets.
+    One instance per orchestrator: no state is shared between runs.
     """
-    
-    # Global registry for structural blocks: {(symbol, timeframe, direction): True}
-    # [INTERNAL NOTE]: Part of Phase 12D Structural Memory. Remove if reverting to timer-based.
-    _structural_blocks: Dict[Tuple[str, str, SignalDirection], bool] = {}
+
+    def __init__(self, gasket_multiple: float = 3.0):
+        # Pillar 3 elasticity limit in multiples of zone depth (sweepable)
+        self.gasket_multiple = gasket_multiple
+        # Registry for structural blocks: {(symbol, timeframe, direction): True}
+        # [INTERNAL NOTE]: Part of Phase 12D Structural Memory. Remove if reverting to timer-based.
+        self._structural_blocks: Dict[Tuple[str, str, SignalDirection], bool] = {}
+
+    def reset(self):
+        """Clears all structural blocks (start of a new run)."""
+        self._structural_blocks.clear()
+
+    def snapshot(self) -> dict:
+        """Copy of the mutable state, restorable with restore()."""
+        return {'structural_blocks': dict(self._structural_blocks)}
+
+    def restore(self, snapshot: Optional[dict]):
+        self._structural_blocks = dict(snapshot['structural_blocks']) if snapshot else {}
 
     @staticmethod
     def is_tier_allowed(tf: str, trigger_type: str) -> bool:
@@ -32,41 +47,37 @@ class EfficiencyGovernor:
         # Default: Allow other TFs (HTF shouldn't be triggering anyway in V6.7)
         return True
 
-    @staticmethod
-    def is_temporally_clean(tf: str, symbol: str, direction: SignalDirection, current_time: pd.Timestamp) -> bool:
+    def is_temporally_clean(self, tf: str, symbol: str, direction: SignalDirection, current_time: pd.Timestamp) -> bool:
         """
         PILLAR 2: Structural Memory (Cooldown).
         Checks if the timeframe is currently restricted due to a previous failure.
         This block persists UNTIL a new structure is formed (reset_cooldown).
         """
         key = (symbol, tf, direction)
-        return not EfficiencyGovernor._structural_blocks.get(key, False)
+        return not self._structural_blocks.get(key, False)
 
-    @staticmethod
-    def report_trade_failure(symbol: str, tf: str, direction: SignalDirection, current_time: pd.Timestamp):
+    def report_trade_failure(self, symbol: str, tf: str, direction: SignalDirection, current_time: pd.Timestamp):
         """
         Registers a trade failure and activates the Structural Block.
         [INTERNAL NOTE]: Phase 12D Structural Memory - Mutes until reset.
         """
         key = (symbol, tf, direction)
-        EfficiencyGovernor._structural_blocks[key] = True
+        self._structural_blocks[key] = True
 
-    @staticmethod
-    def reset_cooldown(symbol: str, tf: str, direction: SignalDirection):
+    def reset_cooldown(self, symbol: str, tf: str, direction: SignalDirection):
         """
         Clears the structural block for a specific TF/Dir.
         Called when a NEW structure forms (Safety Interrupt).
         """
         key = (symbol, tf, direction)
-        if key in EfficiencyGovernor._structural_blocks:
-            del EfficiencyGovernor._structural_blocks[key]
+        if key in self._structural_blocks:
+            del self._structural_blocks[key]
 
-    @staticmethod
-    def is_spatially_efficient(current_price: float, zone: B2BZoneInfo) -> Tuple[bool, str]:
+    def is_spatially_efficient(self, current_price: float, zone: B2BZoneInfo) -> Tuple[bool, str]:
         """
         PILLAR 3: Structural Gasket (Anti-Chase).
         Veto entry if the price has moved too far from the anchor (Elasticity).
-        Target: Block entries > 3.0x the zone depth (L1-L2).
+        Target: Block entries > gasket_multiple (default 3.0) x the zone depth (L1-L2).
         """
         depth = abs(zone.L1_price - zone.L2_price)
         
@@ -76,7 +87,7 @@ class EfficiencyGovernor:
             
         dist = abs(current_price - zone.L1_price)
         
-        if dist > (3.0 * depth):
+        if dist > (self.gasket_multiple * depth):
             ratio = dist / depth
             return False, f"Structural Gasket: Elasticity Exhausted ({ratio:.1f}x Depth)"
             
@@ -1,6 +1,6 @@
 import pandas as pd
 from typing import List, Optional, Dict
-from ...models.structures import B2BZoneInfo, SignalDirection, FlowState
+from ...models.structures import B2BZoneInfo, SignalDirection, FlowState, NO_ZONE
 
 class FractureEngine:
     """
@@ -8,14 +8,14 @@ class FractureEngine:
     """
     
     @staticmethod
-    def get_zone_by_id(zone_id: str, zones: List[B2BZoneInfo]) -> Optional[B2BZoneInfo]:
+    def get_zone_by_id(zone_id: int, zones: List[B2BZoneInfo]) -> Optional[B2BZoneInfo]:
         for z in zones:
             if z.zone_id == zone_id:
                 return z
         return None
 
     @staticmethod
-    def get_latest_outpost(tf: str, direction: SignalDirection, current_price: float, after_time: pd.Timestamp, zones: List[B2BZoneInfo]) -> Optional[str]:
+    def get_latest_outpost(tf: str, direction: SignalDirection, current_price: float, after_time: pd.Timestamp, zones: List[B2BZoneInfo]) -> Optional[int]:
         best_zone = None
         best_time = after_time
         for z in zones:
@@ -32,11 +32,11 @@ class FractureEngine:
         return None
 
     @staticmethod
-    def is_inside_opposing_zone(tf: str, direction: SignalDirection, price: float, zones: List[B2BZoneInfo], siege_magnet_id: str = "") -> str:
+    def is_inside_opposing_zone(tf: str, direction: SignalDirection, price: float, zones: List[B2BZoneInfo], siege_magnet_id: int = NO_ZONE) -> int:
         opp_dir = SignalDirection.BEARISH if direction == SignalDirection.BULLISH else SignalDirection.BULLISH
         
         # MN1 Trade: Ignores everything
-        if tf == 'MN1': return ""
+        if tf == 'MN1': return NO_ZONE
         
         check_mn1 = True
         check_w1 = (tf == 'D1') # Standard Hierarchy
@@ -60,11 +60,11 @@ class FractureEngine:
             low = min(z.L1_price, z.L2_price)
             
             if low <= price <= high:
-                if siege_magnet_id != "" and z.zone_id == siege_magnet_id:
+                if siege_magnet_id != NO_ZONE and z.zone_id == siege_magnet_id:
                     continue
                 return z.zone_id
                 
-        return ""
+        return NO_ZONE
 
     @staticmethod
     def update_magnet_info(tf: str, state: FlowState, current_price: float, zones: List[B2BZoneInfo]):
@@ -109,7 +109,7 @@ class FractureEngine:
                              state.is_magnet_extreme = False
                              break
         else:
-            state.magnet_id = ""
+            state.magnet_id = NO_ZONE
             state.details_magnet_L2 = 0.0
             state.magnet_fifty_touched = False
             state.magnet_L2_touched = False
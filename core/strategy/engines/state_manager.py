@@ -1,6 +1,6 @@
 import pandas as pd
 from typing import List, Dict
-from ...models.structures import B2BZoneInfo, SignalDirection, FlowState
+from ...models.structures import B2BZoneInfo, SignalDirection, FlowState, NO_ZONE
 from .fracture_engine import FractureEngine
 
 class StateManager:
@@ -17,7 +17,7 @@ class StateManager:
         Ported from StrategyOrchestrator._update_flow.
         """
         # 1. Sticky Validation: Keep current origin if valid and not broken
-        if state.is_valid and state.origin_id != "":
+        if state.is_valid and state.origin_id != NO_ZONE:
             curr = self.fracture.get_zone_by_id(state.origin_id, zones)
             if curr and curr.is_valid:
                 is_broken = (curr.direction == SignalDirection.BULLISH and current_price < curr.L2_price) or \
@@ -25,7 +25,7 @@ class StateManager:
                 if not is_broken:
                     # Update Anchor Status
                     outpost_id = self.fracture.get_latest_outpost(tf, state.origin_dir, current_price, curr.zone_created_time, zones)
-                    state.outpost_id = outpost_id or ""
+                    state.outpost_id = outpost_id or NO_ZONE
                     anchor = self.fracture.get_zone_by_id(outpost_id, zones) if outpost_id else curr
                     
                     if outpost_id:
@@ -49,7 +49,7 @@ class StateManager:
 
     def _process_siege_state(self, state: FlowState, zones: List[B2BZoneInfo]):
         """Handles the Siege Mode activation."""
-        if state.magnet_id != "":
+        if state.magnet_id != NO_ZONE:
             magnet_zone = self.fracture.get_zone_by_id(state.magnet_id, zones)
             if magnet_zone and magnet_zone.L1_touched:
                 op_time = state.outpost_touch_time if state.outpost_touch_time is not None else pd.Timestamp.min
@@ -67,7 +67,7 @@ class StateManager:
         successor_id = self.fracture.get_latest_outpost(tf, state.origin_dir, current_price, curr.zone_created_time, zones)
         if successor_id:
             state.origin_id = successor_id
-            state.magnet_id = ""
+            state.magnet_id = NO_ZONE
             state.is_siege_active = False
             succ = self.fracture.get_zone_by_id(successor_id, zones)
             state.anchor_is_traded = succ.L1_touched if succ else False
@@ -114,7 +114,7 @@ class StateManager:
         
         # Initial Anchor Status
         outpost_id = self.fracture.get_latest_outpost(tf, state.origin_dir, current_price, best_origin.zone_created_time, zones)
-        state.outpost_id = outpost_id or ""
+        state.outpost_id = outpost_id or NO_ZONE
         anchor = self.fracture.get_zone_by_id(outpost_id, zones) if outpost_id else best_origin
         if outpost_id: 
             state.outpost_touch_time = anchor.L1_touch_time or pd.Timestamp.min
@@ -1,6 +1,6 @@
 import pandas as pd
 from typing import List, Dict, Optional
-from ..models.structures import B2BZoneInfo, SignalDirection, FlowState
+from ..models.structures import B2BZoneInfo, SignalDirection, FlowState, NO_ZONE, zone_label
 from .engines.fracture_engine import FractureEngine
 from .engines.state_manager import StateManager
 from .engines.efficiency_governor import EfficiencyGovernor
@@ -11,9 +11,12 @@ class StrategyOrchestrator:
     V6.7: Inertial Flow (Structural Memory) + Modular Engines.
     """
     
-    def __init__(self, tf_state=None, symbol: str = "BTCUSDT"):
+    def __init__(self, tf_state=None, symbol: str = "BTCUSDT", heartbeat: bool = True,
+                 governor: Optional[EfficiencyGovernor] = None):
         self.tf_state = tf_state
         self.symbol = symbol
+        self.heartbeat = heartbeat # Console heartbeat (off for multi-symbol runs)
+        self.governor = governor or EfficiencyGovernor() # Per-run gating state
         self.states: Dict[str, FlowState] = {
             tf: FlowState() for tf in ["MN1", "W1", "D1", "H4", "H1", "M30"]
         }
@@ -25,27 +28,52 @@ class StrategyOrchestrator:
         self.fracture = FractureEngine()
         self.manager = StateManager({'fracture': self.fracture})
         
-    def blacklist_origin(self, origin_id: str, tf: str):
+    def blacklist_origin(self, origin_id: int, tf: str):
         if tf in self.blacklisted_origins and origin_id:
             self.blacklisted_origins[tf].add(origin_id)
 
+    def reset(self):
+        """Returns the orchestrator to its freshly constructed state (flow, blacklist, governor)."""
+        for tf in self.states:
+            self.states[tf] = FlowState()
+            self.blacklisted_origins[tf] = set()
+        self.governor.reset()
+
+    def snapshot(self) -> dict:
+        """Copy of all mutable run state, restorable with restore()."""
+        return {
+            'flow': {tf: vars(s).copy() for tf, s in self.states.items()},
+            'blacklist': {tf: set(ids) for tf, ids in self.blacklisted_origins.items()},
+            'governor': self.governor.snapshot(),
+        }
+
+    def restore(self, snapshot: dict):
+        for tf, fields in snapshot['flow'].items():
+            self.states[tf] = FlowState(**fields)
+        self.blacklisted_origins = {tf: set(ids) for tf, ids in snapshot['blacklist'].items()}
+        self.governor.restore(snapshot['governor'])
+
+    def snapshot_flow(self) -> List[dict]:
+        """Cheap comparable copy of all FlowStates (every field is immutable)."""
+        return [vars(s).copy() for s in self.states.values()]
+
     def update_flow_state(self, tf_zones: Dict[str, List[B2BZoneInfo]], current_price: float, current_time: pd.Timestamp):
         for tf in self.states.keys():
             old_origin = self.states[tf].origin_id
             self.manager.update_timeframe_flow(tf, self.states[tf], tf_zones.get(tf, []), current_price)
             
             # Phase 12B: Safety Interrupt - Reset cooldown on new structure idea
-            if self.states[tf].origin_id != old_origin and self.states[tf].origin_id != "":
-                EfficiencyGovernor.reset_cooldown(self.symbol, tf, self.states[tf].origin_dir)
+            if self.states[tf].origin_id != old_origin and self.states[tf].origin_id != NO_ZONE:
+                self.governor.reset_cooldown(self.symbol, tf, self.states[tf].origin_dir)
 
             # Update roadblocks using the global context
             self.states[tf].roadblock_id = self.fracture.is_inside_opposing_zone(
                 tf, self.states[tf].origin_dir, current_price, 
                 [z for zones_list in tf_zones.values() for z in zones_list],
-                siege_magnet_id=self.states[tf].magnet_id if self.states[tf].is_siege_active else ""
+                siege_magnet_id=self.states[tf].magnet_id if self.states[tf].is_siege_active else NO_ZONE
             )
             
-        if current_time.minute % 30 == 0 and current_time.second == 0:
+        if self.heartbeat and current_time.minute % 30 == 0 and current_time.second == 0:
             self._print_heartbeat(current_time)
 
     def _validate_trap(self, trap: B2BZoneInfo, narrative: FlowState, flow_tf: str, is_fader: bool = False, is_flow_liberated: bool = False) -> bool:
@@ -61,7 +89,7 @@ class StrategyOrchestrator:
             freshness_baseline = narrative.magnet_touch_time
         else:
             freshness_baseline = narrative.origin_touch_time
-            if narrative.outpost_id != "":
+            if narrative.outpost_id != NO_ZONE:
                 if narrative.outpost_touch_time > pd.Timestamp.min:
                      freshness_baseline = narrative.outpost_touch_time
                 else:
@@ -72,7 +100,7 @@ class StrategyOrchestrator:
             
         # 2. Roadblock check
         # V6.7: In Liberated Flow (Inertial), we bypass roadblocks as we are "Bulldozing".
-        if not is_flow_liberated and narrative.roadblock_id != "":
+        if not is_flow_liberated and narrative.roadblock_id != NO_ZONE:
             return False
 
         # 3. Hierarchy Alignment (H4/H1/M30 must align with D1/W1 Latches)
@@ -119,7 +147,7 @@ class StrategyOrchestrator:
              else:
                  if trap.L1_price >= narrative.details_origin_price - epsilon: is_origin_nested = True
              
-             if not is_origin_nested and narrative.outpost_id != "" and narrative.anchor_is_traded:
+             if not is_origin_nested and narrative.outpost_id != NO_ZONE and narrative.anchor_is_traded:
                  if trap.direction == SignalDirection.BULLISH:
                      if trap.L1_price <= narrative.details_outpost_price + epsilon: is_outpost_nested = True
                  else:
@@ -130,7 +158,7 @@ class StrategyOrchestrator:
             
         return True
 
-    def is_trade_allowed(self, signal_tf: str, direction: SignalDirection, zone: B2BZoneInfo, current_price: float, current_time: pd.Timestamp, probe_price: Optional[float] = None, trigger_type: str = "T1") -> tuple[bool, str, float, str]:
+    def is_trade_allowed(self, signal_tf: str, direction: SignalDirection, zone: B2BZoneInfo, current_price: float, current_time: pd.Timestamp, probe_price: Optional[float] = None, trigger_type: str = "T1") -> tuple[bool, str, float, int]:
         """
         V6.7 ASYMMETRIC GATEKEEPER.
         Uses Storyline Latches to provide structural memory and inertia.
@@ -139,11 +167,11 @@ class StrategyOrchestrator:
 
         # 0. Basic Filter: Officers Only
         if signal_tf not in ['H4', 'H1', 'M30', 'M15', 'M5', 'M1']:
-            return False, "Context Only (Generals Don't Fight)", 0.0, ""
+            return False, "Context Only (Generals Don't Fight)", 0.0, NO_ZONE
 
         # 0.5 Pillar 1: Tactical Tier Gating (Phase 12A)
-        if not EfficiencyGovernor.is_tier_allowed(signal_tf, trigger_type):
-            return False, f"Tier Gating Block: {signal_tf} {trigger_type} Restricted", 0.0, ""
+        if not self.governor.is_tier_allowed(signal_tf, trigger_type):
+            return False, f"Tier Gating Block: {signal_tf} {trigger_type} Restricted", 0.0, NO_ZONE
 
         # [VAULTED]: 0.5.5 Pillar 1.5: Tactical Veto (Phase 12D)
         # H4 Veto is currently deactivated to maximize CAGR (Restoring 10C Alpha).
@@ -152,13 +180,13 @@ class StrategyOrchestrator:
 
         # [VAULTED]: 0.6 Pillar 2: Temporal Muter (Phase 12B/D/E)
         # Structural Memory muting is currently deactivated (Restoring 10C Alpha).
-        # if not EfficiencyGovernor.is_temporally_clean(signal_tf, self.symbol, direction, current_time):
-        #     return False, f"Temporal Mute: {signal_tf} {direction.value} Cooldown Active", 0.0, ""
+        # if not self.governor.is_temporally_clean(signal_tf, self.symbol, direction, current_time):
+        #     return False, f"Temporal Mute: {signal_tf} {direction.value} Cooldown Active", 0.0, NO_ZONE
 
         # 0.7 Pillar 3: Structural Gasket (Phase 12C)
-        efficient, gasket_reason = EfficiencyGovernor.is_spatially_efficient(eval_price, zone)
+        efficient, gasket_reason = self.governor.is_spatially_efficient(eval_price, zone)
         if not efficient:
-            return False, gasket_reason, 0.0, ""
+            return False, gasket_reason, 0.0, NO_ZONE
 
         # 1. Load Narrative Latches
         mn1 = self.states['MN1']
@@ -193,7 +221,7 @@ class StrategyOrchestrator:
                         if self._validate_trap(zone, ref, signal_tf, is_fader=True):
                             return True, f"{tf_name} Magnet Fade (Storyline Reversal)", 0.0, ref.magnet_id
             
-            return False, "Blocked: Fighting the Storyline without a Fortress", 0.0, ""
+            return False, "Blocked: Fighting the Storyline without a Fortress", 0.0, NO_ZONE
 
         # 4. GATE B: INERTIAL FLOW (Continuation)
         # These are LIBERATED trades. We follow the last major force.
@@ -215,7 +243,7 @@ class StrategyOrchestrator:
                              is_bulldozing = True
                  
                  if not is_bulldozing:
-                     return False, f"Siege Active on {target_tf}", 0.0, ""
+                     return False, f"Siege Active on {target_tf}", 0.0, NO_ZONE
              
              # INERTIAL FLOW LIBERATION: is_flow_liberated = True
              if self._validate_trap(zone, narrative, signal_tf, is_flow_liberated=True):
@@ -229,19 +257,19 @@ class StrategyOrchestrator:
              if self._validate_trap(zone, self.states[signal_tf], signal_tf, is_flow_liberated=True):
                  return True, f"Discovery Flow ({signal_tf} Command)", 0.0, self.states[signal_tf].origin_id
 
-        return False, "No Strategy Alignment", 0.0, ""
+        return False, "No Strategy Alignment", 0.0, NO_ZONE
 
     def report_trade_failure(self, tf: str, direction: str | SignalDirection, current_time: pd.Timestamp):
         """Exposes the failure reporting to the backtest engine."""
         dir_enum = direction if isinstance(direction, SignalDirection) else SignalDirection(direction)
-        EfficiencyGovernor.report_trade_failure(self.symbol, tf, dir_enum, current_time)
+        self.governor.report_trade_failure(self.symbol, tf, dir_enum, current_time)
 
     def _print_heartbeat(self, current_time: pd.Timestamp):
         mn, w1, d1 = self.states['MN1'], self.states['W1'], self.states['D1']
         h4, h1, m3 = self.states['H4'], self.states['H1'], self.states['M30']
         
         print(f"\n[{current_time}] === V6.7 ORCHESTRATOR HEARTBEAT ===")
-        print(f"MN1 Tide: {mn.latch_dir.value} | Origin: #{mn.origin_id[:4]} -> Magnet: #{mn.magnet_id[:4]}")
-        print(f"W1 Wind:  {w1.latch_dir.value} | Origin: #{w1.origin_id[:4]} -> Magnet: #{w1.magnet_id[:4]}")
-        print(f"D1 Path:  {d1.latch_dir.value} | Origin: #{d1.origin_id[:4]} -> Magnet: #{d1.magnet_id[:4]}")
-        print(f">>> OFFICERS: H4:#{h4.origin_id[:4]} | H1:#{h1.origin_id[:4]} | M30:#{m3.origin_id[:4]}")
+        print(f"MN1 Tide: {mn.latch_dir.value} | Origin: #{zone_label(mn.origin_id)[:4]} -> Magnet: #{zone_label(mn.magnet_id)[:4]}")
+        print(f"W1 Wind:  {w1.latch_dir.value} | Origin: #{zone_label(w1.origin_id)[:4]} -> Magnet: #{zone_label(w1.magnet_id)[:4]}")
+        print(f"D1 Path:  {d1.latch_dir.value} | Origin: #{zone_label(d1.origin_id)[:4]} -> Magnet: #{zone_label(d1.magnet_id)[:4]}")
+        print(f">>> OFFICERS: H4:#{zone_label(h4.origin_id)[:4]} | H1:#{zone_label(h1.origin_id)[:4]} | M30:#{zone_label(m3.origin_id)[:4]}")
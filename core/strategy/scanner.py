@@ -1,12 +1,12 @@
 from typing import List, Optional
 from dataclasses import dataclass
 import pandas as pd
-from ..models.structures import B2BZoneInfo, SignalDirection
+from ..models.structures import B2BZoneInfo, SignalDirection, NO_ZONE
 from .orchestrator import StrategyOrchestrator
 
 @dataclass
 class TradeSignal:
-    zone_id: str
+    zone_id: int
     tf: str
     symbol: str
     direction: SignalDirection
@@ -15,7 +15,7 @@ class TradeSignal:
     tp_price: float
     reason: str
     timestamp: pd.Timestamp
-    origin_id: str = "" # V6.0 Redundancy Filter
+    origin_id: int = NO_ZONE # V6.0 Redundancy Filter
 
 class SignalScanner:
     """
@@ -0,0 +1,111 @@
+"""
+SIGMA Price Range Index
+Range-extrema and first-crossing queries over driver price arrays.
+
+Bars are grouped into fixed-size blocks; a sparse table over the block maxima
+answers "first bar at or after `start` whose high reaches `level`" in
+O(log n) block jumps plus one in-block scan. Memory is O(n/B * log n), so the
+index stays small even on multi-million-bar M1 histories.
+"""
+from typing import Optional
+import numpy as np
+
+
+class _MaxTable:
+    """Block sparse table answering range-max and first-at-or-above queries."""
+
+    def __init__(self, values: np.ndarray, block: int = 64):
+        self.values = np.ascontiguousarray(values, dtype=np.float64)
+        self.n = len(self.values)
+        self.block = block
+        nb = max(1, -(-self.n // block))
+        padded = np.full(nb * block, -np.inf)
+        padded[:self.n] = self.values
+        level = padded.reshape(nb, block).max(axis=1)
+        self.levels = [level]
+        width = 1
+        while 2 * width <= nb:
+            level = np.maximum(level[:-width], level[width:])
+            self.levels.append(level)
+            width *= 2
+        self.nb = nb
+
+    def _blocks_max(self, lo: int, hi: int) -> float:
+        """Max over whole blocks [lo, hi)."""
+        if hi <= lo:
+            return -np.inf
+        k = int(hi - lo).bit_length() - 1
+        lvl = self.levels[k]
+        return max(lvl[lo], lvl[hi - (1 << k)])
+
+    def range_max(self, start: int, stop: int) -> float:
+        start, stop = int(start), int(stop)
+        if stop <= start:
+            return -np.inf
+        B = self.block
+        bl = -(-start // B)
+        br = stop // B
+        if bl >= br:
+            return float(self.values[start:stop].max())
+        best = self._blocks_max(bl, br)
+        if start < bl * B:
+            best = max(best, self.values[start:bl * B].max())
+        if br * B < stop:
+            best = max(best, self.values[br * B:stop].max())
+        return float(best)
+
+    def first_at_or_above(self, start: int, level: float, stop: Optional[int] = None) -> int:
+        """First index i in [start, stop) with values[i] >= level, else stop."""
+        start = int(start)
+        stop = self.n if stop is None else min(int(stop), self.n)
+        if start >= stop:
+            return stop
+        B = self.block
+        head_end = min((start // B + 1) * B, stop)
+        hits = np.flatnonzero(self.values[start:head_end] >= level)
+        if len(hits):
+            return start + int(hits[0])
+        if head_end >= stop:
+            return stop
+
+        # Binary lifting over block maxima: skip every block entirely below level
+        pos = head_end // B
+        for k in range(len(self.levels) - 1, -1, -1):
+            lvl = self.levels[k]
+            if pos < len(lvl) and lvl[pos] < level:
+                pos += 1 << k
+        if pos >= self.nb or pos * B >= stop:
+            return stop
+        seg = self.values[pos * B:min((pos + 1) * B, stop)]
+        hits = np.flatnonzero(seg >= level)
+        return pos * B + int(hits[0]) if len(hits) else stop
+
+
+class PriceRangeIndex:
+    """
+    First-crossing and range-extrema queries over (high, low) arrays.
+    Lows are indexed negated, so both directions share one implementation.
+    """
+
+    def __init__(self, highs: np.ndarray, lows: np.ndarray, block: int = 64):
+        self._hi = _MaxTable(highs, block)
+        self._neg_lo = _MaxTable(-np.asarray(lows, dtype=np.float64), block)
+        self.n = self._hi.n
+
+    @property
+    def highs(self) -> np.ndarray:
+        return self._hi.values
+
+    def range_max(self, start: int, stop: int) -> float:
+        """Max high over bars [start, stop)."""
+        return self._hi.range_max(start, stop)
+
+    def range_min(self, start: int, stop: int) -> float:
+        """Min low over bars [start, stop)."""
+        return -self._neg_lo.range_max(start, stop)
+
+    def first_high_at_or_above(self, start: int, level: float, stop: Optional[int] = None) -> int:
+        return self._hi.first_at_or_above(start, level, stop)
+
+    def first_low_at_or_below(self, start: int, level: float, stop: Optional[int] = None) -> int:
+        return self._neg_lo.first_at_or_above(start, -level, stop)
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from ..models.structures import DetectionContext
@@ -15,6 +16,7 @@ class TimeframeInfo:
     
     # Cache for efficient lookups
     last_processed_idx: int = -1
+    times_ns: Optional[np.ndarray] = None # Bar open times as int64 ns (sync_to search key)
 
 class TimeframeState:
     """
@@ -54,12 +56,14 @@ class TimeframeState:
                 is_new_bar=True,
                 df=df.sort_index()
             )
+            self.tfs[name].times_ns = self.tfs[name].df.index.values.astype('datetime64[ns]').view(np.int64)
             
     def sync_to(self, current_time: datetime):
         """
         Fast-forward all timeframes to the current simulation time.
         Updates 'is_new_bar' flags.
         """
+        now_ns = pd.Timestamp(current_time).value
         for name, info in self.tfs.items():
             # Find the bar that supposedly closed just before or at current_time
             # In backtesting, we usually peek at the OPENING of the bar or the CLOSE.
@@ -86,13 +90,12 @@ class TimeframeState:
             # Optimization: If we are running on M30 loop, we check higher TFs using index
             try:
                 # Find index of current_time or nearest previous
-                idx = info.df.index.searchsorted(current_time, side='right') - 1
+                idx = int(np.searchsorted(info.times_ns, now_ns, side='right')) - 1
                 
                 if idx >= 0:
-                    bar_time = info.df.index[idx]
-                    if bar_time > info.current_bar_time:
+                    if idx != info.last_processed_idx and info.times_ns[idx] > info.current_bar_time.value:
                         info.is_new_bar = True
-                        info.current_bar_time = bar_time
+                        info.current_bar_time = info.df.index[idx]
                     else:
                         info.is_new_bar = False
                     
@@ -103,6 +106,16 @@ class TimeframeState:
             except KeyError:
                 info.is_new_bar = False
 
+    def snapshot(self) -> dict:
+        """Sync cursor of every timeframe, restorable with restore()."""
+        return {name: (info.current_bar_time, info.is_new_bar, info.last_processed_idx) for name, info in self.tfs.items()}
+
+    def restore(self, snapshot: dict):
+        for name, (bar_time, is_new, idx) in snapshot.items():
+            if name in self.tfs:
+                info = self.tfs[name]
+                info.current_bar_time, info.is_new_bar, info.last_processed_idx = bar_time, is_new, idx
+
     def get_context(self, tf: str) -> Optional[pd.Series]:
         """Returns the current bar for a specific timeframe."""
         if tf not in self.tfs: return None
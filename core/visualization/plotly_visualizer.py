@@ -2,7 +2,7 @@ import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from typing import List, Optional, Any
-from core.models.structures import B2BZoneInfo, SignalDirection, SwingType
+from core.models.structures import B2BZoneInfo, SignalDirection, SwingType, NO_ZONE, zone_label
 
 class ChartVisualizer:
     """
@@ -285,7 +285,7 @@ class ChartVisualizer:
             elif z.fifty_touched: touch_state = "T2"
             elif z.L1_touched: touch_state = "T1"
             
-            lane_id = str(getattr(z, 'zone_id', ""))[:4]
+            lane_id = zone_label(getattr(z, 'zone_id', NO_ZONE))[:4]
             dir_str = "Buy" if z.direction == SignalDirection.BULLISH else "Sell"
             # Explicitly format the label to avoid grabbing unwanted object attributes
             label_text = f"L2 B2B {tf_key} {dir_str} [{touch_state}] {float(z.L2_price):,.2f} #{lane_id}"
@@ -0,0 +1,190 @@
+"""
+SIGMA Market Data Arena
+Publishes OHLCV history once in named multiprocessing.shared_memory blocks,
+one per (symbol, timeframe), so pool workers map the same pages instead of
+unpickling their own copy of multi-year frames.
+
+Block layout: an int64 ns time row followed by one row per numeric column
+(open, high, low, close, volume first), i.e. column-major, in the frame's
+value dtype (float64, or float32 for compact research frames, see
+data.schema). Frames rebuilt over a block are views, no copy.
+
+The arena hands out descriptors (block name, rows, columns) that pickle to a
+few hundred bytes; workers attach with attach_frames / attach_market in
+their pool initializer and keep the returned handles alive while the frames
+are in use.
+
+Only the owning process unlinks. Blocks are released on close(), on exit
+from a `with` block, when the arena is garbage collected and at interpreter
+exit; if the owner is killed outright, multiprocessing's resource tracker
+unlinks them. Workers started by the owner through multiprocessing (fork,
+spawn or forkserver) report to the owner's tracker; attaching never touches
+that registration, so the tracker cleanup keeps working while they run.
+"""
+import multiprocessing
+import os
+import secrets
+import sys
+import weakref
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass(frozen=True)
+class BlockDescriptor:
+    name: str            # Shared memory block name
+    rows: int
+    columns: Tuple[str, ...]
+    index_name: str
+    dtype: str = 'float64'  # Value rows; the time row is always int64
+    owner: int = 0          # pid of the publishing process
+
+
+# symbol -> timeframe -> block
+ArenaDescriptor = Dict[str, Dict[str, BlockDescriptor]]
+
+
+def _release(blocks: List[shared_memory.SharedMemory], owner: int):
+    if os.getpid() != owner:
+        return
+    for shm in blocks:
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    blocks.clear()
+
+
+def _view(shm: shared_memory.SharedMemory, block: BlockDescriptor) -> pd.DataFrame:
+    times = np.ndarray((block.rows,), dtype='datetime64[ns]', buffer=shm.buf)
+    values = np.ndarray((len(block.columns), block.rows), dtype=block.dtype, buffer=shm.buf, offset=8 * block.rows)
+    index = pd.DatetimeIndex(times, name=block.index_name)
+    # Transposed view: one value block, no copy
+    return pd.DataFrame(values.T, index=index, columns=list(block.columns), copy=False)
+
+
+class MarketDataArena:
+    """Owner side: copies frames into shared memory and unlinks them on close."""
+
+    def __init__(self):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._handles: Dict[Tuple[str, str], shared_memory.SharedMemory] = {}
+        self._descriptor: ArenaDescriptor = {}
+        self._prefix = f"sigma_{secrets.token_hex(4)}"
+        self._finalizer = weakref.finalize(self, _release, self._blocks, os.getpid())
+
+    def add(self, symbol: str, tf: str, df: pd.DataFrame) -> BlockDescriptor:
+        """Publishes one frame; a (symbol, tf) already in the arena is not copied again."""
+        existing = self._descriptor.get(symbol, {}).get(tf)
+        if existing is not None:
+            return existing
+
+        numeric = [c for c in df.columns if np.issubdtype(df[c].dtype, np.number)]
+        columns = [c for c in OHLCV_COLUMNS if c in numeric] + [c for c in numeric if c not in OHLCV_COLUMNS]
+        # float32 frames stay float32; anything else is widened to float64
+        dtype = np.dtype(np.float32 if columns and all(df[c].dtype == np.float32 for c in columns) else np.float64)
+        n = len(df)
+        shm = shared_memory.SharedMemory(
+            name=f"{self._prefix}_{len(self._blocks)}", create=True,
+            size=max(8, 8 * n + dtype.itemsize * n * len(columns)),
+        )
+        self._blocks.append(shm)
+        times = np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+        times[:] = df.index.values.astype('datetime64[ns]').view(np.int64)
+        values = np.ndarray((len(columns), n), dtype=dtype, buffer=shm.buf, offset=8 * n)
+        for k, c in enumerate(columns):
+            values[k] = df[c].to_numpy(dtype=dtype)
+
+        block = BlockDescriptor(shm.name, n, tuple(columns), df.index.name or 'time', dtype.name, os.getpid())
+        self._handles[(symbol, tf)] = shm
+        self._descriptor.setdefault(symbol, {})[tf] = block
+        return block
+
+    def add_frames(self, symbol: str, data: Dict[str, pd.DataFrame]) -> Dict[str, BlockDescriptor]:
+        """Publishes every timeframe of one symbol (e.g. VectorizedBacktester.data)."""
+        try:
+            return {tf: self.add(symbol, tf, df) for tf, df in data.items()}
+        except Exception:
+            self.close()
+            raise
+
+    def descriptor(self, symbol: Optional[str] = None):
+        """{tf: block} for one symbol, or {symbol: {tf: block}} for the whole arena."""
+        if symbol is not None:
+            if symbol not in self._descriptor:
+                raise KeyError(f"Symbol {symbol} is not in the arena")
+            return dict(self._descriptor[symbol])
+        return {sym: dict(blocks) for sym, blocks in self._descriptor.items()}
+
+    def frames(self, symbol: str) -> Dict[str, pd.DataFrame]:
+        """Owner-side views over a symbol's blocks (valid until close)."""
+        return {tf: _view(self._handles[(symbol, tf)], block) for tf, block in self.descriptor(symbol).items()}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(shm.size for shm in self._blocks)
+
+    def close(self):
+        self._finalizer()
+        self._handles.clear()
+        self._descriptor.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _shares_owner_tracker(block: BlockDescriptor) -> bool:
+    """
+    True in the owner and in its multiprocessing children: every start
+    method hands children the parent's resource tracker on POSIX.
+    """
+    return os.getpid() == block.owner or multiprocessing.parent_process() is not None
+
+
+def _attach(block: BlockDescriptor) -> shared_memory.SharedMemory:
+    """
+    Maps a block without taking over its cleanup (the owner unlinks). Before
+    Python 3.13 attaching registers the block with this process's resource
+    tracker. With the owner's tracker that is a no-op (already registered),
+    and unregistering would drop the owner's registration. Only a private
+    tracker (a process not started by the owner) would unlink the block when
+    the process exits, so only there is the registration undone.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=block.name, track=False)
+    shm = shared_memory.SharedMemory(name=block.name)
+    if os.name == 'posix' and not _shares_owner_tracker(block):
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def attach_frames(blocks: Dict[str, BlockDescriptor]) -> Tuple[Dict[str, pd.DataFrame], list]:
+    """
+    Worker side: {tf: DataFrame} viewing one symbol's blocks.
+    Keep the returned handles alive as long as the frames are used.
+    """
+    data, handles = {}, []
+    for tf, block in blocks.items():
+        shm = _attach(block)
+        handles.append(shm)
+        data[tf] = _view(shm, block)
+    return data, handles
+
+
+def attach_market(descriptor: ArenaDescriptor) -> Tuple[Dict[str, Dict[str, pd.DataFrame]], list]:
+    """Worker side: {symbol: {tf: DataFrame}} for a whole-arena descriptor."""
+    market, handles = {}, []
+    for symbol, blocks in descriptor.items():
+        market[symbol], attached = attach_frames(blocks)
+        handles += attached
+    return market, handles
@@ -0,0 +1,293 @@
+"""
+SIGMA Async OHLCV Fetcher
+Paginated history for every (symbol, timeframe) at once, driven by
+config/exchange_config.yaml:
+
+    for each series, concurrently:
+        exchanges in config priority order (mexc -> kraken ...)
+            token bucket (per exchange) -> fetch_ohlcv(since=cursor)
+                -> checkpoint page -> advance cursor
+            transient error: retry with backoff; exhausted or fatal: next exchange
+
+- All series share one event loop; requests to one exchange are paced by
+  that exchange's TokenBucket (refilled at 1000 / rateLimit per second), so
+  concurrency never exceeds the exchange's budget, while different
+  exchanges run independently.
+- Every page is appended to a JSON-lines checkpoint per series before the
+  cursor moves, so an interrupted fetch resumes from the last completed
+  page (a torn last line is ignored). The checkpoint is removed once the
+  series has been handed to the sink.
+- Failover continues from the checkpointed cursor on the next exchange;
+  each page records the exchange it came from.
+
+Exchanges are ccxt.async_support instances built from the config (ccxt is
+imported lazily); tests pass stand-ins with the same `id`, `rateLimit`,
+`fetch_ohlcv` and `close` members.
+"""
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from data.quality import audit, summarize
+from data.resample import resample_frames
+from data.updater import CCXT_TIMEFRAMES, TIMEFRAME_STEPS, ohlcv_frame
+
+SIGMA_TIMEFRAMES = {v: k for k, v in CCXT_TIMEFRAMES.items()}
+Sink = Callable[[str, str, pd.DataFrame], None]
+
+# ccxt's transient error family (NetworkError covers timeouts, DDoS protection and rate limits)
+_TRANSIENT_NAMES = ('NetworkError',)
+
+
+class FetchError(RuntimeError):
+    """Every configured exchange failed for a series."""
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    return any(cls.__name__ in _TRANSIENT_NAMES for cls in type(error).__mro__)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Checkpoint:
+    """Append-only page log per series: one JSON line {exchange, cursor, rows} per page."""
+
+    def __init__(self, root: str = "data/cache/fetch"):
+        self.root = root
+
+    def path(self, symbol: str, tf: str) -> str:
+        return os.path.join(self.root, f"{symbol.replace('/', '-').replace(':', '_')}_{tf}.jsonl")
+
+    def load(self, symbol: str, tf: str) -> Tuple[Optional[int], List[list]]:
+        """(next cursor, rows so far); (None, []) when there is nothing to resume."""
+        cursor, rows = None, []
+        try:
+            with open(self.path(symbol, tf)) as f:
+                for line in f:
+                    try:
+                        page = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn write from an interrupted run
+                    cursor = page['cursor']
+                    rows.extend(page['rows'])
+        except FileNotFoundError:
+            pass
+        return cursor, rows
+
+    def append(self, symbol: str, tf: str, exchange: str, cursor: int, rows: list):
+        path = self.path(symbol, tf)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a') as f:
+            f.write(json.dumps({'exchange': exchange, 'cursor': cursor, 'rows': rows}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self, symbol: str, tf: str):
+        try:
+            os.remove(self.path(symbol, tf))
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class FetchConfig:
+    symbols: List[str]
+    timeframes: List[str]                     # SIGMA names (M30, H1, ...)
+    start: str = "2020-01-01"
+    limit: int = 1000
+    retries: int = 3
+    backoff: float = 1.0                      # Seconds, doubled per retry
+    burst: float = 1.0                        # Token bucket capacity per exchange
+    exchanges: List[dict] = field(default_factory=list)  # Enabled specs in priority order
+
+
+def load_fetch_config(path: str = "config/exchange_config.yaml", start: str = "2020-01-01") -> FetchConfig:
+    import yaml
+    with open(path) as f:
+        raw = yaml.safe_load(f)
+    symbols = raw.get('symbols') or [raw['symbol']]
+    unknown = [tf for tf in raw['timeframes'] if tf not in SIGMA_TIMEFRAMES]
+    if unknown:
+        raise ValueError(f"Unknown timeframes {unknown} in {path}, expected ccxt names {list(SIGMA_TIMEFRAMES)}")
+    return FetchConfig(
+        symbols=symbols,
+        timeframes=[SIGMA_TIMEFRAMES[tf] for tf in raw['timeframes']],
+        start=start,
+        limit=raw.get('fetch_limit', 1000),
+        exchanges=[spec for spec in raw['exchanges'] if spec.get('enabled', True)],
+    )
+
+
+def make_exchange(spec: dict):
+    import ccxt.async_support as ccxt_async
+    return getattr(ccxt_async, spec['name'])(dict(spec.get('options', {})))
+
+
+def _ms(ts: pd.Timestamp) -> int:
+    return int((pd.Timestamp(ts) - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1))
+
+
+class AsyncFetcher:
+    def __init__(self, config: FetchConfig, exchanges: Optional[Sequence] = None,
+                 checkpoint: Optional[Checkpoint] = None, sleep=asyncio.sleep):
+        """`exchanges`: ready instances in priority order (default: built from config.exchanges)."""
+        self.config = config
+        self.exchanges = list(exchanges) if exchanges is not None else [make_exchange(s) for s in config.exchanges]
+        if not self.exchanges:
+            raise ValueError("No enabled exchanges")
+        self.checkpoint = checkpoint or Checkpoint()
+        self.sleep = sleep
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, exchange) -> TokenBucket:
+        if exchange.id not in self.buckets:
+            rate = 1000.0 / max(getattr(exchange, 'rateLimit', 0) or 1, 1)
+            self.buckets[exchange.id] = TokenBucket(rate, self.config.burst)
+        return self.buckets[exchange.id]
+
+    async def _page(self, exchange, symbol: str, tf: str, since: int) -> list:
+        delay = self.config.backoff
+        for attempt in range(self.config.retries + 1):
+            await self._bucket(exchange).acquire()
+            try:
+                return await exchange.fetch_ohlcv(symbol, CCXT_TIMEFRAMES[tf], since=since, limit=self.config.limit)
+            except Exception as e:
+                if not is_transient(e) or attempt == self.config.retries:
+                    raise
+                await self.sleep(delay)
+                delay *= 2
+
+    async def fetch_series(self, symbol: str, tf: str, until: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Full history of one series from the checkpoint (or config start) up to `until` (default now)."""
+        cursor, rows = self.checkpoint.load(symbol, tf)
+        if cursor is None:
+            cursor = _ms(self.config.start)
+        end = _ms(until if until is not None else pd.Timestamp.now(tz='UTC').tz_localize(None))
+        step = TIMEFRAME_STEPS[tf]
+        step_ms = _ms(pd.Timestamp(0) + step)
+
+        errors = []
+        for exchange in self.exchanges:
+            try:
+                while cursor < end - step_ms:
+                    batch = await self._page(exchange, symbol, tf, cursor)
+                    if not batch or batch[-1][0] < cursor:
+                        break
+                    cursor = batch[-1][0] + 1
+                    batch = [list(r[:6]) for r in batch]
+                    self.checkpoint.append(symbol, tf, exchange.id, cursor, batch)
+                    rows.extend(batch)
+                errors = []
+                break
+            except Exception as e:
+                errors.append(f"{exchange.id}: {e!r}")
+        if errors:
+            raise FetchError(f"{symbol} {tf}: all exchanges failed ({'; '.join(errors)})")
+        return ohlcv_frame(rows)
+
+    async def run(self, sink: Optional[Sink] = None, until: Optional[pd.Timestamp] = None) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """Every configured series concurrently; each finished series goes to `sink`, then its checkpoint is cleared."""
+        keys = [(s, tf) for s in self.config.symbols for tf in self.config.timeframes]
+
+        async def one(symbol, tf):
+            frame = await self.fetch_series(symbol, tf, until)
+            if sink is not None:
+                sink(symbol, tf, frame)
+            self.checkpoint.clear(symbol, tf)
+            return frame
+
+        try:
+            # Let every series finish (and checkpoint) before surfacing the first failure
+            frames = await asyncio.gather(*(one(s, tf) for s, tf in keys), return_exceptions=True)
+        finally:
+            for exchange in self.exchanges:
+                close = getattr(exchange, 'close', None)
+                if close is not None:
+                    await close()
+        for frame in frames:
+            if isinstance(frame, BaseException):
+                raise frame
+        return dict(zip(keys, frames))
+
+
+def raw_symbol(symbol: str) -> str:
+    """File-name symbol for a ccxt market: 'BTC/USDT:USDT' -> 'BTCUSDT'."""
+    return symbol.split(':')[0].replace('/', '')
+
+
+def fetch_to_raw(config_path: str = "config/exchange_config.yaml", start: str = "2020-01-01",
+                 data_dir: str = "data/raw", checkpoint_dir: str = "data/cache/fetch") -> Dict[Tuple[str, str], pd.DataFrame]:
+    """
+    Fetches the configured series into data_dir/{SYMBOL}_{tf}.parquet
+    (audited on save). MN1 is synthesized from D1 for symbols whose
+    exchanges return no monthly bars.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    config = load_fetch_config(config_path, start=start)
+    print(f"Fetching {config.symbols} {config.timeframes} from {start} "
+          f"via {' -> '.join(spec['name'] for spec in config.exchanges)}...")
+
+    def save(symbol: str, tf: str, df: pd.DataFrame):
+        if df.empty:
+            print(f"No data to save for {tf}")
+            return
+        issues = audit(df, tf, seam=None)
+        print(f"\nStats for {symbol} {tf}:")
+        print(f"  Rows: {len(df)}")
+        print(f"  Start: {df['time'].iloc[0]}")
+        print(f"  End:   {df['time'].iloc[-1]}")
+        print(f"  Issues: {summarize(issues) or 'none'}")
+        if len(issues):
+            print(issues.to_string(index=False))
+        path = os.path.join(data_dir, f"{raw_symbol(symbol)}_{tf}.parquet")
+        df.to_parquet(path)
+        print(f"Saved to {path}")
+
+    fetcher = AsyncFetcher(config, checkpoint=Checkpoint(checkpoint_dir))
+    frames = asyncio.run(fetcher.run(sink=save))
+
+    for symbol in config.symbols:
+        if frames.get((symbol, 'MN1')) is not None and not frames[(symbol, 'MN1')].empty:
+            continue
+        d1 = os.path.join(data_dir, f"{raw_symbol(symbol)}_D1.parquet")
+        if not os.path.exists(d1):
+            print(f"Warning: Could not synthesize MN1 for {symbol} (D1 file missing)")
+            continue
+        # Bar-open labels (month starts), complete months only
+        mn1 = resample_frames(pd.read_parquet(d1), 'D1', ['MN1'])['MN1'].reset_index()
+        mn1.insert(0, 'timestamp', (mn1['time'] - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1))
+        path = os.path.join(data_dir, f"{raw_symbol(symbol)}_MN1.parquet")
+        mn1.to_parquet(path)
+        frames[(symbol, 'MN1')] = mn1
+        print(f"Saved synthesized MN1 to {path} ({len(mn1)} months)")
+    return frames
@@ -0,0 +1,201 @@
+"""
+SIGMA Data Quality Audit
+Vectorized checks over one OHLCV series, run on every ingest (fetch
+scripts, IncrementalUpdater, scripts/verify_data.py):
+
+    non_monotonic  time goes backwards
+    duplicate      the same bar time more than once
+    off_grid       a bar time not on the timeframe's bar-open grid
+    gap            missing bars against the expected cadence (MN1: calendar months)
+    nan            missing open/high/low/close
+    ohlc           high < max(open, close), low > min(open, close) or price <= 0
+    zero_volume    bars with no volume
+    outlier        |log return| beyond `outlier_z` robust (MAD) deviations
+    seam           price jump at the spot -> futures switch of the hybrid
+                   Binance history (data.vision.FUTURES_FROM)
+
+Issues come back as one compact table (kind, start, end, bars, value):
+consecutive flagged bars collapse into one row, and a gap row spans the
+missing interval with the number of missing bars. Everything is numpy on
+int64 times; a million M30 bars audit in under 0.1 s on one core (the
+robust return scale comes from a strided sample, not a full median).
+
+repair() fixes what is mechanical (sort, drop duplicates keeping the last
+download, clamp high/low around open/close) and optionally fills gaps with
+marked bars: 'mark' inserts NaN bars, 'ffill' inserts flat bars at the
+previous close with zero volume; both set the `gap` column. Outliers and
+the seam are only reported: adjusting prices is a research decision.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.store import TIME_COLUMN
+from data.vision import FUTURES_FROM
+
+ISSUE_COLUMNS = ['kind', 'start', 'end', 'bars', 'value']
+GAP_POLICIES = ('keep', 'mark', 'ffill')
+
+_STEP_S = {'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800, 'H1': 3600, 'H4': 14400, 'D1': 86400, 'W1': 604800}
+_MONDAY_NS = 4 * 86400 * 10**9  # W1 bars open on Mondays (1970-01-05)
+
+
+def _times(df: pd.DataFrame) -> np.ndarray:
+    values = df[TIME_COLUMN] if TIME_COLUMN in df.columns else df.index
+    return np.asarray(values, dtype='datetime64[ns]').view(np.int64)
+
+
+def _slots(t: np.ndarray, tf: str) -> np.ndarray:
+    """Bar number of each time on the timeframe grid (months since epoch for MN1)."""
+    if tf == 'MN1':
+        return t.view('datetime64[ns]').astype('datetime64[M]').astype(np.int64)
+    if tf not in _STEP_S:
+        raise ValueError(f"Unknown timeframe '{tf}', expected one of {list(_STEP_S) + ['MN1']}")
+    step = _STEP_S[tf] * 10**9
+    return (t - (_MONDAY_NS if tf == 'W1' else 0)) // step
+
+
+def _slot_times(slots: np.ndarray, tf: str) -> np.ndarray:
+    if tf == 'MN1':
+        return slots.astype('datetime64[M]').astype('datetime64[ns]')
+    return (slots * _STEP_S[tf] * 10**9 + (_MONDAY_NS if tf == 'W1' else 0)).view('datetime64[ns]')
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(first, last) positions of each run of True."""
+    edges = np.diff(np.r_[0, mask.astype(np.int8), 0])
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+
+
+def _rows(kind: str, start, end, bars, value) -> pd.DataFrame:
+    return pd.DataFrame({'kind': kind, 'start': start, 'end': end, 'bars': bars, 'value': value})
+
+
+def _run_rows(kind: str, mask: np.ndarray, times: np.ndarray, value: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """One row per run of flagged bars; value is the run's largest |value| (1.0 without values)."""
+    if not mask.any():
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    first, last = _runs(mask)
+    if value is None:
+        peak = np.ones(len(first))
+    else:
+        peak = np.maximum.reduceat(np.abs(value), first) if len(first) else np.empty(0)
+    return _rows(kind, times[first], times[last], last - first + 1, peak)
+
+
+def audit(df: pd.DataFrame, tf: str, outlier_z: float = 12.0, seam: Optional[pd.Timestamp] = FUTURES_FROM,
+          seam_tolerance: float = 0.01) -> pd.DataFrame:
+    """Issue table for one series (time index or `time` column); empty when clean."""
+    t = _times(df)
+    if len(t) == 0:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    tv = t.view('datetime64[ns]')
+    o, h, l, c = (np.asarray(df[col], dtype=np.float64) for col in ('open', 'high', 'low', 'close'))
+    parts = []
+
+    back = np.flatnonzero(t[1:] < t[:-1]) + 1
+    parts.append(_rows('non_monotonic', tv[back], tv[back - 1], 1, (t[back - 1] - t[back]) / 1e9))
+    order = np.argsort(t, kind='stable') if len(back) else None
+    ts = t[order] if order is not None else t
+    dup = np.r_[False, ts[1:] == ts[:-1]]
+    parts.append(_run_rows('duplicate', dup, ts.view('datetime64[ns]')))
+    slots = _slots(ts, tf)
+    off = _slot_times(slots, tf).view(np.int64) != ts
+    parts.append(_run_rows('off_grid', off, ts.view('datetime64[ns]')))
+
+    slots = slots[np.r_[True, slots[1:] != slots[:-1]]]  # Sorted: unique without hashing
+    jump = np.diff(slots)
+    at = np.flatnonzero(jump > 1)
+    parts.append(_rows('gap', _slot_times(slots[at] + 1, tf), _slot_times(slots[at + 1] - 1, tf),
+                       jump[at] - 1, (jump[at] - 1).astype(np.float64)))
+
+    bad_nan = np.isnan(o + h + l + c)
+    parts.append(_run_rows('nan', bad_nan, tv))
+    hi, lo = np.maximum(o, c), np.minimum(o, c)
+    bad_ohlc = ~((h >= hi) & (l <= lo) & (l > 0)) & ~bad_nan
+    if bad_ohlc.any():
+        parts.append(_run_rows('ohlc', bad_ohlc, tv, np.fmax(hi - h, lo - l)))
+    if 'volume' in df.columns:
+        vol = np.asarray(df['volume'], dtype=np.float64)
+        parts.append(_run_rows('zero_volume', vol <= 0, tv))
+
+    # Price checks run in time order
+    if order is not None:
+        o, c = o[order], c[order]
+    seam_at = -1
+    if seam is not None:
+        seam_at = int(np.searchsorted(ts, pd.Timestamp(seam).value))
+        if 0 < seam_at < len(t):
+            step = o[seam_at] / c[seam_at - 1] - 1
+            if abs(step) > seam_tolerance:
+                stamps = ts.view('datetime64[ns]')
+                parts.append(_rows('seam', stamps[seam_at - 1:seam_at], stamps[seam_at:seam_at + 1], 1, step))
+
+    if len(t) > 2:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = np.diff(np.log(c))
+        # Robust scale from an evenly strided sample (median of 64k values, not of millions)
+        sample = r[::max(1, len(r) // 65536)]
+        sample = sample[np.isfinite(sample)]
+        if len(sample) > 2:
+            med = np.median(sample)
+            mad = 1.4826 * np.median(np.abs(sample - med))
+            if mad > 0:
+                flag = np.abs(r - med) > outlier_z * mad
+                if 0 < seam_at < len(t):
+                    flag[seam_at - 1] = False  # Reported as the seam
+                if flag.any():
+                    parts.append(_run_rows('outlier', np.r_[False, flag], ts.view('datetime64[ns]'), np.r_[0.0, r]))
+
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    issues = pd.concat(parts, ignore_index=True)
+    return issues.sort_values(['start', 'kind'], kind='stable').reset_index(drop=True)
+
+
+def summarize(issues: pd.DataFrame) -> dict:
+    """{kind: affected bars} (missing bars for gaps)."""
+    return issues.groupby('kind', sort=False)['bars'].sum().astype(int).to_dict() if len(issues) else {}
+
+
+def repair(df: pd.DataFrame, tf: str, gaps: str = 'keep') -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    (repaired frame indexed by time, issues found before repair). Sorts,
+    keeps the last of duplicate bars, clamps high/low around open/close
+    and handles gaps per `gaps` ('keep', 'mark', 'ffill').
+    """
+    if gaps not in GAP_POLICIES:
+        raise ValueError(f"gaps must be one of {GAP_POLICIES}, got '{gaps}'")
+    issues = audit(df, tf)
+    frame = df.set_index(TIME_COLUMN) if TIME_COLUMN in df.columns else df.copy()
+    frame.index = pd.DatetimeIndex(frame.index, name=TIME_COLUMN)
+    frame = frame.sort_index(kind='stable')
+    frame = frame[~frame.index.duplicated(keep='last')].copy()
+
+    o, c = frame['open'].to_numpy(dtype=np.float64), frame['close'].to_numpy(dtype=np.float64)
+    frame['high'] = np.fmax(frame['high'].to_numpy(dtype=np.float64), np.fmax(o, c))
+    frame['low'] = np.fmin(frame['low'].to_numpy(dtype=np.float64), np.fmin(o, c))
+
+    if gaps == 'keep' or frame.empty:
+        return frame, issues
+    t = _times(frame)
+    slots = _slots(t, tf)
+    full = np.arange(slots[0], slots[-1] + 1)
+    present = np.isin(full, slots)
+    if present.all():
+        frame['gap'] = False
+        return frame, issues
+    filled = frame.reindex(pd.DatetimeIndex(_slot_times(full, tf), name=TIME_COLUMN)[~present].append(frame.index)
+                           .sort_values())
+    filled['gap'] = ~filled.index.isin(frame.index)
+    if gaps == 'ffill':
+        prev_close = filled['close'].ffill()
+        for col in ('open', 'high', 'low', 'close'):
+            filled[col] = filled[col].fillna(prev_close)
+        if 'volume' in filled.columns:
+            filled['volume'] = filled['volume'].fillna(0.0)
+    if 'timestamp' in filled.columns:
+        filled['timestamp'] = (filled.index - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+    return filled, issues
@@ -0,0 +1,205 @@
+"""
+SIGMA Resampling Engine
+Builds every timeframe in TF_HIERARCHY above a base series (M1 or M30)
+from that one series, so all timeframes agree bar for bar at their seams.
+
+Labels are bar opens, the convention of the rest of the engine: H4 and D1
+align to UTC midnight, W1 opens on Monday 00:00 and MN1 on the first of
+the month.
+
+Each target is aggregated in one vectorized pass over int64 times: bucket
+starts are computed arithmetically (datetime64[M] for months), group
+boundaries are the positions where the bucket changes, and OHLCV comes
+from the boundaries with np.maximum/minimum/add.reduceat. Targets are
+cascaded from the coarsest already-built timeframe that nests into them
+(H1 from M30, D1 from H4, W1 and MN1 from D1), so each pass shrinks.
+
+Only complete buckets are emitted: a bucket whose end lies past the last
+base bar is still forming and is left for the next extension. That keeps
+extend() a pure append (data.updater's seam rules): for each target it
+reads the base bars from the first missing bucket on, aggregates, and
+appends the newly completed bars to the store.
+
+Derived timeframes are stored in the column layout of the base series: if
+the base carries the fetchers' `timestamp` (bar open, epoch ms), so does
+every target, and later IncrementalUpdater appends to a target match it.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.models.structures import TF_HIERARCHY, TF_RANK
+from data.store import OHLCVStore, TIME_COLUMN, as_store_frame
+from data.updater import check_seam, next_bar
+
+OHLCV = ['open', 'high', 'low', 'close', 'volume']
+EPOCH_MS_COLUMN = 'timestamp'
+BASE_TIMEFRAMES = ('M1', 'M30')
+
+_NS = {'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800, 'H1': 3600, 'H4': 14400, 'D1': 86400, 'W1': 604800}
+_NS = {tf: s * 10**9 for tf, s in _NS.items()}
+_MONDAY = 4 * _NS['D1']  # 1970-01-05 was the first Monday after the epoch
+
+
+@dataclass
+class ResampleResult:
+    tf: str
+    rows: int   # Bars written or appended
+    last: Optional[pd.Timestamp]
+
+
+def targets_above(base: str) -> List[str]:
+    """Timeframes of TF_HIERARCHY coarser than `base`, finest first."""
+    if base not in TF_RANK:
+        raise ValueError(f"Unknown timeframe '{base}', expected one of {TF_HIERARCHY}")
+    return [tf for tf in reversed(TF_HIERARCHY) if TF_RANK[tf] < TF_RANK[base]]
+
+
+def bucket_starts(times: np.ndarray, tf: str) -> np.ndarray:
+    """Open time (int64 ns) of the `tf` bar containing each time."""
+    t = np.asarray(times).astype('datetime64[ns]').view(np.int64)
+    if tf == 'MN1':
+        return t.astype('datetime64[ns]').astype('datetime64[M]').astype('datetime64[ns]').view(np.int64)
+    if tf == 'W1':
+        return (t - _MONDAY) // _NS['W1'] * _NS['W1'] + _MONDAY
+    if tf not in _NS:
+        raise ValueError(f"Unknown timeframe '{tf}'")
+    return t // _NS[tf] * _NS[tf]
+
+
+def bucket_ends(starts: np.ndarray, tf: str) -> np.ndarray:
+    """Close time (int64 ns, exclusive) of bars opening at `starts`."""
+    if tf == 'MN1':
+        months = starts.astype('datetime64[ns]').astype('datetime64[M]') + np.timedelta64(1, 'M')
+        return months.astype('datetime64[ns]').view(np.int64)
+    return starts + _NS[tf]
+
+
+def _nests(fine: str, coarse: str) -> bool:
+    if fine == coarse:
+        return False
+    if coarse in ('W1', 'MN1'):
+        return fine != 'W1' and fine != 'MN1'
+    return fine in _NS and _NS[coarse] % _NS[fine] == 0 and _NS[coarse] > _NS[fine]
+
+
+def aggregate(times: np.ndarray, values: Dict[str, np.ndarray], tf: str):
+    """
+    (starts, columns) of `tf` bars over sorted base bars: open first, high
+    max, low min, close last, volume sum.
+    """
+    starts = bucket_starts(times, tf)
+    if len(starts) == 0:
+        return starts, {c: np.empty(0) for c in OHLCV}
+    bounds = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    last = np.r_[bounds[1:] - 1, len(starts) - 1]
+    out = {
+        'open': values['open'][bounds],
+        'high': np.maximum.reduceat(values['high'], bounds),
+        'low': np.minimum.reduceat(values['low'], bounds),
+        'close': values['close'][last],
+        'volume': np.add.reduceat(values['volume'], bounds),
+    }
+    return starts[bounds], out
+
+
+def resample_frames(base: pd.DataFrame, base_tf: str, targets: Optional[Sequence[str]] = None,
+                    complete_only: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    {tf: frame indexed by bar open time} for every target above `base_tf`
+    (default: all of TF_HIERARCHY). With complete_only, a trailing bucket
+    the base has not filled yet is dropped.
+    """
+    wanted = set(targets) if targets is not None else set(targets_above(base_tf))
+    order = [tf for tf in targets_above(base_tf) if tf in wanted]
+    if len(order) != len(wanted):
+        raise ValueError(f"Targets {sorted(wanted - set(order))} are not coarser than {base_tf}")
+
+    frame = as_store_frame(base)
+    base_times = frame[TIME_COLUMN].to_numpy().astype('datetime64[ns]').view(np.int64)
+    horizon = bucket_ends(base_times[-1:], base_tf)[0] if len(base_times) else None
+    built = {base_tf: (base_times, {c: frame[c].to_numpy(dtype=np.float64) for c in OHLCV})}
+
+    out = {}
+    for tf in targets_above(base_tf):
+        if not any(tf == w or _nests(tf, w) for w in order):
+            continue  # Not needed as a target or as a cascade source
+        source = min((s for s in built if _nests(s, tf)), key=TF_RANK.get)
+        starts, cols = aggregate(*built[source], tf)
+        built[tf] = (starts, cols)
+        if tf not in wanted:
+            continue
+        keep = bucket_ends(starts, tf) <= horizon if complete_only and horizon is not None else slice(None)
+        df = pd.DataFrame({c: cols[c][keep] for c in OHLCV},
+                          index=pd.DatetimeIndex(starts[keep].astype('datetime64[ns]'), name=TIME_COLUMN))
+        out[tf] = df
+    return out
+
+
+def in_layout(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Store frame of resampled bars with the stored `columns` of the base
+    series (epoch-ms `timestamp` derived from the bar open).
+    """
+    frame = as_store_frame(df)
+    if EPOCH_MS_COLUMN in columns:
+        frame[EPOCH_MS_COLUMN] = frame[TIME_COLUMN].to_numpy().astype('datetime64[ms]').view(np.int64)
+    missing = set(columns) - set(frame.columns)
+    if missing:
+        raise ValueError(f"Cannot derive base columns {sorted(missing)} for resampled bars")
+    return frame[list(columns)]
+
+
+class Resampler:
+    """Derives the higher timeframes of a symbol in the OHLCVStore from its base series."""
+
+    def __init__(self, store: OHLCVStore, base_tf: str = 'M30', targets: Optional[Sequence[str]] = None):
+        if base_tf not in BASE_TIMEFRAMES:
+            raise ValueError(f"Base timeframe must be one of {BASE_TIMEFRAMES}, got '{base_tf}'")
+        self.store = store
+        self.base_tf = base_tf
+        self.targets = list(targets) if targets is not None else targets_above(base_tf)
+
+    def rebuild(self, symbol: str) -> List[ResampleResult]:
+        """Replaces every target with a fresh resample of the whole base history."""
+        base = self.store.read(symbol, self.base_tf, columns=OHLCV)
+        layout = self._layout(symbol)
+        results = []
+        for tf, df in resample_frames(base, self.base_tf, self.targets).items():
+            self.store.write(symbol, tf, in_layout(df, layout))
+            results.append(ResampleResult(tf, len(df), df.index[-1] if len(df) else None))
+        return results
+
+    def extend(self, symbol: str, allow_gaps: bool = False) -> List[ResampleResult]:
+        """
+        Appends the target bars completed since the last run (after new base
+        bars were appended, e.g. by the IncrementalUpdater). Targets with no
+        stored history are built from the whole base. Raises SeamError if
+        the new bars do not continue a target (allow_gaps: base outages).
+        """
+        ends = {tf: (self.store.bounds(symbol, tf) or (None, None))[1] for tf in self.targets}
+        starts = [next_bar(tf, last) for tf, last in ends.items() if last is not None]
+        since = None if any(last is None for last in ends.values()) or not starts else min(starts)
+        base = self.store.read(symbol, self.base_tf, start=since, columns=OHLCV)
+        layout = self._layout(symbol)
+
+        results = []
+        for tf, df in resample_frames(base, self.base_tf, self.targets).items():
+            last = ends[tf]
+            if last is not None:
+                df = df[df.index > last]
+            if df.empty:
+                results.append(ResampleResult(tf, 0, last))
+                continue
+            new = in_layout(df, layout)
+            check_seam(last, new, tf, allow_gaps)
+            self.store.append(symbol, tf, new)
+            results.append(ResampleResult(tf, len(new), new[TIME_COLUMN].iloc[-1]))
+        return results
+
+    def _layout(self, symbol: str) -> List[str]:
+        """Stored column names of the base series (time and OHLCV if empty)."""
+        schema = self.store.schema(symbol, self.base_tf)
+        return list(schema.names) if schema is not None else [TIME_COLUMN, *OHLCV]
@@ -0,0 +1,44 @@
+"""
+SIGMA Market Data Schema
+The one in-memory layout every frame is normalized to on load:
+
+    index   time     datetime64[ns] (int64 epoch ns underneath), bar open
+    open, high, low, close, volume   float64, or float32 for research runs
+
+Everything else (the ms 'timestamp' column kept by the fetch scripts,
+string or object columns) is dropped: times are carried once, as int64,
+and datetimes are only built at reporting boundaries (emitted structures,
+trades, reports).
+
+float32 halves price/volume memory again. It keeps ~7 significant
+digits, so a 60000 BTC price resolves to ~0.004; fine for sweeps and
+research, but use float64 for runs whose fills must match to the cent.
+"""
+import numpy as np
+import pandas as pd
+
+from data.store import TIME_COLUMN
+
+OHLCV = ['open', 'high', 'low', 'close', 'volume']
+PRICE_DTYPES = ('float64', 'float32')
+
+
+def compact_frame(df: pd.DataFrame, price_dtype: str = 'float64') -> pd.DataFrame:
+    """OHLCV frame indexed by datetime64[ns] `time`, numeric columns as `price_dtype`."""
+    if price_dtype not in PRICE_DTYPES:
+        raise ValueError(f"price_dtype must be one of {PRICE_DTYPES}, got '{price_dtype}'")
+    if TIME_COLUMN in df.columns:
+        index = df[TIME_COLUMN]
+    else:
+        index = df.index
+    index = pd.DatetimeIndex(np.asarray(index, dtype='datetime64[ns]'), name=TIME_COLUMN)
+
+    columns = [c for c in OHLCV if c in df.columns]
+    columns += [c for c in df.columns if c not in columns and c not in (TIME_COLUMN, 'timestamp')
+                and pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+    # One 2D block, one contiguous row per column (pandas' own block layout)
+    values = np.empty((len(columns), len(df)), dtype=price_dtype)
+    for k, c in enumerate(columns):
+        values[k] = df[c].to_numpy()
+    return pd.DataFrame(values.T, index=index, columns=columns, copy=False)
+
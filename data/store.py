@@ -0,0 +1,260 @@
+"""
+SIGMA OHLCV Store
+Hive-partitioned parquet dataset, one directory per (symbol, tf, year):
+
+    <root>/symbol=BTCUSDT/tf=M30/year=2020/part-20200101000000.parquet
+
+Files are named by their first bar, so name order is time order; a
+partition holds one file per write or append (data.updater).
+Every file is sorted by `time` and written in small row groups, so the
+parquet footer's min/max statistics on `time` locate a date range without
+decoding anything else.
+
+Range reads prune in three steps: year directories outside the range are
+never listed, row groups whose time statistics miss the range are never
+read, and only the requested columns are decoded. Files are opened
+memory-mapped, so a read maps pages instead of copying whole files.
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+TIME_COLUMN = 'time'
+ROW_GROUP_SIZE = 2048  # Bars per row group (six weeks of M30)
+_PARTITION = re.compile(r"^(\w+)=(.+)$")
+
+
+@dataclass
+class ScanPlan:
+    """Row groups a range read touches, per file (for inspection and tests)."""
+    files: List[Tuple[str, List[int]]]
+
+    @property
+    def row_groups(self) -> int:
+        return sum(len(groups) for _, groups in self.files)
+
+
+def _bound(value, upper: bool) -> Optional[pd.Timestamp]:
+    """Range bound with pandas label-slice semantics: a date-only end includes that whole day."""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    if upper and isinstance(value, str) and len(value.strip()) <= 10:
+        ts = ts + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+    return ts
+
+
+class OHLCVStore:
+    def __init__(self, root: str = "data/store", row_group_size: int = ROW_GROUP_SIZE):
+        self.root = root
+        self.row_group_size = row_group_size
+
+    # --- Layout ---
+
+    def _dir(self, symbol: str, tf: str) -> str:
+        return os.path.join(self.root, f"symbol={symbol}", f"tf={tf}")
+
+    @staticmethod
+    def _values(path: str, key: str) -> List[str]:
+        if not os.path.isdir(path):
+            return []
+        out = []
+        for name in sorted(os.listdir(path)):
+            m = _PARTITION.match(name)
+            if m and m.group(1) == key:
+                out.append(m.group(2))
+        return out
+
+    def symbols(self) -> List[str]:
+        return self._values(self.root, 'symbol')
+
+    def timeframes(self, symbol: str) -> List[str]:
+        return self._values(os.path.join(self.root, f"symbol={symbol}"), 'tf')
+
+    def has(self, symbol: str, tf: str) -> bool:
+        return bool(self.files(symbol, tf))
+
+    def files(self, symbol: str, tf: str, years: Optional[Tuple[int, int]] = None) -> List[str]:
+        """Data files in time order, optionally limited to an inclusive year range."""
+        base = self._dir(symbol, tf)
+        out = []
+        for year in self._values(base, 'year'):
+            if years is not None and not years[0] <= int(year) <= years[1]:
+                continue
+            part = os.path.join(base, f"year={year}")
+            out += [os.path.join(part, f) for f in sorted(os.listdir(part)) if f.endswith('.parquet')]
+        return out
+
+    # --- Writes ---
+
+    def write(self, symbol: str, tf: str, df: pd.DataFrame):
+        """
+        Replaces the (symbol, tf) history with `df` (time index or `time`
+        column), one file per year partition.
+        """
+        frame = as_store_frame(df)
+        for path in self.files(symbol, tf):
+            os.remove(path)
+        for year, part in frame.groupby(frame[TIME_COLUMN].dt.year, sort=True):
+            self.write_file(symbol, tf, int(year), part)
+
+    def write_file(self, symbol: str, tf: str, year: int, frame: pd.DataFrame) -> str:
+        """Writes one sorted, single-year frame as a new file in its partition (atomic rename)."""
+        tmp, path = self._stage(symbol, tf, year, frame)
+        os.replace(tmp, path)
+        return path
+
+    def append(self, symbol: str, tf: str, frame: pd.DataFrame) -> List[str]:
+        """
+        Adds bars after the stored history as new files (one per year
+        touched); existing files are never rewritten. All files are staged
+        first and renamed in time order, so a crash leaves the store at a
+        consistent, earlier end. The caller validates the seam
+        (data.updater).
+        """
+        frame = as_store_frame(frame)
+        if frame.empty:
+            return []
+        schema = self.schema(symbol, tf)
+        if schema is not None:
+            if set(schema.names) != set(frame.columns):
+                raise ValueError(f"Columns {sorted(frame.columns)} do not match the stored {sorted(schema.names)}")
+            frame = frame[schema.names]
+        staged = []
+        try:
+            for year, part in frame.groupby(frame[TIME_COLUMN].dt.year, sort=True):
+                staged.append(self._stage(symbol, tf, int(year), part, schema))
+        except Exception:
+            for tmp, _ in staged:
+                os.remove(tmp)
+            raise
+        for tmp, path in staged:
+            os.replace(tmp, path)
+        return [path for _, path in staged]
+
+    def _stage(self, symbol: str, tf: str, year: int, frame: pd.DataFrame,
+               schema: Optional[pa.Schema] = None) -> Tuple[str, str]:
+        part = os.path.join(self._dir(symbol, tf), f"year={year}")
+        os.makedirs(part, exist_ok=True)
+        first = frame[TIME_COLUMN].iloc[0]
+        path = os.path.join(part, f"part-{first:%Y%m%d%H%M%S}.parquet")
+        if os.path.exists(path):
+            raise FileExistsError(path)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if schema is not None:
+            table = table.cast(schema)
+        tmp = path + ".tmp"
+        pq.write_table(table, tmp, row_group_size=self.row_group_size, write_statistics=[TIME_COLUMN])
+        return tmp, path
+
+    def schema(self, symbol: str, tf: str) -> Optional[pa.Schema]:
+        """Arrow schema of the newest stored file (None if empty)."""
+        files = self.files(symbol, tf)
+        if not files:
+            return None
+        return pq.ParquetFile(files[-1], memory_map=True).schema_arrow.remove_metadata()
+
+    def import_parquet(self, path: str, symbol: str, tf: str):
+        """Loads a legacy single-file history (data/raw/{symbol}_{tf}.parquet) into the store."""
+        self.write(symbol, tf, pd.read_parquet(path))
+
+    # --- Reads ---
+
+    def plan(self, symbol: str, tf: str, start=None, end=None) -> ScanPlan:
+        """Files and row groups whose time statistics overlap [start, end]."""
+        lo, hi = _bound(start, upper=False), _bound(end, upper=True)
+        years = (lo.year if lo is not None else 0, hi.year if hi is not None else 9999)
+        files = []
+        for path in self.files(symbol, tf, years):
+            meta = pq.ParquetFile(path, memory_map=True).metadata
+            col = meta.schema.to_arrow_schema().get_field_index(TIME_COLUMN)
+            groups = []
+            for g in range(meta.num_row_groups):
+                stats = meta.row_group(g).column(col).statistics
+                if stats is None or not stats.has_min_max:
+                    groups.append(g)
+                    continue
+                g_lo, g_hi = pd.Timestamp(stats.min), pd.Timestamp(stats.max)
+                if (hi is None or g_lo <= hi) and (lo is None or g_hi >= lo):
+                    groups.append(g)
+            if groups:
+                files.append((path, groups))
+        return ScanPlan(files)
+
+    def read_table(self, symbol: str, tf: str, start=None, end=None,
+                   columns: Optional[Sequence[str]] = None) -> pa.Table:
+        """Arrow table of the bars in [start, end] (memory-mapped, only the planned row groups)."""
+        lo, hi = _bound(start, upper=False), _bound(end, upper=True)
+        wanted = None if columns is None else list(dict.fromkeys([TIME_COLUMN, *columns]))
+        tables = []
+        for path, groups in self.plan(symbol, tf, start, end).files:
+            tables.append(pq.ParquetFile(path, memory_map=True).read_row_groups(groups, columns=wanted))
+        if not tables:
+            return pa.table({TIME_COLUMN: pa.array([], pa.timestamp('ns'))})
+        table = pa.concat_tables(tables, promote_options='default')
+        if lo is not None or hi is not None:
+            ns = pa.timestamp('ns')
+            times = pc.cast(table[TIME_COLUMN], ns)
+            mask = None
+            if lo is not None:
+                mask = pc.greater_equal(times, pa.scalar(lo.value, ns))
+            if hi is not None:
+                upper = pc.less_equal(times, pa.scalar(hi.value, ns))
+                mask = upper if mask is None else pc.and_(mask, upper)
+            table = table.filter(mask)
+        return table
+
+    def read(self, symbol: str, tf: str, start=None, end=None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Bars in [start, end] as a DataFrame indexed by time (the layout load_data expects)."""
+        df = self.read_table(symbol, tf, start, end, columns).to_pandas()
+        df[TIME_COLUMN] = pd.to_datetime(df[TIME_COLUMN])
+        return df.set_index(TIME_COLUMN)
+
+    def bounds(self, symbol: str, tf: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """(first, last) stored bar from file footers only, or None if empty."""
+        files = self.files(symbol, tf)
+        if not files:
+            return None
+        return _file_bounds(files[0])[0], _file_bounds(files[-1])[1]
+
+
+def _file_bounds(path: str) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    meta = pq.ParquetFile(path, memory_map=True).metadata
+    col = meta.schema.to_arrow_schema().get_field_index(TIME_COLUMN)
+    stats = [meta.row_group(g).column(col).statistics for g in range(meta.num_row_groups)]
+    return pd.Timestamp(min(s.min for s in stats)), pd.Timestamp(max(s.max for s in stats))
+
+
+def as_store_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Sorted frame with a `time` column (from the index if needed)."""
+    if TIME_COLUMN not in df.columns:
+        df = df.reset_index()
+        df = df.rename(columns={df.columns[0]: TIME_COLUMN})
+    frame = df.copy()
+    frame[TIME_COLUMN] = pd.to_datetime(frame[TIME_COLUMN])
+    frame = frame.sort_values(TIME_COLUMN, kind='stable').reset_index(drop=True)
+    if frame[TIME_COLUMN].duplicated().any():
+        raise ValueError("Duplicate bar times")
+    return frame
+
+
+def migrate_raw(raw_dir: str = "data/raw", store: Optional[OHLCVStore] = None) -> Dict[Tuple[str, str], int]:
+    """Imports every {symbol}_{tf}.parquet under raw_dir; returns rows per (symbol, tf)."""
+    store = store or OHLCVStore()
+    imported = {}
+    for name in sorted(os.listdir(raw_dir)):
+        m = re.match(r"^([A-Z0-9]+)_([A-Z]+\d+)\.parquet$", name)
+        if not m:
+            continue
+        symbol, tf = m.groups()
+        df = pd.read_parquet(os.path.join(raw_dir, name))
+        store.write(symbol, tf, df)
+        imported[(symbol, tf)] = len(df)
+    return imported
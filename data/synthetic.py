@@ -0,0 +1,26 @@
+"""
+SIGMA Synthetic Market
+Random-walk M30 bars resampled to H1..MN1 (bar-open labels), for tests,
+benchmarks and smoke runs without exchange data.
+"""
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+def make_market(n_days: int = 90, seed: int = 7, start: str = "2019-01-01") -> Dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(start, periods=n_days * 48, freq="30min", name="time")
+    close = 10000 + np.cumsum(rng.normal(0, 60, len(idx)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 80, len(idx))
+    low = np.minimum(open_, close) - rng.uniform(0, 80, len(idx))
+    m30 = pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': 1.0}, index=idx)
+
+    agg = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    data = {}
+    for tf, rule in [("MN1", "MS"), ("W1", "W-MON"), ("D1", "D"), ("H4", "4h"), ("H1", "h")]:
+        data[tf] = m30.resample(rule, label='left', closed='left').agg(agg).dropna()
+    data["M30"] = m30
+    return data
@@ -0,0 +1,158 @@
+"""
+SIGMA Incremental OHLCV Updater
+Brings a (symbol, tf) history in the OHLCVStore up to date by fetching only
+the bars after the last stored one and appending them as new files.
+
+    last stored bar (file footer) -> source(since=next bar) -> drop open bar
+        -> trim overlap -> validate seam -> store.append (staged, atomic)
+
+The seam check refuses to append anything that would leave a hole or a
+duplicate: the first new bar must be exactly one bar after the stored end
+and the new bars must be strictly increasing with a regular step (MN1: one
+calendar month). The appended bars are also audited (data.quality) and the
+issue table is returned with the result. A daily refresh therefore writes one small file per
+(symbol, tf) instead of rewriting the whole history.
+
+Sources are callables `source(symbol, tf, since) -> DataFrame` with a
+`time` column (or time index) and the stored value columns; `since` is
+None for an empty store. CcxtSource adapts a ccxt exchange.
+"""
+import os
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from data.quality import audit
+from data.store import OHLCVStore, TIME_COLUMN, as_store_frame
+
+# Bar length per SIGMA timeframe (MN1 is a calendar month)
+TIMEFRAME_STEPS = {
+    'M1': pd.Timedelta(minutes=1), 'M5': pd.Timedelta(minutes=5), 'M15': pd.Timedelta(minutes=15),
+    'M30': pd.Timedelta(minutes=30), 'H1': pd.Timedelta(hours=1), 'H4': pd.Timedelta(hours=4),
+    'D1': pd.Timedelta(days=1), 'W1': pd.Timedelta(weeks=1), 'MN1': pd.DateOffset(months=1),
+}
+CCXT_TIMEFRAMES = {
+    'M1': '1m', 'M5': '5m', 'M15': '15m', 'M30': '30m', 'H1': '1h', 'H4': '4h',
+    'D1': '1d', 'W1': '1w', 'MN1': '1M',
+}
+
+Source = Callable[[str, str, Optional[pd.Timestamp]], pd.DataFrame]
+
+
+class SeamError(ValueError):
+    """New bars do not continue the stored history exactly."""
+
+
+@dataclass
+class UpdateResult:
+    symbol: str
+    tf: str
+    rows: int              # Bars appended
+    files: List[str]       # New files
+    bytes_written: int
+    last: Optional[pd.Timestamp]  # Stored end after the update
+    issues: Optional[pd.DataFrame] = None  # data.quality audit of the appended bars
+
+
+def _step(tf: str):
+    if tf not in TIMEFRAME_STEPS:
+        raise ValueError(f"Unknown timeframe '{tf}', expected one of {list(TIMEFRAME_STEPS)}")
+    return TIMEFRAME_STEPS[tf]
+
+
+def next_bar(tf: str, t: pd.Timestamp) -> pd.Timestamp:
+    return pd.Timestamp(t) + _step(tf)
+
+
+def closed_bars(frame: pd.DataFrame, tf: str, now: pd.Timestamp) -> pd.DataFrame:
+    """Drops bars still open at `now` (bar-open labels: a bar closes at its open + one step)."""
+    return frame[frame[TIME_COLUMN] + _step(tf) <= now]
+
+
+def check_seam(last: Optional[pd.Timestamp], frame: pd.DataFrame, tf: str, allow_gaps: bool = False):
+    """Raises SeamError unless `frame` continues a history ending at `last` bar by bar."""
+    if frame.empty:
+        return
+    times = frame[TIME_COLUMN]
+    if not times.is_monotonic_increasing or times.duplicated().any():
+        raise SeamError(f"{tf}: new bars are not strictly increasing")
+    if last is not None:
+        if times.iloc[0] <= last:
+            raise SeamError(f"{tf}: new bars overlap the stored history (first {times.iloc[0]}, stored end {last})")
+        expected = next_bar(tf, last)
+        if times.iloc[0] != expected and not allow_gaps:
+            raise SeamError(f"{tf}: gap at the seam (expected {expected}, got {times.iloc[0]})")
+    if allow_gaps or len(times) < 2:
+        return
+    values = times.to_numpy()
+    bad = values[1:] != (times.iloc[:-1] + _step(tf)).to_numpy()
+    if bad.any():
+        k = int(bad.argmax()) + 1
+        raise SeamError(f"{tf}: gap inside the new bars ({times.iloc[k - 1]} -> {times.iloc[k]})")
+
+
+class IncrementalUpdater:
+    def __init__(self, store: OHLCVStore, source: Source):
+        self.store = store
+        self.source = source
+
+    def update(self, symbol: str, tf: str, now: Optional[pd.Timestamp] = None,
+               allow_gaps: bool = False) -> UpdateResult:
+        """Appends every closed bar after the stored end; raises SeamError on a bad seam."""
+        bounds = self.store.bounds(symbol, tf)
+        last = bounds[1] if bounds else None
+        since = next_bar(tf, last) if last is not None else None
+
+        fetched = self.source(symbol, tf, since)
+        frame = as_store_frame(fetched) if fetched is not None and len(fetched) else pd.DataFrame()
+        if not frame.empty:
+            frame = closed_bars(frame, tf, pd.Timestamp(now) if now is not None else pd.Timestamp.now(tz='UTC').tz_localize(None))
+        if not frame.empty and last is not None:
+            # Sources typically return the stored end again: trim, don't rewrite
+            frame = frame[frame[TIME_COLUMN] > last]
+        if frame.empty:
+            return UpdateResult(symbol, tf, 0, [], 0, last)
+
+        check_seam(last, frame, tf, allow_gaps)
+        issues = audit(frame, tf, seam=None)
+        files = self.store.append(symbol, tf, frame)
+        return UpdateResult(symbol, tf, len(frame), files, sum(os.path.getsize(f) for f in files),
+                            frame[TIME_COLUMN].iloc[-1], issues)
+
+    def update_all(self, symbol: str, timeframes: List[str], now: Optional[pd.Timestamp] = None) -> List[UpdateResult]:
+        return [self.update(symbol, tf, now) for tf in timeframes]
+
+
+class CcxtSource:
+    """
+    Paginated ccxt fetch from `since` to now (the pattern of
+    scripts/data_fetcher.py). `start` is used when the store is empty.
+    """
+
+    def __init__(self, exchange, market_symbol: str, start: str = "2020-01-01", limit: int = 1000):
+        self.exchange = exchange
+        self.market_symbol = market_symbol
+        self.start = pd.Timestamp(start)
+        self.limit = limit
+
+    def __call__(self, symbol: str, tf: str, since: Optional[pd.Timestamp]) -> pd.DataFrame:
+        cursor = int(((since if since is not None else self.start) - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1))
+        rows = []
+        while True:
+            batch = self.exchange.fetch_ohlcv(self.market_symbol, CCXT_TIMEFRAMES[tf], since=cursor, limit=self.limit)
+            if not batch:
+                break
+            rows.extend(batch)
+            if batch[-1][0] < cursor:
+                break
+            cursor = batch[-1][0] + 1
+        return ohlcv_frame(rows)
+
+
+def ohlcv_frame(rows: list) -> pd.DataFrame:
+    """ccxt-style [timestamp_ms, open, high, low, close, volume] rows in the stored layout."""
+    df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df = df.drop_duplicates(subset=['timestamp']).sort_values('timestamp').reset_index(drop=True)
+    df[TIME_COLUMN] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df
@@ -0,0 +1,296 @@
+"""
+SIGMA Binance Vision Downloader
+Concurrent kline archive downloads from Binance Public Data
+(data.binance.vision) with a verified, content-addressed local cache.
+
+- One pooled requests.Session shared by a bounded thread pool; monthly
+  archives are fetched in parallel, and months without a monthly archive
+  (usually the current one) fall back to their daily archives in the same
+  pool.
+- Every archive is checked against its published `.CHECKSUM` (sha256)
+  while it streams to disk; nothing is held in memory whole.
+- Verified archives are stored under their sha256 (objects/ab/abcd...zip)
+  with a ref per URL, so a re-run resolves from disk without a request.
+- A missing archive (404) is an expected outcome of the monthly/daily
+  fallback and returns None; any other failure raises VisionError.
+- CSVs are decoded by pyarrow straight into typed columns (header rows of
+  newer futures files are detected; microsecond spot timestamps from 2025
+  on are normalised to milliseconds).
+
+Market policy follows the original script: spot archives before 2020,
+USD-M futures from 2020 on.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = "https://data.binance.vision"
+KLINE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+INTERVALS = {'M1': '1m', 'M5': '5m', 'M15': '15m', 'M30': '30m', 'H1': '1h', 'H4': '4h', 'D1': '1d', 'W1': '1w', 'MN1': '1mo'}
+FUTURES_FROM = pd.Timestamp("2020-01-01")  # Spot archives before, USD-M futures from here on
+_CHUNK = 1 << 20
+
+
+class VisionError(RuntimeError):
+    """An archive could not be downloaded or did not verify."""
+
+
+class ChecksumError(VisionError):
+    pass
+
+
+@dataclass(frozen=True)
+class Archive:
+    market: str    # 'spot' or 'um'
+    cadence: str   # 'monthly' or 'daily'
+    symbol: str
+    interval: str  # Binance interval, e.g. '30m'
+    period: str    # 'YYYY-MM' or 'YYYY-MM-DD'
+
+    @property
+    def path(self) -> str:
+        root = "data/spot" if self.market == 'spot' else f"data/futures/{self.market}"
+        name = f"{self.symbol}-{self.interval}-{self.period}.zip"
+        return f"{root}/{self.cadence}/klines/{self.symbol}/{self.interval}/{name}"
+
+
+def market_for(year: int) -> str:
+    return 'spot' if year < FUTURES_FROM.year else 'um'
+
+
+def month_periods(start, end) -> List[str]:
+    return [str(p) for p in pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq='M')]
+
+
+class VisionClient:
+    def __init__(self, cache_dir: str = "data/cache/vision", base_url: str = BASE_URL,
+                 workers: int = 8, timeout: float = 30.0, retries: int = 3):
+        self.cache_dir = cache_dir
+        self.base_url = base_url.rstrip('/')
+        self.workers = workers
+        self.timeout = timeout
+        self.requests = 0  # HTTP requests made (cache hits make none)
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0'
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=('GET',))
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- Cache ---
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "objects", digest[:2], f"{digest}.zip")
+
+    def _ref_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, "refs", hashlib.sha256(url.encode()).hexdigest())
+
+    def _cached(self, url: str) -> Optional[str]:
+        try:
+            with open(self._ref_path(url)) as f:
+                digest = f.read().strip()
+        except FileNotFoundError:
+            return None
+        path = self._object_path(digest)
+        return path if os.path.exists(path) else None
+
+    def _write_ref(self, url: str, digest: str):
+        ref = self._ref_path(url)
+        os.makedirs(os.path.dirname(ref), exist_ok=True)
+        tmp = f"{ref}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(digest)
+        os.replace(tmp, ref)
+
+    # --- Network ---
+
+    def _get(self, url: str, stream: bool = False) -> Optional[requests.Response]:
+        self.requests += 1
+        try:
+            response = self.session.get(url, timeout=self.timeout, stream=stream)
+        except requests.RequestException as e:
+            raise VisionError(f"GET {url} failed: {e}") from e
+        if response.status_code == 404:
+            response.close()
+            return None
+        if response.status_code != 200:
+            response.close()
+            raise VisionError(f"GET {url} returned HTTP {response.status_code}")
+        return response
+
+    def fetch(self, archive: Archive) -> Optional[str]:
+        """Local path of the verified archive (downloading it if needed), or None if it does not exist."""
+        url = f"{self.base_url}/{archive.path}"
+        cached = self._cached(url)
+        if cached:
+            return cached
+
+        checksum = self._get(url + ".CHECKSUM")
+        if checksum is None:
+            return None
+        expected = checksum.text.split()[0].lower() if checksum.text.strip() else ''
+        if len(expected) != 64:
+            raise VisionError(f"Malformed checksum file for {url}")
+
+        response = self._get(url, stream=True)
+        if response is None:
+            return None
+        objects = os.path.join(self.cache_dir, "objects")
+        os.makedirs(objects, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=objects, suffix=".part")
+        try:
+            with os.fdopen(fd, 'wb') as f, response:
+                for chunk in response.iter_content(_CHUNK):
+                    digest.update(chunk)
+                    f.write(chunk)
+            if digest.hexdigest() != expected:
+                raise ChecksumError(f"Checksum mismatch for {url}: got {digest.hexdigest()}, expected {expected}")
+            path = self._object_path(expected)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._write_ref(url, expected)
+        return path
+
+    # --- Klines ---
+
+    def klines(self, symbol: str, interval: str, start, end) -> pd.DataFrame:
+        """
+        Bars from the archives covering [start, end] months, in the raw-file
+        layout (timestamp ms, OHLCV, time). Monthly archives first; a month
+        without one is assembled from its daily archives.
+        """
+        months = month_periods(start, end)
+        monthly = [Archive(market_for(int(m[:4])), 'monthly', symbol, interval, m) for m in months]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            paths = list(pool.map(self.fetch, monthly))
+            missing = [m for m, p in zip(months, paths) if p is None]
+            daily = [Archive(market_for(int(m[:4])), 'daily', symbol, interval, str(day.date()))
+                     for m in missing for day in pd.date_range(m, periods=pd.Period(m).days_in_month, freq='D')]
+            paths += list(pool.map(self.fetch, daily))
+
+        frames = [read_kline_zip(p) for p in paths if p is not None]
+        if not frames:
+            return _kline_frame(pa.table({c: pa.array([], pa.int64() if c == 'timestamp' else pa.float64())
+                                          for c in KLINE_COLUMNS}))
+        df = pd.concat(frames, ignore_index=True)
+        df = df.drop_duplicates(subset=['timestamp']).sort_values('timestamp').reset_index(drop=True)
+        return df
+
+
+_TYPES = {
+    'timestamp': pa.int64(), 'open': pa.float64(), 'high': pa.float64(),
+    'low': pa.float64(), 'close': pa.float64(), 'volume': pa.float64(),
+}
+
+
+def read_kline_zip(path: str) -> pd.DataFrame:
+    """Decodes one kline archive's CSV into typed columns (first six fields only)."""
+    with zipfile.ZipFile(path) as z:
+        name = z.namelist()[0]
+        with z.open(name) as f:
+            raw = f.read()
+    first = raw[:raw.find(b'\n')] if b'\n' in raw else raw
+    n_fields = first.count(b',') + 1
+    names = KLINE_COLUMNS + [f"_{k}" for k in range(n_fields - len(KLINE_COLUMNS))]
+    table = pacsv.read_csv(
+        io.BytesIO(raw),
+        read_options=pacsv.ReadOptions(column_names=names, skip_rows=0 if first[:1].isdigit() else 1),
+        convert_options=pacsv.ConvertOptions(column_types=_TYPES, include_columns=KLINE_COLUMNS),
+    )
+    return _kline_frame(table)
+
+
+def _kline_frame(table: pa.Table) -> pd.DataFrame:
+    ts = table['timestamp'].to_numpy()
+    # Spot archives switched to microsecond timestamps in 2025
+    ts = np.where(ts > 10**14, ts // 1000, ts)
+    df = pd.DataFrame({c: table[c].to_numpy() for c in KLINE_COLUMNS[1:]})
+    df.insert(0, 'timestamp', ts.astype(np.int64))
+    df['time'] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df
+
+
+def download(symbols: Iterable[str], timeframes: Iterable[str], start, end,
+             client: Optional[VisionClient] = None) -> dict:
+    """{(symbol, tf): frame} for SIGMA timeframe names (see INTERVALS)."""
+    own = client is None
+    client = client or VisionClient()
+    try:
+        return {(s, tf): client.klines(s, INTERVALS[tf], start, end) for s in symbols for tf in timeframes}
+    finally:
+        if own:
+            client.close()
+
+
+def download_to_raw(symbol: str = "BTCUSDT", timeframes: Iterable[str] = ("D1", "H4", "H1", "M30"),
+                    start="2018-01-01", end=None, data_dir: str = "data/raw",
+                    cache_dir: str = "data/cache/vision", workers: int = 8) -> dict:
+    """
+    Downloads `timeframes` into data_dir/{symbol}_{tf}.parquet, audited
+    across the spot -> futures seam (issues saved next to the bars). W1 and
+    MN1 are synthesized from D1. Returns {tf: rows saved}.
+    """
+    from data.quality import audit, summarize  # data.quality imports this module
+    from data.resample import resample_frames
+
+    os.makedirs(data_dir, exist_ok=True)
+    end = pd.Timestamp.now() if end is None else min(pd.Timestamp(end), pd.Timestamp.now())
+    saved = {}
+    with VisionClient(cache_dir=cache_dir, workers=workers) as client:
+        for tf in timeframes:
+            print(f"\n⬇️ STARTING: {tf} ({pd.Timestamp(start).date()} -> {end.date()})")
+            df = client.klines(symbol, INTERVALS[tf], start, end)
+            print(f"    {client.requests} requests so far (cache hits need none)")
+            if df.empty:
+                print(f"❌ CRITICAL ERROR: No data found for {tf}")
+                continue
+
+            issues = audit(df, tf)
+            if len(issues):
+                print(f"⚠️ {len(issues)} data issues {summarize(issues)}:")
+                print(issues.to_string(index=False))
+                issues.to_csv(os.path.join(data_dir, f"{symbol}_{tf}_issues.csv"), index=False)
+            path = os.path.join(data_dir, f"{symbol}_{tf}.parquet")
+            df.to_parquet(path)
+            saved[tf] = len(df)
+            print(f"🏆 SAVED: {tf} to {path} ({len(df)} bars)")
+
+            if tf == 'D1':
+                print("🧬 Synthesizing MN1 & W1...")
+                # Bar-open labels (Monday weeks, month starts), complete bars only
+                for higher, bars in resample_frames(df, 'D1', ['W1', 'MN1']).items():
+                    bars = bars.reset_index()
+                    bars.insert(0, 'timestamp', (bars['time'] - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1))
+                    bars.to_parquet(os.path.join(data_dir, f"{symbol}_{higher}.parquet"))
+                    saved[higher] = len(bars)
+                print("✅ Synthesis Complete.")
+    return saved
@@ -20,11 +20,11 @@ def analyze_efficiency():
     df = pd.read_csv(trade_log_path)
     
     # 1. SL Buffer Efficiency (MAE)
-    # Note: max_adverse_excursion and max_favorable_excursion need to be tracked 
-    # per tick/bar in the trade_manager during simulation.
-    # If they are 0.0, it means we only have the final PnL.
-    
-    if 'max_adverse_excursion' not in df.columns or df['max_adverse_excursion'].sum() == 0:
+    # ClosedTrade carries bar-exact excursions (ExcursionTracker): range
+    # min/max of the driver wicks between the open and close bars.
+    # Logs from older runs lack the columns; fall back to PnL outcomes.
+    exact = 'max_adverse_excursion' in df.columns and df['max_adverse_excursion'].sum() > 0
+    if not exact:
         print("⚠️ High-fidelity MFE/MAE data missing from log. Estimating from PnL outcomes.")
         df['max_favorable_excursion'] = df['pnl'].clip(lower=0)
         df['max_adverse_excursion'] = df['pnl'].clip(upper=0).abs()
@@ -33,6 +33,12 @@ def analyze_efficiency():
     max_mae = df['max_adverse_excursion'].max()
     print(f"Average Adverse Excursion: ${avg_mae:.2f}")
     print(f"Maximum Adverse Excursion: ${max_mae:.2f}")
+    if exact:
+        print(f"Average / Max MAE (points): {df['mae_points'].mean():.2f} / {df['mae_points'].max():.2f}")
+        # Winners that came close to the stop show how much buffer is really used
+        wins_mae = df.loc[df['pnl'] > 0, 'mae_points']
+        if len(wins_mae) > 0:
+            print(f"95th pct MAE of Winners (points): {wins_mae.quantile(0.95):.2f}")
     print("-" * 50)
 
     # 2. TP Optimization (MFE)
@@ -40,6 +46,11 @@ def analyze_efficiency():
     if len(wins) > 0:
         avg_mfe = wins['max_favorable_excursion'].mean()
         print(f"Average Favorable Excursion (Wins): ${avg_mfe:.2f}")
+    if exact:
+        print(f"Average MFE (points): {df['mfe_points'].mean():.2f}")
+        # Share of the best excursion actually banked by the exit
+        captured = (df['pnl'] / df['max_favorable_excursion'].replace(0, np.nan)).clip(upper=1.0)
+        print(f"Average MFE Capture: {captured.mean() * 100:.1f}%")
     
     # 3. Distribution Analysis
     print("🚀 EXPECTANCY DISTRIBUTION")
@@ -0,0 +1,71 @@
+"""
+bench_portfolio_scaling.py
+
+Run time of PortfolioBacktester.run_simulation against the number of
+symbols. Every symbol gets its own synthetic random-walk market over the
+same window, so the merged clock stays fixed and only the symbol count
+grows. Detection is timed separately (it is per symbol and parallelizable).
+
+Columns: symbol-bars is ticks x symbols minus the bars the lanes
+fast-forwarded over; us/bar is simulation time per processed symbol-bar.
+Flat us/bar means the loop scales with processed symbol-bars; a rising one
+shows per-tick costs that grow with the symbol or open-position count.
+
+    python -m scripts.bench_portfolio_scaling [--symbols 1 5 10 25 50] [--days 120]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import pandas as pd
+
+from simulation.engine.portfolio_backtester import PortfolioBacktester, PortfolioConfig
+from data.synthetic import make_market
+
+
+def build(n_symbols, days, max_concurrent):
+    """Synthetic markets from 2019-01-01; the first 30 days are detection warmup."""
+    start = pd.Timestamp("2019-01-01")
+    pf = PortfolioBacktester(PortfolioConfig(
+        symbols=[f"SYM{k:03d}USDT" for k in range(n_symbols)],
+        start_date=str(start + pd.Timedelta(days=30)), end_date=str(start + pd.Timedelta(days=days - 1)),
+        max_concurrent=max_concurrent,
+    ))
+    for k, book in enumerate(pf.books.values()):
+        book.data = make_market(days, seed=100 + k)
+    return pf
+
+
+def run(n_symbols, days, max_concurrent):
+    pf = build(n_symbols, days, max_concurrent)
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        pf.run_detection_pipeline()
+        t1 = time.perf_counter()
+        pf.run_simulation()
+        t2 = time.perf_counter()
+    symbol_bars = len(pf.clock) * n_symbols - pf.bars_skipped
+    return {
+        'detect_s': t1 - t0, 'sim_s': t2 - t1, 'ticks': len(pf.clock), 'symbol_bars': symbol_bars,
+        'us_per_bar': (t2 - t1) / symbol_bars * 1e6, 'trades': len(pf.get_ledger()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--max-concurrent", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.days} days of M30 bars per symbol, max_concurrent={args.max_concurrent}\n")
+    print(f"{'symbols':>8}{'detect s':>10}{'sim s':>9}{'ticks':>8}{'symbol-bars':>13}{'us/bar':>9}{'trades':>8}")
+    for n in args.symbols:
+        r = run(n, args.days, args.max_concurrent)
+        print(f"{n:>8}{r['detect_s']:>10.2f}{r['sim_s']:>9.2f}{r['ticks']:>8}{r['symbol_bars']:>13}"
+              f"{r['us_per_bar']:>9.1f}{r['trades']:>8}")
+
+
+if __name__ == "__main__":
+    main()
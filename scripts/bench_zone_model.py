@@ -0,0 +1,87 @@
+"""
+bench_zone_model.py
+
+Memory per zone and attribute access cost of the slotted B2BZoneInfo
+against the previous flat dataclass (one __dict__ per zone, trade-outcome
+fields stored inline). Zones are cloned from a detection run on a
+synthetic market so values (floats, datetimes, enums) are realistic.
+
+    python -m scripts.bench_zone_model [--zones 200000]
+"""
+import argparse
+import time
+import tracemalloc
+from dataclasses import make_dataclass, fields
+
+from core.detectors.b2b_engine import detect_b2b_zones
+from core.detectors.swing_points import detect_swings
+from core.models.structures import B2BZoneInfo, ZoneTradeOutcome, ZONE_FIELDS
+from data.synthetic import make_market
+
+# The pre-slots model: every field inline, instance __dict__
+LegacyZone = make_dataclass(
+    'LegacyZone', [(f.name, f.type, f.default) for f in fields(B2BZoneInfo) if f.name != 'outcome']
+    + [(f.name, f.type, f.default) for f in fields(ZoneTradeOutcome)],
+)
+
+
+def sample_zones():
+    df = make_market(400, seed=3)['M30'].reset_index()
+    return detect_b2b_zones(df, detect_swings(df), tf='M30')
+
+
+def build(cls, template, n):
+    values = [{name: getattr(z, name) for name in ZONE_FIELDS} for z in template]
+    return [cls(**values[k % len(values)]) for k in range(n)]
+
+
+def bytes_per_zone(cls, template, n):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    zones = build(cls, template, n)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del zones
+    return used / n
+
+
+def scan_ns(zones, repeat=5):
+    """Per-zone cost of the zone_status hot loop reads."""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        hits = 0
+        for z in zones:
+            if z.is_valid and not z.L2_touched and z.L1_price > z.L2_price and z.touch_count >= 0:
+                hits += 1
+        best = min(best, time.perf_counter() - t0)
+    return best / len(zones) * 1e9
+
+
+def outcome_ns(zones, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        total = 0.0
+        for z in zones:
+            total += z.pnl_money
+        best = min(best, time.perf_counter() - t0)
+    return best / len(zones) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--zones", type=int, default=200_000)
+    args = parser.parse_args()
+
+    template = sample_zones()
+    print(f"{len(template)} detected template zones, {args.zones} instances per model\n")
+    print(f"{'model':<12}{'bytes/zone':>12}{'scan ns/zone':>15}{'outcome ns/zone':>18}")
+    for name, cls in (('legacy', LegacyZone), ('slotted', B2BZoneInfo)):
+        size = bytes_per_zone(cls, template, args.zones)
+        zones = build(cls, template, args.zones)
+        print(f"{name:<12}{size:>12.0f}{scan_ns(zones):>15.1f}{outcome_ns(zones):>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,47 @@
+# Run from the repository root: python -m scripts.monte_carlo_validation
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 
-def run_monte_carlo(log_path, iterations=10000, initial_capital=10000):
+from simulation.montecarlo import MonteCarloConfig, run_monte_carlo as simulate
+
+def run_monte_carlo(log_path, iterations=10000, initial_capital=10000, resample='permutation', seed=42):
     df = pd.read_csv(log_path)
     
     # Calculate % returns per trade based on pnl/capital (proxy)
     # Since we don't have absolute capital per trade in the log, we use the profit percentage
     # In our engine, pnl is usually absolute USDT. Let's assume a fixed risk per trade for the sim.
     returns = df['pnl'].values
-    
-    # CAGR calculation helper
-    def calc_cagr(final_val, initial_val, years):
-        if final_val <= 0: return -1.0
-        return (final_val / initial_val) ** (1/years) - 1
 
-    # Max Drawdown helper
-    def calc_mdd(equity_curve):
-        peak = np.maximum.accumulate(equity_curve)
-        drawdown = (equity_curve - peak) / peak
-        return np.min(drawdown)
+    # Shuffle (or block bootstrap), variable slippage (0.01-0.05% of capital per trade)
+    # and a 5% execution drop, evaluated in seeded chunks across all cores
+    config = MonteCarloConfig(
+        iterations=iterations,
+        initial_capital=initial_capital,
+        years=3.0, # 3 years total OOS
+        resample=resample,
+        slippage=(0.0001, 0.0005),
+        drop_prob=0.05,
+        ruin_dd=0.90,
+        seed=seed,
+    )
 
-    results_cagr = []
-    results_mdd = []
-    
-    print(f"--- MONTE CARLO SIMULATION ({iterations} Iterations) ---")
+    print(f"--- MONTE CARLO SIMULATION ({iterations} Iterations, {resample}) ---")
     print(f"Base Trades: {len(returns)}")
-    
-    for i in range(iterations):
-        # 1. Shuffle
-        sim_returns = np.random.permutation(returns)
-        
-        # 2. Variable Slippage (Randomly subtract 1-3% from wins, add to losses)
-        # Assuming avg trade is ~1% of capital, slippage of 0.1% of capital
-        slippage = np.random.uniform(0.0001, 0.0005, len(sim_returns)) 
-        sim_returns = sim_returns - (initial_capital * slippage)
-        
-        # 3. Execution Drop (Randomly skip 5% of trades)
-        mask = np.random.choice([0, 1], size=len(sim_returns), p=[0.05, 0.95])
-        sim_returns = sim_returns * mask
-        
-        # 4. Construct Equity Curve
-        equity_curve = initial_capital + np.cumsum(sim_returns)
-        
-        # 5. Metrics
-        final_val = equity_curve[-1]
-        cagr = calc_cagr(final_val, initial_capital, 3.0) # 3 years total OOS
-        mdd = calc_mdd(equity_curve)
-        
-        results_cagr.append(cagr * 100)
-        results_mdd.append(mdd * 100)
 
-    # Statistical Summary
-    results_cagr = np.array(results_cagr)
-    results_mdd = np.array(results_mdd)
-    
+    result = simulate(returns, config)
+    results_cagr = result.cagr * 100
+    results_mdd = result.max_dd * 100
+
     print("\n--- STATISTICAL CONFIDENCE (95% CI) ---")
     print(f"CAGR Mean: {np.mean(results_cagr):.2f}%")
     print(f"CAGR 5th Percentile (Worst Case): {np.percentile(results_cagr, 5):.2f}%")
     print(f"Max DD Mean: {np.mean(results_mdd):.2f}%")
     print(f"Max DD 95th Percentile (Worst Case): {np.percentile(results_mdd, 5):.2f}%")
-    print(f"Probability of Ruin (DD > 90%): {(np.sum(results_mdd < -90) / iterations * 100):.2f}%")
+    print(f"Probability of Ruin (DD > 90%): {result.ruin_probability * 100:.2f}%")
+    print(f"Final Equity 5th / 50th / 95th Percentile: {result.bands[0.05][-1]:.0f} / {result.bands[0.5][-1]:.0f} / {result.bands[0.95][-1]:.0f} USDT")
 
     # --- VISUALIZATION ---
     # Syncing to both artifact and research report directories
@@ -73,17 +52,16 @@ def run_monte_carlo(log_path, iterations=10000, initial_capital=10000):
     import matplotlib
     matplotlib.use('Agg')
     
-    # 1. Equity Fan Chart (Spaghetti Plot)
+    # 1. Equity Fan Chart (5/25/50/75/95% bands over all iterations)
     plt.figure(figsize=(12, 6))
     plt.title(f"B2B Alpha Sentinel: Monte Carlo Equity Fan ({iterations} Iterations)")
     
-    # Run a few sample paths for the visual
-    for _ in range(100):
-        path = initial_capital + np.cumsum(np.random.permutation(returns) - (initial_capital * 0.0002))
-        plt.plot(path, color='gray', alpha=0.1, linewidth=0.5)
+    bands = result.bands
+    steps = np.arange(len(bands[0.5]))
+    plt.fill_between(steps, bands[0.05], bands[0.95], color='steelblue', alpha=0.2, linewidth=0, label='5-95%')
+    plt.fill_between(steps, bands[0.25], bands[0.75], color='steelblue', alpha=0.4, linewidth=0, label='25-75%')
+    plt.plot(steps, bands[0.5], color='navy', label='Median', linewidth=2)
     
-    # Highlight Mean Path
-    plt.plot(initial_capital + np.cumsum(np.full(len(returns), np.mean(returns))), color='blue', label='Mean Path', linewidth=2)
     plt.axhline(initial_capital, color='black', linestyle='--')
     plt.ylabel("Equity (USDT)")
     plt.xlabel("Trade Number")
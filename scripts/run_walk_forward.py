@@ -0,0 +1,28 @@
+"""
+Walk-forward run of the research grid on BTCUSDT: 2021 onward, 2-year
+rolling train / 1-year test. Everything before the first train window
+(2020) is structural warmup. Equivalent to `python -m sigma walk-forward`
+with these arguments; run from the repository root:
+
+    python -m scripts.run_walk_forward
+"""
+import logging
+
+from sigma.cli import main as sigma
+
+ARGS = [
+    "walk-forward", "--symbol", "BTCUSDT", "--timeframes", "MN1,W1,D1,H4,H1,M30",
+    "--start", "2021-01-01", "--end", "2026-01-01", "--record-start", "2020-01-01",
+    "--train-months", "24", "--test-months", "12", "--objective", "sharpe",
+    "--param", "gasket_multiple=2.0,3.0,4.0",
+    "--param", "sl_buffer=100.0,200.0,400.0",
+    "--param", "base_risk_pct=0.005,0.01",
+    "--balance", "10000", "--out", "research/reports/walk_forward",
+]
+
+def main():
+    logging.basicConfig(level=logging.ERROR)
+    return sigma(ARGS)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,9 @@
+# Run from the repository root: python -m scripts.verify_data
 import pandas as pd
-import os
 from pathlib import Path
 
+from data.quality import audit, summarize
+
 DATA_DIR = Path("data/raw")
 TIMEFRAMES = ["MN1", "W1", "D1", "H4", "H1", "M30"]
 SYMBOL = "BTCUSDT"
@@ -39,6 +41,13 @@ def verify_data():
                 all_ok = False
                 
             print(f"{status} {tf}: {start.date()} -> {end.date()} (Rows: {len(df)})")
+
+            # Check content (gaps, duplicates, broken bars, outliers, spot->futures seam)
+            issues = audit(df, tf)
+            if len(issues):
+                all_ok = False
+                print(f"   ⚠️ Issues: {summarize(issues)}")
+                print(issues.to_string(index=False, max_rows=20))
             
         except Exception as e:
             print(f"❌ {tf}: Error reading file: {e}")
@@ -25,7 +25,7 @@ def audit_redundancy(log_path):
     for (origin_tf), group in grouped:
         origin_id, tf = origin_tf
         
-        if pd.isna(origin_id) or origin_id == "": continue
+        if pd.isna(origin_id) or origin_id in ("", 0): continue
         
         trades = group.sort_values('open_time').to_dict('records')
         
@@ -0,0 +1,3 @@
+"""
+SIGMA command line tools. Run with `python -m sigma --help`.
+"""
@@ -0,0 +1,49 @@
+"""
+SIGMA Simulation Checkpoints
+Versioned binary snapshots of the full single-symbol simulation state, taken
+at bar boundaries (before bar `bar` is processed):
+
+- lane:         zone pointers, active zone membership, created-zone state
+- tf_state:     per-timeframe sync cursors
+- orchestrator: FlowStates with latches, origin blacklist, governor blocks
+- execution:    balance, ticket counter, open positions, equity curve and
+                either the in-memory ledger or the streamed ledger offset
+- tape:         signals recorded so far (record_tape runs only)
+
+File layout: 8-byte magic, uint16 format version, then a zlib-compressed
+pickle of the state dict. Writes go to a temp file and are renamed, so the
+latest complete checkpoint always survives a crash.
+"""
+import os
+import pickle
+import struct
+import zlib
+
+MAGIC = b"SIGMACKP"
+CHECKPOINT_VERSION = 1
+_HEADER = struct.Struct("<8sH")
+
+
+def write_checkpoint(path: str, state: dict):
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 6)
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, CHECKPOINT_VERSION))
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def read_checkpoint(path: str) -> dict:
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"Not a SIGMA checkpoint: {path}")
+        magic, version = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"Not a SIGMA checkpoint: {path}")
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version} (expected {CHECKPOINT_VERSION})")
+        return pickle.loads(zlib.decompress(f.read()))
@@ -0,0 +1,180 @@
+"""
+SIGMA Exit Engine
+Vectorized first-hit exit search for SL / TP / Break-Even / Trailing Stop.
+
+Given an entry bar, a position's exit bar and price are fully determined by
+the driver high/low/close arrays. The engine reproduces
+TradeManager.manage_positions exactly:
+
+    per bar: BE (once, on close profit) -> trail (close - distance, ratchet)
+             -> SL check on the wick -> TP check on the wick
+
+Stops are modelled as piecewise segments:
+1. Constant initial SL until the first BE/trail activation bar
+   (first-crossing queries on PriceRangeIndex).
+2. Constant BE stop when trailing never activates (first-crossing again).
+3. Otherwise a ratcheting stop = running max of (close - distance) over
+   eligible bars, reset to the BE level on the BE bar, evaluated in
+   doubling numpy windows.
+
+Bearish positions are handled by mirroring prices (negation is exact in
+IEEE-754), so a single bullish implementation serves both directions.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from core.risk.sizing import SymbolParams
+from core.system.price_index import PriceRangeIndex, _MaxTable
+
+EXIT_STOP_LOSS = "Stop Loss"
+EXIT_TAKE_PROFIT = "Take Profit"
+EXIT_FORCED = "Forced Close (End of Sim)"
+
+_FIRST_WINDOW = 64
+
+
+class _Orientation:
+    """Bullish view of the driver arrays (bearish = negated and swapped)."""
+
+    def __init__(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, block: int):
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.index = PriceRangeIndex(self.high, self.low, block)
+        self.close_index = _MaxTable(self.close, block)
+        self.n = len(self.close)
+
+    def first_profit_bar(self, start: int, stop: int, entry: float, activation: float) -> int:
+        """First bar with (close - entry) >= activation, using the engine's exact float predicate."""
+        target = entry + activation
+        # Conservative level: never later than the exact predicate's first hit
+        probe = target - (abs(entry) + abs(activation) + 1.0) * 1e-12
+        t = start
+        while True:
+            t = self.close_index.first_at_or_above(t, probe, stop)
+            if t >= stop or float(self.close[t]) - entry >= activation:
+                return t
+            t += 1
+
+    def first_hit(self, start: int, stop: int, sl: float, tp: Optional[float]) -> Tuple[int, bool]:
+        """First bar in [start, stop) hitting a constant SL (wins ties) or TP."""
+        t_sl = self.index.first_low_at_or_below(start, sl, stop)
+        t_tp = stop
+        if tp is not None:
+            t_tp = self.index.first_high_at_or_above(start, tp, t_sl)
+        if t_sl <= t_tp:
+            return t_sl, True
+        return t_tp, False
+
+
+class ExitEngine:
+    """Batch exit resolution over one driver price window."""
+
+    def __init__(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, block: int = 64):
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+        self.n = len(close)
+        self._last_close = float(close[-1]) if self.n else 0.0
+        self._bull = _Orientation(high, low, close, block)
+        self._bear = _Orientation(-low, -high, -close, block)
+
+    @property
+    def index(self) -> PriceRangeIndex:
+        """Range index over the unmirrored high/low arrays."""
+        return self._bull.index
+
+    def exit_for(self, start: int, direction: str, entry: float, sl: float, tp: float,
+                 params: Optional[SymbolParams]) -> Tuple[int, float, str]:
+        """
+        Resolves one position opened on bar `start`.
+        Returns (exit_bar, exit_price, reason); exit_bar == n means still open at the end.
+        """
+        if direction == 'BULLISH':
+            bar, price, hit_sl = self._resolve(self._bull, start, entry, sl, tp if tp > 0 else None, params)
+        else:
+            bar, price, hit_sl = self._resolve(self._bear, start, -entry, -sl, -tp if tp > 0 else None, params)
+            price = -price
+        if bar >= self.n:
+            return self.n, self._last_close, EXIT_FORCED
+        return bar, price, EXIT_STOP_LOSS if hit_sl else EXIT_TAKE_PROFIT
+
+    def exits(self, starts: np.ndarray, directions: np.ndarray, entries: np.ndarray, sls: np.ndarray,
+              tps: np.ndarray, params: Optional[SymbolParams]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Batch form of exit_for. Returns (exit_bar, exit_price, reason) arrays."""
+        m = len(starts)
+        bars = np.empty(m, dtype=np.int64)
+        prices = np.empty(m, dtype=np.float64)
+        reasons = np.empty(m, dtype=object)
+        for k in range(m):
+            bars[k], prices[k], reasons[k] = self.exit_for(
+                int(starts[k]), str(directions[k]), float(entries[k]), float(sls[k]), float(tps[k]), params
+            )
+        return bars, prices, reasons
+
+    def _resolve(self, o: _Orientation, start: int, entry: float, sl: float, tp: Optional[float],
+                 params: Optional[SymbolParams]) -> Tuple[int, float, bool]:
+        n = o.n
+        be_on = bool(params) and params.be_activation > 0
+        trail_on = bool(params) and params.trail_activation > 0
+
+        t_be = o.first_profit_bar(start, n, entry, params.be_activation) if be_on else n
+        t_tr = o.first_profit_bar(start, n, entry, params.trail_activation) if trail_on else n
+
+        # Segment 1: initial stop until the first management event
+        k = min(t_be, t_tr)
+        t, hit_sl = o.first_hit(start, k, sl, tp)
+        if t < k:
+            return t, sl if hit_sl else tp, hit_sl
+        if k >= n:
+            return n, 0.0, False
+
+        # Segment 2: BE-only management leaves a constant stop
+        be_sl = entry + params.be_lockin if be_on else 0.0
+        if t_tr >= n:
+            t, hit_sl = o.first_hit(k, n, be_sl, tp)
+            return t, be_sl if hit_sl else tp, hit_sl
+
+        # Segment 3: ratcheting stop, evaluated in doubling windows
+        return self._ratchet(o, k, entry, sl, tp, params, be_on, t_be, be_sl)
+
+    @staticmethod
+    def _ratchet(o: _Orientation, pos: int, entry: float, sl: float, tp: Optional[float],
+                 params: SymbolParams, be_on: bool, t_be: int, be_sl: float) -> Tuple[int, float, bool]:
+        n = o.n
+        width = _FIRST_WINDOW
+        be_done = not be_on or t_be < pos
+        while pos < n:
+            end = min(pos + width, n)
+            close = o.close[pos:end]
+            profit = close - entry
+            cand = np.where(profit >= params.trail_activation, close - params.trail_distance, -np.inf)
+
+            b = end - pos
+            if not be_done and t_be < end:
+                b = t_be - pos
+            path = np.empty(end - pos)
+            if b > 0:
+                path[:b] = np.maximum.accumulate(np.maximum(cand[:b], sl))
+            if b < end - pos:
+                path[b:] = np.maximum.accumulate(np.maximum(cand[b:], be_sl))
+                be_done = True
+
+            hit = o.low[pos:end] <= path
+            if tp is not None:
+                hit_tp = o.high[pos:end] >= tp
+                any_hit = hit | hit_tp
+            else:
+                any_hit = hit
+            j = np.flatnonzero(any_hit)
+            if len(j):
+                j = int(j[0])
+                if hit[j]:
+                    return pos + j, float(path[j]), True
+                return pos + j, tp, False
+
+            sl = float(path[-1])
+            pos = end
+            width *= 2
+        return n, 0.0, False
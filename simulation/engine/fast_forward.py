@@ -0,0 +1,88 @@
+"""
+SIGMA Fast-Forward Index
+Finds the next driver bar on which the per-bar loop can do any work.
+
+With no open position, a bar can only change the simulation if:
+1. A zone is created (pointer advance).
+2. A wick reaches the next untouched level of an active zone (T1/T2/T3).
+   Signals are only emitted on touch bars, so the scanner is idle otherwise.
+3. The close crosses any L1/L2 level of an active zone. Every orchestrator
+   price test (origin break, in-media-res, magnet, roadblock, invalidation)
+   compares the close to these levels, so while the close stays strictly
+   inside one level interval and the flow state is already at a fixed
+   point, update_flow_state is a no-op.
+
+All three are first-crossing queries on PriceRangeIndex, so a jump costs
+O(zones + log n) instead of one full loop iteration per bar.
+"""
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.models.structures import B2BZoneInfo, SignalDirection
+from core.system.price_index import PriceRangeIndex
+
+
+class FastForwardIndex:
+    """Precomputed event search over one simulation window."""
+
+    def __init__(self, sim_data: pd.DataFrame):
+        self.times = sim_data.index
+        self.n = len(sim_data)
+        self.wicks = PriceRangeIndex(sim_data['high'].to_numpy(), sim_data['low'].to_numpy())
+        close = sim_data['close'].to_numpy()
+        self.closes = PriceRangeIndex(close, close)
+
+    def next_event_bar(self, i: int, zones: List[B2BZoneInfo], next_created: Optional[pd.Timestamp] = None) -> int:
+        """
+        First bar after `i` that may change zone, flow or scanner state, given
+        the state left by bar `i`. Returns i + 1 when no jump is possible.
+        """
+        start = i + 1
+        if start >= self.n:
+            return self.n
+        stop = self.n
+
+        # 1. Zone creation
+        if next_created is not None:
+            stop = min(stop, int(self.times.searchsorted(next_created, side='left')))
+
+        # 3. Close level interval
+        close = self.closes.highs[i]
+        below, above = -np.inf, np.inf
+        # 2. Next touch level per direction
+        bear_touch, bull_touch = np.inf, -np.inf
+        for z in zones:
+            for level in (z.L1_price, z.L2_price):
+                if level == close:
+                    return start
+                if level < close:
+                    below = max(below, level)
+                else:
+                    above = min(above, level)
+
+            nxt = _next_touch_level(z)
+            if nxt is None:
+                continue
+            if z.direction == SignalDirection.BEARISH:
+                bear_touch = min(bear_touch, nxt)
+            else:
+                bull_touch = max(bull_touch, nxt)
+
+        stop = min(stop, self.closes.first_high_at_or_above(start, above, stop))
+        stop = min(stop, self.closes.first_low_at_or_below(start, below, stop))
+        stop = min(stop, self.wicks.first_high_at_or_above(start, bear_touch, stop))
+        stop = min(stop, self.wicks.first_low_at_or_below(start, bull_touch, stop))
+        return max(stop, start)
+
+
+def _next_touch_level(z: B2BZoneInfo) -> Optional[float]:
+    """Level whose touch is the zone's next status change (serial T1 -> T2 -> T3)."""
+    if not z.L1_touched:
+        return z.L1_price
+    if not z.fifty_touched:
+        return z.fifty_percent
+    if not z.L2_touched:
+        return z.L2_price
+    return None
@@ -0,0 +1,200 @@
+"""
+SIGMA Ledger Sink
+Streams closed trades to disk in fixed-size columnar batches.
+
+The in-memory TradeManager.ledger grows with every ClosedTrade. For sweeps and
+multi-symbol runs the sink replaces it: trades are buffered column-by-column,
+and every `batch_size` rows are flushed as one self-contained block.
+
+Formats:
+- 'parquet': `path` is a directory of part files (one row group each).
+  Every part is written to a temp name and renamed, so a crash never leaves
+  a half-written part behind.
+- 'ipc': `path` is a single Arrow IPC stream. Each batch is flushed as it is
+  written; a truncated tail is ignored by the reader.
+"""
+import os
+from dataclasses import fields
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from core.execution.trade_manager import ClosedTrade
+
+_ARROW_TYPES = {
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+    bool: pa.bool_(),
+    pd.Timestamp: pa.timestamp('ns'),
+}
+
+
+def ledger_schema() -> pa.Schema:
+    """Arrow schema derived from the ClosedTrade dataclass."""
+    return pa.schema([(f.name, _ARROW_TYPES[f.type]) for f in fields(ClosedTrade)])
+
+
+class LedgerSink:
+    """
+    Bounded-memory writer for ClosedTrade records.
+    Peak memory is one batch of `batch_size` rows regardless of trade count.
+
+    A new sink starts an empty ledger: part files left in `path` by an
+    earlier run are deleted. With resume=True they are kept, and nothing
+    can be written until rewind(offset) restores the position of the
+    checkpoint being resumed.
+    """
+
+    def __init__(self, path: str, batch_size: int = 4096, fmt: str = 'parquet', resume: bool = False):
+        if fmt not in ('parquet', 'ipc'):
+            raise ValueError(f"Unknown ledger format: {fmt}")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.fmt = fmt
+        self.schema = ledger_schema()
+        self.rows_written = 0
+
+        self._columns: Dict[str, list] = {name: [] for name in self.schema.names}
+        self._buffered = 0
+        self._part = 0
+        self._stream = None
+        self._writer = None
+
+        if fmt == 'parquet':
+            os.makedirs(path, exist_ok=True)
+            if resume:
+                self._part = None  # Set by rewind()
+            else:
+                for stale in _list_parts(path):
+                    os.remove(stale)
+        elif resume:
+            raise ValueError("Only parquet ledgers can be resumed")
+        else:
+            parent = os.path.dirname(path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            self._stream = pa.OSFile(path, 'wb')
+            self._writer = ipc.new_stream(self._stream, self.schema)
+
+    def append(self, trade: ClosedTrade):
+        for name in self.schema.names:
+            self._columns[name].append(getattr(trade, name))
+        self._buffered += 1
+        if self._buffered >= self.batch_size:
+            self.flush()
+
+    def extend(self, trades: List[ClosedTrade]):
+        for t in trades:
+            self.append(t)
+
+    def flush(self):
+        """Writes the buffered rows as one batch and clears the buffer."""
+        if self._buffered == 0:
+            return
+        if self._part is None:
+            raise ValueError("Resumed ledger: rewind(offset) before writing")
+
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(self._columns[f.name], type=f.type) for f in self.schema],
+            schema=self.schema,
+        )
+
+        if self.fmt == 'parquet':
+            final = os.path.join(self.path, f"part-{self._part:05d}.parquet")
+            tmp = final + ".tmp"
+            pq.write_table(pa.Table.from_batches([batch]), tmp)
+            os.replace(tmp, final)
+            self._part += 1
+        else:
+            self._writer.write_batch(batch)
+            self._stream.flush()
+
+        self.rows_written += self._buffered
+        self._columns = {name: [] for name in self.schema.names}
+        self._buffered = 0
+
+    def offset(self) -> dict:
+        """Position of the sink after a flush (for simulation checkpoints)."""
+        if self._part is None:
+            raise ValueError("Resumed ledger: rewind(offset) before taking an offset")
+        self.flush()
+        return {'fmt': self.fmt, 'rows': self.rows_written, 'parts': self._part}
+
+    def rewind(self, offset: dict):
+        """
+        Drops everything written after `offset` (trades closed after the
+        checkpoint a resumed run will replay). Parquet ledgers only: an IPC
+        stream cannot be reopened for appending.
+        """
+        if self.fmt != 'parquet' or offset['fmt'] != 'parquet':
+            raise ValueError("Only parquet ledgers can be rewound")
+        for part in _list_parts(self.path)[offset['parts']:]:
+            os.remove(part)
+        self._part = offset['parts']
+        self.rows_written = offset['rows']
+        self._columns = {name: [] for name in self.schema.names}
+        self._buffered = 0
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._stream.close()
+            self._writer = None
+            self._stream = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _list_parts(path: str) -> List[str]:
+    return sorted(
+        os.path.join(path, f) for f in os.listdir(path)
+        if f.startswith("part-") and f.endswith(".parquet")
+    )
+
+
+def scan_ledger(path: str, columns: Optional[List[str]] = None) -> Iterator[pa.RecordBatch]:
+    """
+    Lazily yields record batches from a ledger written by LedgerSink.
+    Works on partial ledgers left behind by a crashed run.
+    """
+    if os.path.isdir(path):
+        for part in _list_parts(path):
+            pf = pq.ParquetFile(part)
+            yield from pf.iter_batches(columns=columns)
+        return
+
+    with pa.OSFile(path, 'rb') as source:
+        try:
+            reader = ipc.open_stream(source)
+        except pa.ArrowInvalid:
+            return # Crashed before the first batch: empty ledger
+        while True:
+            try:
+                batch = reader.read_next_batch()
+            except StopIteration:
+                return
+            except (pa.ArrowInvalid, OSError):
+                return # Truncated tail from an interrupted write
+            yield batch.select(columns) if columns else batch
+
+
+def read_ledger(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Materializes a streamed ledger (or a column subset) as a DataFrame."""
+    batches = list(scan_ledger(path, columns))
+    if not batches:
+        schema = ledger_schema()
+        names = columns or schema.names
+        return pa.schema([schema.field(n) for n in names]).empty_table().to_pandas()
+    return pa.Table.from_batches(batches).to_pandas()
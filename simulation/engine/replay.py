@@ -0,0 +1,252 @@
+"""
+SIGMA Execution Replay
+Stage two of the two-stage backtest: replays TradeManager semantics over a
+recorded SignalTape for any RiskConfig / SymbolParams combination.
+
+Exit bar and exit price of a position depend only on its entry, stop and the
+driver prices, never on size. Exits for the whole tape are resolved up front
+by the ExitEngine; only sizing depends on the running balance, so the replay
+itself is a single pass over the tape with a heap of pending exits.
+"""
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.execution.excursions import ExcursionTracker
+from core.execution.trade_manager import ClosedTrade
+from core.models.structures import zone_label
+from core.risk.sizing import RiskCalculator, RiskConfig, SymbolParams, MAX_CONCURRENT_TRADES
+from simulation.engine.signal_tape import SignalTape
+
+
+@dataclass
+class ReplayResult:
+    trades: List[ClosedTrade]
+    final_balance: float
+    equity: Optional[np.ndarray] = None  # Mark-to-market per driver bar
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([vars(t) for t in self.trades])
+
+
+def replay_execution(
+    tape: SignalTape,
+    symbol_params: Optional[SymbolParams] = None,
+    risk_config: Optional[RiskConfig] = None,
+    initial_balance: float = 10000.0,
+    max_concurrent: int = MAX_CONCURRENT_TRADES,
+    with_equity: bool = True,
+) -> ReplayResult:
+    """
+    Replays execution of `tape` with the given risk settings.
+    Produces the same ledger (ticket order, prices, PnL) as TradeManager.
+    """
+    risk = RiskCalculator(risk_config or RiskConfig(base_risk_pct=0.01))
+    if symbol_params is not None:
+        risk.symbols[tape.symbol] = symbol_params
+    params = risk.symbols.get(tape.symbol)
+
+    # Buffered stops do not depend on balance: resolve every exit in one batch
+    n_sig = len(tape)
+    sls = np.empty(n_sig)
+    for k in range(n_sig):
+        sls[k], _ = risk.calculate_sl_and_size(
+            tape.symbol, float(tape.entry_price[k]), float(tape.structure_sl[k]), str(tape.direction[k]), initial_balance
+        )
+    exit_bars, exit_prices, exit_reasons = tape.exit_engine.exits(
+        tape.bar, tape.direction, tape.entry_price, sls, tape.tp_price, params
+    )
+
+    excursions = ExcursionTracker(tape.times, tape.exit_engine.index)
+
+    balance = initial_balance
+    ticket = 1
+    pending: List[tuple] = []        # (exit_bar, ticket, ClosedTrade) heap
+    open_zones: Dict[int, int] = {}  # zone_id -> open position count
+    ledger: List[ClosedTrade] = []
+    opened: List[tuple] = []         # (open_bar, exit_bar, sign, entry, size) for equity
+
+    def settle(until_bar: int):
+        nonlocal balance
+        while pending and pending[0][0] < until_bar:
+            _, _, trade, zone_id = heapq.heappop(pending)
+            balance += trade.pnl
+            open_zones[zone_id] -= 1
+            ledger.append(trade)
+
+    times = tape.times
+    for k in range(n_sig):
+        bar = int(tape.bar[k])
+        settle(bar)
+
+        if len(pending) >= max_concurrent:
+            continue
+
+        direction = str(tape.direction[k])
+        entry = float(tape.entry_price[k])
+        size = risk.calculate_lot_size(balance, entry, float(sls[k]))
+        if size <= 0:
+            continue
+
+        zone_id = int(tape.zone_id[k])
+        if open_zones.get(zone_id, 0) > 0:
+            continue
+
+        exit_bar, exit_price, reason = int(exit_bars[k]), float(exit_prices[k]), exit_reasons[k]
+        if direction == 'BULLISH':
+            pnl = (exit_price - entry) * size
+        else:
+            pnl = (entry - exit_price) * size
+
+        tf = str(tape.tf[k])
+        trade = ClosedTrade(
+            ticket=ticket,
+            symbol=tape.symbol,
+            direction=direction,
+            entry_price=entry,
+            exit_price=exit_price,
+            size=size,
+            pnl=pnl,
+            open_time=pd.Timestamp(times[bar]),
+            close_time=pd.Timestamp(times[min(exit_bar, tape.n_bars - 1)]),
+            reason=reason,
+            entry_reason=f"{tf}#{zone_label(zone_id)} {tape.reason[k]}",
+            origin_id=int(tape.origin_id[k]),
+            tf=tf,
+        )
+        excursions.annotate(trade, bar, exit_bar)
+        heapq.heappush(pending, (exit_bar, ticket, trade, zone_id))
+        open_zones[zone_id] = open_zones.get(zone_id, 0) + 1
+        if with_equity:
+            opened.append((bar, exit_bar, 1.0 if direction == 'BULLISH' else -1.0, entry, size))
+        ticket += 1
+
+    settle(tape.n_bars + 1)
+
+    equity = _mark_to_market(tape, initial_balance, ledger, opened) if with_equity else None
+    return ReplayResult(trades=ledger, final_balance=balance, equity=equity)
+
+
+def _mark_to_market(tape: SignalTape, initial_balance: float, ledger: List[ClosedTrade], opened: List[tuple]) -> np.ndarray:
+    """Vectorized per-bar equity: realized balance plus floating PnL of open positions."""
+    n = tape.n_bars
+    realized = np.zeros(n + 1)
+    close_idx = np.searchsorted(tape.times, np.array([t.close_time for t in ledger], dtype='datetime64[ns]'))
+    forced = np.array([t.reason.startswith("Forced") for t in ledger], dtype=bool)
+    # Forced closes happen after the last mark; they never enter the curve
+    np.add.at(realized, close_idx[~forced], np.array([t.pnl for t in ledger])[~forced])
+    equity = initial_balance + np.cumsum(realized[:n])
+
+    for open_bar, exit_bar, sign, entry, size in opened:
+        end = min(exit_bar, n)
+        equity[open_bar:end] += sign * (tape.close[open_bar:end] - entry) * size
+    return equity
+
+
+def summarize_replay(tape: SignalTape, result: ReplayResult, initial_balance: float = 10000.0) -> Dict[str, float]:
+    """Compact metrics row (CAGR, max DD, Sharpe, trades) for sweep tables."""
+    pnl = np.array([t.pnl for t in result.trades])
+    row = {
+        'trades': len(pnl),
+        'final_balance': result.final_balance,
+        'net_profit': result.final_balance - initial_balance,
+        'win_rate': float(np.mean(pnl > 0)) if len(pnl) else 0.0,
+        'cagr': 0.0,
+        'max_dd_pct': 0.0,
+        'sharpe': 0.0,
+    }
+    if result.equity is None or len(result.equity) < 2:
+        return row
+
+    equity = result.equity
+    peak = np.maximum.accumulate(equity)
+    row['max_dd_pct'] = float(np.min((equity - peak) / peak) * 100.0)
+
+    years = (tape.times[-1] - tape.times[0]) / np.timedelta64(1, 'D') / 365.25
+    if years > 0 and equity[-1] > 0:
+        row['cagr'] = float(((equity[-1] / initial_balance) ** (1 / years) - 1) * 100.0)
+
+    # Daily returns from the last mark of each calendar day
+    days = tape.times.astype('datetime64[D]')
+    last_of_day = np.r_[days[1:] != days[:-1], True]
+    daily = equity[last_of_day]
+    rets = np.diff(daily) / daily[:-1]
+    if len(rets) > 1 and np.std(rets, ddof=1) > 1e-12:
+        row['sharpe'] = float(np.mean(rets) / np.std(rets, ddof=1) * np.sqrt(365))
+    return row
+
+
+# =========================================================================
+# RISK-PARAMETER SWEEPS
+# =========================================================================
+
+_SYMBOL_KEYS = {f.name for f in fields(SymbolParams)}
+_RISK_KEYS = {f.name for f in fields(RiskConfig)}
+# Every grid key a replay understands (execution-only parameters)
+REPLAY_KEYS = _SYMBOL_KEYS | _RISK_KEYS | {'max_concurrent', 'initial_balance'}
+_worker_tape: Optional[SignalTape] = None
+
+
+def replay_settings(tape: SignalTape, point: dict, initial_balance: float = 10000.0,
+                    max_concurrent: int = MAX_CONCURRENT_TRADES) -> tuple:
+    """
+    (SymbolParams, RiskConfig, max_concurrent, initial_balance) of a grid point.
+    `initial_balance` / `max_concurrent` apply when the point does not set them.
+    """
+    base = RiskCalculator(RiskConfig()).symbols.get(tape.symbol, SymbolParams(sl_buffer=0.0))
+    sym = {f.name: getattr(base, f.name) for f in fields(SymbolParams)}
+    sym.update({k: v for k, v in point.items() if k in _SYMBOL_KEYS})
+    risk = {'base_risk_pct': 0.01}
+    risk.update({k: v for k, v in point.items() if k in _RISK_KEYS})
+    unknown = set(point) - REPLAY_KEYS
+    if unknown:
+        raise ValueError(f"Unknown replay parameters: {sorted(unknown)}")
+    return (
+        SymbolParams(**sym), RiskConfig(**risk),
+        point.get('max_concurrent', max_concurrent),
+        point.get('initial_balance', initial_balance),
+    )
+
+
+def replay_point(tape: SignalTape, point: dict, initial_balance: float = 10000.0,
+                 max_concurrent: int = MAX_CONCURRENT_TRADES) -> dict:
+    """Replays one grid point (risk fields only) and returns its metrics row."""
+    sym, risk, cap, balance = replay_settings(tape, point, initial_balance, max_concurrent)
+    result = replay_execution(tape, sym, risk, initial_balance=balance, max_concurrent=cap)
+    return {**point, **summarize_replay(tape, result, balance)}
+
+
+def _init_worker(tape_path: str):
+    global _worker_tape
+    _worker_tape = SignalTape.load(tape_path)
+
+
+def _worker_replay(point: dict) -> dict:
+    return replay_point(_worker_tape, point)
+
+
+def replay_sweep(tape: SignalTape, grid: List[dict], processes: Optional[int] = None,
+                 tape_path: Optional[str] = None) -> pd.DataFrame:
+    """
+    Replays every grid point (dicts of SymbolParams / RiskConfig fields plus
+    'max_concurrent' and 'initial_balance') and returns one metrics row each.
+    With processes > 1 the tape is loaded once per worker from `tape_path`.
+    """
+    if processes == 1 or len(grid) < 2:
+        return pd.DataFrame([replay_point(tape, p) for p in grid])
+
+    if tape_path is None:
+        raise ValueError("tape_path is required for multiprocess sweeps")
+    if not os.path.exists(tape_path):
+        tape.save(tape_path)
+
+    workers = processes or os.cpu_count() or 1
+    chunk = max(1, len(grid) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tape_path,)) as pool:
+        rows = list(pool.map(_worker_replay, grid, chunksize=chunk))
+    return pd.DataFrame(rows)
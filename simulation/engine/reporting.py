@@ -1,12 +1,19 @@
 import pandas as pd
 import numpy as np
-import quantstats as qs
 import os
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
-# Patching QuantStats to avoid display issues in some environments
-qs.extend_pandas()
+# quantstats and plotly are heavy (and optional for detection/simulation
+# jobs): they are imported by the functions that use them.
+_qs = None
+
+def _quantstats():
+    global _qs
+    if _qs is None:
+        import quantstats as qs
+        # Patching QuantStats to avoid display issues in some environments
+        qs.extend_pandas()
+        _qs = qs
+    return _qs
 
 def calculate_fractal_metrics(ledger: list) -> pd.DataFrame:
     """
@@ -67,6 +74,8 @@ def plot_trade_overlay(price_data: pd.DataFrame, ledger: list, output_path: str)
     Generates a professional Interactive HTML chart with Trade Markers.
     Style: Small Markers (5px), Dotted Lines for Trade Path.
     """
+    import plotly.graph_objects as go
+
     print(f"Generating Visual Verification Chart: {output_path}")
     
     if price_data.empty: return
@@ -180,7 +189,7 @@ def generate_tearsheet(equity_path: str, output_path: str):
     
     # 4. Generate Report
     try:
-        qs.reports.html(returns, output=output_path, title="SIGMA B2B Strategy (2020-2022)")
+        _quantstats().reports.html(returns, output=output_path, title="SIGMA B2B Strategy (2020-2022)")
         print(f"QuantStats Report saved to {output_path}")
     except Exception as e:
         print(f"QuantStats Error: {e}")
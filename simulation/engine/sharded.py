@@ -0,0 +1,205 @@
+"""
+SIGMA Sharded Backtest
+Splits one long single-symbol run into K time shards simulated in parallel.
+
+FlowState latches and zone flags carry memory, so a shard cannot simply
+start cold at its boundary. Each shard (except the first) gets its zone
+book's touches and invalidations up to its first bar in one vectorized
+pass (replay_zone_statuses), starts `warmup_bars` driver bars early so the
+flow state can settle, and records a structural fingerprint
+(SymbolLane.fingerprint) on every bar of that overlap; the previous shard
+records the same bars at its tail. Once both agree on a bar, the two runs
+are in the same state and emit the same signals from then on, so the
+shard's signals are valid from its boundary onward.
+
+A shard that never converges inside the overlap is re-run serially,
+warm-started from the previous shard's final checkpoint (exact state).
+
+Shards record signal tapes; the stitched tape is replayed once for
+execution (simulation.engine.replay), which reproduces the serial ledger
+and equity curve.
+"""
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.detectors.zone_status import replay_zone_statuses
+from core.models.structures import B2BZoneInfo
+from core.system.price_index import PriceRangeIndex
+from data.arena import MarketDataArena, attach_frames
+from simulation.engine.replay import ReplayResult, replay_execution
+from simulation.engine.signal_tape import SignalTape
+from simulation.engine.vectorized_backtester import VectorizedBacktester, BacktestConfig
+
+
+@dataclass
+class ShardedRun:
+    tape: SignalTape      # Stitched signal tape over the whole window
+    result: ReplayResult  # Execution replayed on the stitched tape
+    shards: pd.DataFrame  # Per shard: bounds, convergence bar, serial re-run flag
+
+
+@dataclass
+class _ShardJob:
+    shard: int
+    first: int   # First simulated bar (boundary minus warmup)
+    start: int   # Shard boundary: signals are kept from here
+    end: int     # Exclusive
+    fingerprint_at: List[pd.Timestamp]
+    checkpoint_path: str
+
+
+_worker_data: Optional[Dict[str, pd.DataFrame]] = None
+_worker_handles: list = []
+
+
+def _init_worker(blocks: dict):
+    global _worker_data, _worker_handles
+    _worker_data, _worker_handles = attach_frames(blocks)
+
+
+def _run_shard(data: Dict[str, pd.DataFrame], zones: Dict[str, List[B2BZoneInfo]], config: BacktestConfig,
+               times: pd.DatetimeIndex, job: _ShardJob, warm_start_path: Optional[str] = None) -> dict:
+    cfg = replace(
+        config, start_date=str(times[job.first]), end_date=str(times[job.end - 1]),
+        checkpoint_path=job.checkpoint_path, checkpoint_every=0, resume=False,
+        warm_start_path=warm_start_path, ledger_path=None,
+    )
+    if job.first > 0 and warm_start_path is None:
+        _prewarm_zones(data[config.timeframes[-1]][config.start_date:config.end_date], zones, job.first)
+
+    bt = VectorizedBacktester(cfg)
+    bt.data = data
+    bt.zones = zones
+    bt.init_modules()
+    bt.orchestrator.heartbeat = False
+    bt.fingerprint_at = set(job.fingerprint_at)
+    bt.run_simulation(record_tape=True)
+    tape = bt.signal_tape
+    keep = tape.bar + job.first >= job.start
+    return {
+        'shard': job.shard,
+        'bars': tape.bar[keep] + job.first,
+        'signals': {name: getattr(tape, name)[keep] for name in _SIGNAL_FIELDS},
+        'fingerprints': bt.fingerprints,
+    }
+
+
+def _worker_shard(zones: dict, config: BacktestConfig, times: pd.DatetimeIndex, job: _ShardJob) -> dict:
+    return _run_shard(_worker_data, zones, config, times, job)
+
+
+_SIGNAL_FIELDS = ('zone_id', 'tf', 'direction', 'entry_price', 'structure_sl', 'tp_price', 'reason', 'origin_id')
+
+
+def plan_shards(n_bars: int, shards: int, warmup_bars: int) -> List[Tuple[int, int, int]]:
+    """(first, start, end) driver bar ranges; shard 0 has no warmup."""
+    bounds = np.linspace(0, n_bars, shards + 1).astype(int)
+    return [(max(0, int(lo) - warmup_bars) if k else 0, int(lo), int(hi))
+            for k, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])) if hi > lo]
+
+
+def _converged_at(prev: Dict[pd.Timestamp, str], cur: Dict[pd.Timestamp, str]) -> Optional[pd.Timestamp]:
+    for t in sorted(set(prev) & set(cur)):
+        if prev[t] == cur[t]:
+            return t
+    return None
+
+
+def run_sharded(
+    backtester: VectorizedBacktester,
+    shards: int,
+    warmup_bars: int = 2000,
+    processes: Optional[int] = None,
+    work_dir: Optional[str] = None,
+) -> ShardedRun:
+    """
+    Sharded equivalent of backtester.run_simulation() + replay.
+    `backtester` must have data loaded and zones detected; its config sets
+    the window (start_date/end_date) and strategy settings.
+    """
+    cfg = backtester.cfg
+    data = backtester.data
+    zones = backtester.zones
+    driver = data[cfg.timeframes[-1]]
+    sim_data = driver[cfg.start_date:cfg.end_date]
+    times = sim_data.index
+    if len(times) == 0:
+        raise ValueError("Empty simulation window")
+
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="sigma_shards_")
+    os.makedirs(work_dir, exist_ok=True)
+
+    plan = plan_shards(len(times), shards, warmup_bars)
+    jobs = []
+    for k, (first, start, end) in enumerate(plan):
+        head = list(times[first:start])
+        tail = list(times[max(plan[k + 1][0], start):end]) if k + 1 < len(plan) else []
+        jobs.append(_ShardJob(k, first, start, end, head + tail, os.path.join(work_dir, f"shard_{k}.ckpt")))
+
+    print(f"Sharded run: {len(jobs)} shards over {len(times)} bars (warmup {warmup_bars})")
+    if processes == 1 or len(jobs) == 1:
+        outputs = [_run_shard(data, _pristine(zones), cfg, times, job) for job in jobs]
+    else:
+        workers = min(processes or os.cpu_count() or 1, len(jobs))
+        with MarketDataArena() as arena:
+            arena.add_frames(cfg.symbol, data)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(arena.descriptor(cfg.symbol),)) as pool:
+                outputs = list(pool.map(_worker_shard, [zones] * len(jobs), [cfg] * len(jobs),
+                                        [times] * len(jobs), jobs))
+
+    # Stitch in order; re-run shards that did not converge from the exact previous state
+    rows = []
+    for k, job in enumerate(jobs):
+        converged, rerun = (times[0] if k == 0 else None), False
+        if k > 0:
+            converged = _converged_at(outputs[k - 1]['fingerprints'], outputs[k]['fingerprints'])
+            if converged is None:
+                print(f"Shard {k} did not converge in {job.start - job.first} warmup bars: re-running serially")
+                exact = replace(job, first=job.start, checkpoint_path=os.path.join(work_dir, f"shard_{k}_serial.ckpt"))
+                outputs[k] = _run_shard(data, _pristine(zones), cfg, times, exact, warm_start_path=jobs[k - 1].checkpoint_path)
+                jobs[k] = exact
+                rerun = True
+        rows.append({
+            'shard': k, 'start': times[job.start], 'end': times[job.end - 1],
+            'warmup_bars': job.start - job.first, 'converged_at': converged, 'rerun': rerun,
+        })
+
+    bars = np.concatenate([out['bars'] for out in outputs])
+    signals = {name: np.concatenate([out['signals'][name] for out in outputs]) for name in _SIGNAL_FIELDS}
+    tape = SignalTape(
+        symbol=cfg.symbol,
+        times=times.values.astype('datetime64[ns]'),
+        high=sim_data['high'].to_numpy(dtype=np.float64),
+        low=sim_data['low'].to_numpy(dtype=np.float64),
+        close=sim_data['close'].to_numpy(dtype=np.float64),
+        bar=bars.astype(np.int64),
+        **signals,
+    )
+    if own_dir:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = replay_execution(tape, initial_balance=cfg.initial_balance, max_concurrent=cfg.max_open_positions)
+    return ShardedRun(tape=tape, result=result, shards=pd.DataFrame(rows))
+
+
+def _prewarm_zones(sim_data: pd.DataFrame, zones: Dict[str, List[B2BZoneInfo]], stop: int):
+    """Brings the zone book to its state before bar `stop` of the full window (no bar loop)."""
+    wicks = PriceRangeIndex(sim_data['high'].to_numpy(), sim_data['low'].to_numpy())
+    close = sim_data['close'].to_numpy()
+    closes = PriceRangeIndex(close, close)
+    for tf_zones in zones.values():
+        replay_zone_statuses(tf_zones, sim_data.index, wicks, closes, stop)
+
+
+def _pristine(zones: Dict[str, List[B2BZoneInfo]]) -> Dict[str, List[B2BZoneInfo]]:
+    """Fresh copies of the detected zones (a serial re-run restores their state from a checkpoint)."""
+    return {tf: [replace(z) for z in zs] for tf, zs in zones.items()}
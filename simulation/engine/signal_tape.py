@@ -0,0 +1,126 @@
+"""
+SIGMA Signal Tape
+Stage one of the two-stage backtest: records every TradeSignal with its
+driver bar index so execution can be replayed without re-running detection,
+orchestration and scanning.
+
+The signal stream does not depend on execution outcomes (the origin blacklist
+is never consulted, the temporal muter is vaulted, and the scanner marks zones
+as traded whether or not the order is filled), so one tape per
+detection/strategy configuration serves any number of risk settings.
+"""
+import os
+from dataclasses import dataclass, fields
+from functools import cached_property
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from core.strategy.scanner import TradeSignal
+from simulation.engine.exit_engine import ExitEngine
+
+
+@dataclass
+class SignalTape:
+    symbol: str
+    # Driver bars of the simulation window
+    times: np.ndarray          # datetime64[ns]
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    # One row per signal, in emission order
+    bar: np.ndarray            # int64 driver bar index
+    zone_id: np.ndarray        # int64 zone keys
+    tf: np.ndarray
+    direction: np.ndarray      # 'BULLISH' / 'BEARISH'
+    entry_price: np.ndarray
+    structure_sl: np.ndarray
+    tp_price: np.ndarray
+    reason: np.ndarray
+    origin_id: np.ndarray      # int64 zone keys (0 = none)
+
+    def __len__(self) -> int:
+        return len(self.bar)
+
+    @property
+    def n_bars(self) -> int:
+        return len(self.times)
+
+    @cached_property
+    def exit_engine(self) -> ExitEngine:
+        return ExitEngine(self.high, self.low, self.close)
+
+    def window(self, start, end) -> "SignalTape":
+        """
+        Sub-tape of the driver bars in [start, end): the bar range and the
+        signals emitted on it, re-indexed to the window's first bar.
+        """
+        lo, hi = np.searchsorted(self.times, np.array([start, end], dtype='datetime64[ns]'))
+        keep = (self.bar >= lo) & (self.bar < hi)
+        signals = {f.name: getattr(self, f.name)[keep] for f in fields(self)
+                   if f.name not in ('symbol', 'times', 'high', 'low', 'close', 'bar')}
+        return SignalTape(
+            symbol=self.symbol,
+            times=self.times[lo:hi], high=self.high[lo:hi], low=self.low[lo:hi], close=self.close[lo:hi],
+            bar=self.bar[keep] - lo,
+            **signals,
+        )
+
+    def save(self, path: str):
+        """Writes the tape as a pickle-free .npz archive."""
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        arrays = {f.name: np.asarray(getattr(self, f.name)) for f in fields(self)}
+        arrays['symbol'] = np.array(self.symbol)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SignalTape":
+        with np.load(path, allow_pickle=False) as z:
+            kwargs = {f.name: z[f.name] for f in fields(cls)}
+        kwargs['symbol'] = str(kwargs['symbol'])
+        return cls(**kwargs)
+
+
+class SignalTapeRecorder:
+    """Collects signals bar by bar during run_simulation."""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._bars: List[int] = []
+        self._signals: List[TradeSignal] = []
+
+    def record(self, bar: int, signals: List[TradeSignal]):
+        for sig in signals:
+            self._bars.append(bar)
+            self._signals.append(sig)
+
+    def snapshot(self) -> tuple:
+        return list(self._bars), list(self._signals)
+
+    def restore(self, snapshot: tuple):
+        bars, signals = snapshot
+        self._bars, self._signals = list(bars), list(signals)
+
+    def finish(self, sim_data: pd.DataFrame) -> SignalTape:
+        sigs = self._signals
+        return SignalTape(
+            symbol=self.symbol,
+            times=sim_data.index.values.astype('datetime64[ns]'),
+            high=sim_data['high'].to_numpy(dtype=np.float64),
+            low=sim_data['low'].to_numpy(dtype=np.float64),
+            close=sim_data['close'].to_numpy(dtype=np.float64),
+            bar=np.array(self._bars, dtype=np.int64),
+            zone_id=np.array([s.zone_id for s in sigs], dtype=np.int64),
+            tf=np.array([s.tf for s in sigs], dtype=str),
+            direction=np.array([s.direction.name for s in sigs], dtype=str),
+            entry_price=np.array([s.entry_price for s in sigs], dtype=np.float64),
+            structure_sl=np.array([s.structure_sl for s in sigs], dtype=np.float64),
+            tp_price=np.array([s.tp_price for s in sigs], dtype=np.float64),
+            reason=np.array([s.reason for s in sigs], dtype=str),
+            origin_id=np.array([s.origin_id for s in sigs], dtype=np.int64),
+        )
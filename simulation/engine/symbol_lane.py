@@ -0,0 +1,187 @@
+"""
+SIGMA Symbol Lane
+The per-symbol bar pipeline: zone lifecycle -> orchestrator flow -> scanner.
+
+Shared by the single-symbol VectorizedBacktester and the PortfolioBacktester,
+which drives one lane per symbol against a shared TradeManager. A lane holds
+everything that is private to a symbol (zone pointers, active zones, flow
+state, fast-forward index); execution and equity belong to the caller.
+"""
+import hashlib
+from dataclasses import fields
+from enum import Enum
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from core.detectors.zone_status import update_active_zones
+from core.models.structures import B2BZoneInfo
+from core.strategy.orchestrator import StrategyOrchestrator
+from core.strategy.scanner import SignalScanner, TradeSignal
+from core.system.timeframe_mgr import TimeframeState
+from simulation.engine.fast_forward import FastForwardIndex
+
+
+def _canon(value):
+    """Timestamps and enums as plain values (cheap, process-independent repr)."""
+    if isinstance(value, pd.Timestamp):
+        return value.value
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class SymbolLane:
+    def __init__(self, symbol: str, zones: Dict[str, List[B2BZoneInfo]], tf_state: TimeframeState,
+                 orchestrator: StrategyOrchestrator, scanner: SignalScanner, sim_data: pd.DataFrame,
+                 fast_forward: bool = False):
+        self.symbol = symbol
+        self.zones = zones
+        self.tf_state = tf_state
+        self.orchestrator = orchestrator
+        self.scanner = scanner
+        self.sim_data = sim_data
+
+        # Optimization: Stateful Zone Tracking
+        # Pointer to the next potential new zone for each TF
+        self.pointers = {tf: 0 for tf in zones}
+        self.active_zones: Dict[str, List[B2BZoneInfo]] = {tf: [] for tf in zones}
+
+        self.ff = FastForwardIndex(sim_data) if fast_forward else None
+        self._flow_before: Optional[list] = None
+
+    def snapshot(self) -> dict:
+        """
+        Zone pointers, active zone membership (as indices into self.zones) and
+        the mutable state of every zone created so far. Zones past the
+        pointers are still as detected and are not stored.
+        """
+        names = [f.name for f in fields(B2BZoneInfo)]
+        created = {tf: zones[:self.pointers[tf]] for tf, zones in self.zones.items()}
+        position = {tf: {id(z): k for k, z in enumerate(zs)} for tf, zs in created.items()}
+        return {
+            'pointers': dict(self.pointers),
+            'active': {tf: [position[tf][id(z)] for z in zs] for tf, zs in self.active_zones.items()},
+            'zone_fields': names,
+            'zones': {tf: [tuple(getattr(z, n) for n in names) for z in zs] for tf, zs in created.items()},
+        }
+
+    def fingerprint(self) -> str:
+        """
+        Stable digest of everything that decides future signals: flow states
+        (origins, magnets, latches) and the active zones with their touches.
+        Two runs with equal fingerprints at a bar emit the same signals from
+        then on. Left out: zone ages, the execution-only blacklist and
+        governor blocks, and trade flags (a level only fires on its own touch
+        bar, so a flag never matters after that bar).
+        """
+        zones = [
+            (z.zone_id, z.touch_count, _canon(z.L1_touch_time), _canon(z.fifty_touch_time), _canon(z.L2_touch_time))
+            for tf in sorted(self.active_zones) for z in self.active_zones[tf]
+        ]
+        flow = [[_canon(v) for v in state.values()] for state in self.orchestrator.snapshot_flow()]
+        return hashlib.blake2b(repr((flow, zones)).encode(), digest_size=16).hexdigest()
+
+    def restore(self, snapshot: dict):
+        """Applies a snapshot taken on the same detected zone book."""
+        names = snapshot['zone_fields']
+        id_col = names.index('zone_id')
+        for tf, rows in snapshot['zones'].items():
+            zones = self.zones.get(tf, [])
+            if len(rows) > len(zones) or any(zones[k].zone_id != row[id_col] for k, row in enumerate(rows)):
+                raise ValueError(f"Snapshot zone book does not match the detected {tf} zones")
+            for z, row in zip(zones, rows):
+                for n, v in zip(names, row):
+                    setattr(z, n, v)
+        self.pointers = dict(snapshot['pointers'])
+        self.active_zones = {tf: [self.zones[tf][k] for k in idx] for tf, idx in snapshot['active'].items()}
+        self._flow_before = None
+
+    def scan_bar(self, current_time: pd.Timestamp, low: float, high: float, close: float,
+                 positions: list) -> List[TradeSignal]:
+        """Advances zones and flow state to this bar and returns its signals."""
+        # 1. Update Timeframe State
+        self.tf_state.sync_to(current_time)
+
+        # 2. Update Active Zones (Strict Serial)
+        self.admit_zones(current_time)
+        # B. Update Status based on CURRENT prices (No Lookahead)
+        all_active = [z for tf_list in self.active_zones.values() for z in tf_list]
+        update_active_zones(low, high, close, current_time, all_active)
+        # C. Prune Invalidated Zones
+        self.prune()
+
+        # Create a flat snapshot for the scanner (which still needs a list)
+        simulation_snapshot = [z for zones in self.active_zones.values() for z in zones]
+        return self.flow_and_scan(current_time, low, high, close, positions, simulation_snapshot)
+
+    def admit_zones(self, current_time: pd.Timestamp) -> Dict[str, List[B2BZoneInfo]]:
+        """
+        A. Add New Zones (Point of Confirmation). Returns the valid zones
+        admitted per timeframe; zones already invalid are skipped (a status
+        update would ignore them and the prune drop them on the same bar).
+        """
+        admitted = {}
+        for tf, zones in self.zones.items():
+            p = self.pointers[tf]
+            while p < len(zones) and zones[p].zone_created_time <= current_time:
+                if zones[p].is_valid:
+                    self.active_zones[tf].append(zones[p])
+                    admitted.setdefault(tf, []).append(zones[p])
+                p += 1
+            self.pointers[tf] = p
+        return admitted
+
+    def prune(self):
+        for tf, zones in self.active_zones.items():
+            self.active_zones[tf] = [z for z in zones if z.is_valid]
+
+    def flow_and_scan(self, current_time: pd.Timestamp, low: float, high: float, close: float,
+                      positions: list, candidates: List[B2BZoneInfo]) -> List[TradeSignal]:
+        """
+        Steps 3-4 on zones already updated to this bar. `candidates` are the
+        zones the scanner checks, in active-list order; only zones touched on
+        this bar can trigger, so the touched ones are enough.
+        """
+        # 3. Feed the Orchestrator (Using pre-grouped dict)
+        # Only a bar that starts flat can end flat with a settled flow state
+        self._flow_before = None
+        if self.ff is not None and not positions:
+            self._flow_before = self.orchestrator.snapshot_flow()
+        self.orchestrator.update_flow_state(self.active_zones, close, current_time)
+
+        # 4. Scan for Signals
+        active_ids = {pos.zone_id for pos in positions}
+        return self.scanner.scan(self.symbol, candidates, low, high, close, current_time, active_ids)
+
+    def report_closed(self, closed_trades: list, current_time: pd.Timestamp):
+        """Efficiency Governor feedback for this symbol's closed trades."""
+        # If a trade loses, we trigger both Spatial and Temporal muting.
+        for trade in closed_trades:
+            if trade.pnl < 0:
+                # 1. Spatial Muting (Pillar 0: Redundancy Filter)
+                self.orchestrator.blacklist_origin(trade.origin_id, trade.tf)
+                # 2. Temporal Muting (Pillar 2: Temporal Muter)
+                self.orchestrator.report_trade_failure(trade.tf, trade.direction, current_time)
+
+    def is_settled(self, flat: bool) -> bool:
+        """True if the last bar ended flat with the flow state at a fixed point."""
+        return self._flow_before is not None and flat and self.orchestrator.snapshot_flow() == self._flow_before
+
+    def skip_from(self, i: int) -> int:
+        """
+        Jumps from bar i to the next event bar, applying the only lane state
+        changes the skipped bars would have made (zone ages, timeframe clock).
+        Returns the bar to resume at; flat equity marks are the caller's.
+        """
+        pending = [self.zones[tf][p].zone_created_time for tf, p in self.pointers.items() if p < len(self.zones[tf])]
+        all_active = [z for zones in self.active_zones.values() for z in zones]
+        k = self.ff.next_event_bar(i, all_active, min(pending) if pending else None)
+        skipped = k - i - 1
+        if skipped <= 0:
+            return i + 1
+
+        for z in all_active:
+            z.zone_age_bars += skipped
+        self.tf_state.sync_to(self.sim_data.index[k - 1])
+        return k
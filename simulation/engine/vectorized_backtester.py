@@ -12,9 +12,18 @@ from core.detectors.b2b_engine import detect_b2b_zones
 from core.detectors.zone_status import update_active_zones
 from core.system.timeframe_mgr import TimeframeState
 from core.strategy.orchestrator import StrategyOrchestrator
+from core.strategy.engines.efficiency_governor import EfficiencyGovernor
 from core.strategy.scanner import SignalScanner, TradeSignal
 from core.execution.trade_manager import TradeManager, Position
-from core.risk.sizing import RiskCalculator, RiskConfig
+from core.execution.excursions import ExcursionTracker
+from core.risk.sizing import RiskCalculator, RiskConfig, MAX_CONCURRENT_TRADES
+from data.schema import compact_frame
+from data.store import OHLCVStore
+from simulation.engine.checkpoint import read_checkpoint, write_checkpoint
+from simulation.engine.ledger_sink import LedgerSink, read_ledger
+from simulation.engine.signal_tape import SignalTape, SignalTapeRecorder
+from simulation.engine.symbol_lane import SymbolLane
+from simulation.engine.zone_dataset import write_zones
 
 @dataclass
 class BacktestConfig:
@@ -22,8 +31,21 @@ class BacktestConfig:
     timeframes: List[str] = ("MN1", "W1", "D1", "H4", "H1", "M30")
     start_date: str = "2020-01-01"
     end_date: str = "2020-12-31" # Smoke Test: 1 Year (2020)
-    initial_balance: float = 100000.0
-    max_open_positions: int = 100 # V6.0 Risk Governor (Default: High Cap)
+    initial_balance: float = 10000.0
+    max_open_positions: int = MAX_CONCURRENT_TRADES # V6.0 Risk Governor (concurrent open positions)
+    ledger_path: Optional[str] = None # Stream closed trades to disk (bounded memory)
+    ledger_format: str = "parquet"    # 'parquet' (part files) or 'ipc' (Arrow stream)
+    ledger_batch_size: int = 4096
+    detection: Optional[DetectionConfig] = None # None = DetectionConfig() defaults
+    gasket_multiple: float = 3.0 # Structural Gasket limit (x zone depth)
+    fast_forward: bool = False # Jump over flat bars with no reachable zone event (identical ledger)
+    checkpoint_path: Optional[str] = None # Latest simulation snapshot (also written at the end of the run)
+    checkpoint_every: int = 0             # Driver bars between snapshots (0 = final snapshot only)
+    resume: bool = False                  # Continue from checkpoint_path if it exists
+    warm_start_path: Optional[str] = None # Seed zone/flow state from another run's snapshot (fresh account)
+    store_path: Optional[str] = "data/store" # Partitioned OHLCVStore root (falls back to data/processed, data/raw files)
+    history_start: Optional[str] = None      # Load [history_start, end_date] only (None = full history)
+    price_dtype: str = "float64"             # 'float32' halves price/volume memory (research runs)
 
 class VectorizedBacktester:
     """
@@ -40,16 +62,46 @@ class VectorizedBacktester:
         self.tf_state: Optional[TimeframeState] = None
         self.orchestrator: Optional[StrategyOrchestrator] = None
         self.scanner: Optional[SignalScanner] = None
+        self.signal_tape: Optional[SignalTape] = None
+        self.bars_skipped = 0
+        # Structural fingerprints after each processed bar in `fingerprint_at` (sharded runs)
+        self.fingerprint_at: Optional[set] = None
+        self.fingerprints: Dict[pd.Timestamp, str] = {}
         
         # Execution & Risk (Can be init immediately)
-        self.risk_calc = RiskCalculator(RiskConfig(base_risk_pct=0.01))
-        self.trade_manager = TradeManager(self.risk_calc)
+        self.risk_calc = RiskCalculator(RiskConfig(base_risk_pct=0.01), max_concurrent=config.max_open_positions)
+        self.ledger_sink = None
+        if config.ledger_path:
+            # A fresh run starts an empty ledger; a resumed one rewinds to its checkpoint
+            self.ledger_sink = LedgerSink(config.ledger_path, config.ledger_batch_size, config.ledger_format,
+                                          resume=self._resuming)
+        self.trade_manager = TradeManager(self.risk_calc, ledger_sink=self.ledger_sink,
+                                          initial_balance=config.initial_balance)
         
         self.logger = logging.getLogger("Backtester")
         
+    @property
+    def _resuming(self) -> bool:
+        return bool(self.cfg.resume and self.cfg.checkpoint_path and os.path.exists(self.cfg.checkpoint_path))
+
     def load_data(self):
-        """Loads parquet files for all timeframes."""
+        """
+        Loads every timeframe, from the partitioned OHLCVStore when it holds
+        the symbol (range reads touch only the row groups in the load window),
+        else from the single parquet files. Frames are normalized to the
+        compact schema (data.schema): datetime64[ns] index, numeric columns
+        as cfg.price_dtype.
+        """
+        store = OHLCVStore(self.cfg.store_path) if self.cfg.store_path else None
+        start = self.cfg.history_start
+        end = self.cfg.end_date if start is not None else None
         for tf in self.cfg.timeframes:
+            if store is not None and store.has(self.cfg.symbol, tf):
+                df = compact_frame(store.read(self.cfg.symbol, tf, start, end), self.cfg.price_dtype)
+                self.data[tf] = df
+                print(f"Loaded {tf}: {len(df)} bars (store)")
+                continue
+
             # Assuming standard naming convention
             path = f"data/processed/{self.cfg.symbol}_{tf}.parquet" 
             # Fallback to raw if processed not found
@@ -66,8 +118,11 @@ class VectorizedBacktester:
                 if 'time' in df.columns:
                     df['time'] = pd.to_datetime(df['time'])
                     df.set_index('time', inplace=True)
+                if start is not None:
+                    df = df[start:end]
                 
                 # Store FULL data for structural detection context
+                df = compact_frame(df, self.cfg.price_dtype)
                 self.data[tf] = df
                 print(f"Loaded {tf}: {len(df)} bars")
             except Exception as e:
@@ -81,12 +136,15 @@ class VectorizedBacktester:
 
         print("Initializing Logic Modules...")
         self.tf_state = TimeframeState(self.data)
-        self.orchestrator = StrategyOrchestrator(self.tf_state)
+        self.orchestrator = StrategyOrchestrator(
+            self.tf_state, symbol=self.cfg.symbol,
+            governor=EfficiencyGovernor(gasket_multiple=self.cfg.gasket_multiple),
+        )
         self.scanner = SignalScanner(self.orchestrator)
         
     def run_detection_pipeline(self):
         """Pre-calculates all structures (Swings, BO, Zones) for efficiency."""
-        det_cfg = DetectionConfig() # Default config
+        det_cfg = self.cfg.detection or DetectionConfig() # Default config
         
         print("\n--- Running Detection Pipeline ---")
         for tf, df in self.data.items():
@@ -101,11 +159,17 @@ class VectorizedBacktester:
             self.zones[tf] = zones
             print(f"[{tf}] Detected {len(zones)} zones")
             
-    def run_simulation(self):
+    def run_simulation(self, record_tape: bool = False):
         """
         The Main Event Loop.
         Iterates over the lowest timeframe (e.g. M30) as the heartbeat.
         OPTIMIZED: Uses stateful zone tracking (pointers).
+        record_tape: Also capture every signal with its bar index (self.signal_tape).
+        With cfg.fast_forward, flat bars on which no zone event is reachable
+        are skipped (see simulation.engine.fast_forward).
+        With cfg.checkpoint_path, the full state is snapshotted every
+        cfg.checkpoint_every bars and at the end; cfg.resume continues from
+        that snapshot, cfg.warm_start_path seeds structure from another run.
         """
         if not self.tf_state or not self.orchestrator or not self.scanner:
             self.init_modules()
@@ -119,66 +183,45 @@ class VectorizedBacktester:
             print("Driver Data missing!")
             return
             
-        # Optimization: Stateful Zone Tracking
-        # Pointer to the next potential new zone for each TF
-        pointers = {tf: 0 for tf in self.zones}
-        active_zones = {tf: [] for tf in self.zones}
-        
         # Slice only the time period specified for the simulation
         sim_data = driver_data[self.cfg.start_date:self.cfg.end_date]
         total_bars = len(sim_data)
+        lane = SymbolLane(self.cfg.symbol, self.zones, self.tf_state, self.orchestrator, self.scanner,
+                          sim_data, fast_forward=self.cfg.fast_forward)
+        tape = SignalTapeRecorder(self.cfg.symbol) if record_tape else None
+        self.trade_manager.excursions = ExcursionTracker.from_frame(sim_data)
+        self.bars_skipped = 0
+
+        start = 0
+        if self._resuming:
+            start = self._restore_state(read_checkpoint(self.cfg.checkpoint_path), lane, tape, sim_data, execution=True)
+            print(f"Resumed from checkpoint at bar {start}/{total_bars}")
+        elif self.cfg.warm_start_path:
+            start = self._restore_state(read_checkpoint(self.cfg.warm_start_path), lane, None, sim_data, execution=False)
+            print(f"Warm-started from {self.cfg.warm_start_path}")
+        skip_to = start
+        last_checkpoint = start
         
         # Optimization: use itertuples for 10x speed over iterrows
-        for i, row in enumerate(sim_data.itertuples()):
+        for i, row in enumerate(sim_data.iloc[start:].itertuples(), start=start):
             current_time = row.Index
+            current_price = row.close
+            if i < skip_to:
+                continue
+
+            if self.cfg.checkpoint_path and self.cfg.checkpoint_every > 0 and i - last_checkpoint >= self.cfg.checkpoint_every:
+                write_checkpoint(self.cfg.checkpoint_path, self._capture_state(lane, tape, i, sim_data))
+                last_checkpoint = i
+
             if i % 1000 == 0: 
                 print(f"Processing... {i}/{total_bars}")
-                # print(f"Active Zones: {sum(len(z) for z in active_zones.values())}")
-            
-            current_price = row.close
             
-            # 1. Update Timeframe State
-            self.tf_state.sync_to(current_time)
+            # 1-4. Zones -> Orchestrator -> Scanner
+            signals = lane.scan_bar(current_time, row.low, row.high, current_price, self.trade_manager.positions)
             
-            # 2. Update Active Zones (Strict Serial)
-            for tf, zones in self.zones.items():
-                # A. Add New Zones (Point of Confirmation)
-                while pointers[tf] < len(zones):
-                    candidate = zones[pointers[tf]]
-                    if candidate.zone_created_time <= current_time:
-                        active_zones[tf].append(candidate)
-                        pointers[tf] += 1
-                    else:
-                        break 
-                
-            # B. Update Status based on CURRENT prices (No Lookahead)
-            all_active = [z for tf_list in active_zones.values() for z in tf_list]
-            update_active_zones(row.low, row.high, row.close, current_time, all_active)
+            if tape is not None:
+                tape.record(i, signals)
 
-            # C. Prune Invalidated Zones
-            for tf in active_zones:
-                active_zones[tf] = [z for z in active_zones[tf] if z.is_valid]
-                
-            simulation_snapshot = [z for tf_list in active_zones.values() for z in tf_list]
-            
-            # 3. Feed the Orchestrator (Using pre-grouped dict)
-            self.orchestrator.update_flow_state(active_zones, current_price, current_time)
-            
-            # Create a flat snapshot for the scanner (which still needs a list)
-            simulation_snapshot = [z for zones in active_zones.values() for z in zones]
-            
-            # 4. Scan for Signals
-            active_ids = {pos.zone_id for pos in self.trade_manager.positions}
-            signals = self.scanner.scan(
-                self.cfg.symbol, 
-                simulation_snapshot, 
-                row.low, 
-                row.high,
-                current_price, 
-                current_time,
-                active_ids
-            )
-            
             # 5. Execute Signals
             for sig in signals:
                 self.trade_manager.execute(sig)
@@ -192,28 +235,116 @@ class VectorizedBacktester:
             )
             
             # Efficiency Governor Feedback Loop (Phase 12B)
-            # If a trade loses, we trigger both Spatial and Temporal muting.
-            for trade in closed_trades:
-                if trade.pnl < 0:
-                    # 1. Spatial Muting (Pillar 0: Redundancy Filter)
-                    self.orchestrator.blacklist_origin(trade.origin_id, trade.tf)
-                    # 2. Temporal Muting (Pillar 2: Temporal Muter)
-                    self.orchestrator.report_trade_failure(trade.tf, trade.direction, current_time)
+            lane.report_closed(closed_trades, current_time)
+
+            if self.fingerprint_at is not None and current_time in self.fingerprint_at:
+                self.fingerprints[current_time] = lane.fingerprint()
+
+            # 7. Fast-forward: flat book and a settled flow state (fixed point)
+            if lane.is_settled(not self.trade_manager.positions):
+                skip_to = lane.skip_from(i)
+                if skip_to > i + 1:
+                    self.trade_manager.mark_flat(sim_data.index[i + 1:skip_to])
+                    self.bars_skipped += skip_to - i - 1
             
+        if self.cfg.checkpoint_path and total_bars:
+            write_checkpoint(self.cfg.checkpoint_path, self._capture_state(lane, tape, total_bars, sim_data))
+
         print("Simulation Complete. Force-closing remaining positions...")
-        self.trade_manager.force_close_all(current_price, current_time)
+        if total_bars:
+            self.trade_manager.force_close_all(sim_data['close'].iloc[-1], sim_data.index[-1])
+        if self.ledger_sink is not None:
+            self.ledger_sink.close()
+        if tape is not None:
+            self.signal_tape = tape.finish(sim_data)
         print("Simulation Complete.")
+
+    def _capture_state(self, lane: SymbolLane, tape: Optional[SignalTapeRecorder], bar: int,
+                       sim_data: pd.DataFrame) -> dict:
+        """Full simulation state before driver bar `bar` (see simulation.engine.checkpoint)."""
+        return {
+            'symbol': self.cfg.symbol,
+            'bar': bar,
+            'time': sim_data.index[bar - 1], # Last processed driver bar
+            'lane': lane.snapshot(),
+            'tf_state': self.tf_state.snapshot(),
+            'orchestrator': self.orchestrator.snapshot(),
+            'execution': self.trade_manager.snapshot(),
+            'ledger_offset': self.ledger_sink.offset() if self.ledger_sink is not None else None,
+            'bars_skipped': self.bars_skipped,
+            'tape': tape.snapshot() if tape is not None else None,
+        }
+
+    def _restore_state(self, state: dict, lane: SymbolLane, tape: Optional[SignalTapeRecorder],
+                       sim_data: pd.DataFrame, execution: bool) -> int:
+        """
+        Applies a checkpoint and returns the driver bar to continue from.
+        execution=False (warm start) restores only zone, timeframe and flow
+        state; the account starts flat with a fresh balance.
+        """
+        if state['symbol'] != self.cfg.symbol:
+            raise ValueError(f"Checkpoint is for {state['symbol']}, not {self.cfg.symbol}")
+
+        start = int(sim_data.index.searchsorted(state['time'], side='right'))
+        driver = self.data[self.cfg.timeframes[-1]].index
+        following = driver.searchsorted(state['time'], side='right')
+        if start < len(sim_data) and (following >= len(driver) or driver[following] != sim_data.index[start]):
+            raise ValueError(f"Checkpoint ends at {state['time']}, but the simulation continues at {sim_data.index[start]}")
+
+        lane.restore(state['lane'])
+        self.tf_state.restore(state['tf_state'])
+        self.orchestrator.restore(state['orchestrator'])
+        if not execution:
+            return start
+
+        offset = state['ledger_offset']
+        if (offset is None) != (self.ledger_sink is None):
+            raise ValueError("Checkpoint and config disagree on streaming the ledger")
+        if offset is not None:
+            self.ledger_sink.rewind(offset)
+        self.trade_manager.restore(state['execution'])
+        self.bars_skipped = state['bars_skipped']
+        if tape is not None:
+            if state['tape'] is None:
+                raise ValueError("Checkpoint has no signal tape to resume")
+            tape.restore(state['tape'])
+        return start
+
+    def record_signal_tape(self, cache_path: Optional[str] = None) -> SignalTape:
+        """
+        Stage one of the two-stage mode: returns the signal tape for this
+        detection/strategy configuration, loading it from `cache_path` if present.
+        Replay it with simulation.engine.replay for any risk settings.
+        """
+        if cache_path and os.path.exists(cache_path):
+            self.signal_tape = SignalTape.load(cache_path)
+            return self.signal_tape
+        if not self.zones:
+            self.run_detection_pipeline()
+        self.run_simulation(record_tape=True)
+        if cache_path:
+            self.signal_tape.save(cache_path)
+        return self.signal_tape
+
+    def export_zones(self, path: str) -> int:
+        """Writes every zone with its lifecycle so far as a columnar dataset (simulation.engine.zone_dataset)."""
+        return write_zones(path, self.zones, self.cfg.symbol)
+
+    def get_ledger(self) -> pd.DataFrame:
+        """Closed trades as a DataFrame, whether kept in memory or streamed to disk."""
+        if self.ledger_sink is not None:
+            return read_ledger(self.cfg.ledger_path)
+        return pd.DataFrame([vars(t) for t in self.trade_manager.ledger])
         
     def generate_report(self):
         """Outputs the Trade Log and Metrics."""
-        trades = self.trade_manager.ledger
+        df_trades = self.get_ledger()
         history = self.trade_manager.equity_history
         
-        print(f"\nTotal Trades: {len(trades)}")
+        print(f"\nTotal Trades: {len(df_trades)}")
         
         # 1. Save Closed Trades Ledger
-        if trades:
-            df_trades = pd.DataFrame([vars(t) for t in trades])
+        if not df_trades.empty:
             df_trades.to_csv("research/reports/4th_IS_test/trade_log.csv", index=False)
             print("Trade Log saved to research/reports/4th_IS_test/trade_log.csv")
             
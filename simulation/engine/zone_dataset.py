@@ -0,0 +1,116 @@
+"""
+SIGMA Zone Dataset
+Every zone of a run as one columnar table: geometry, confirmation bar,
+T1/T2/T3 touch times, invalidation, parent/confluence info and traded
+flags. Research code loads it instead of rerunning the detectors.
+
+One row per zone, one column per B2BZoneInfo detection/lifecycle field
+(same names), plus `symbol`. The schema is derived from the dataclass like
+the ledger's: times are timestamp[ns] (null while a level is untouched),
+zone ids int64 keys, and the repeated strings (symbol, timeframe,
+direction, parent_tf) dictionary-encoded.
+
+Format follows the extension: '.parquet' (default) or '.arrow' /
+'.feather' (Arrow IPC file, memory-mapped on load). Files are written to
+a temp name and renamed.
+
+Loading goes through pyarrow.dataset, so column selection and filter
+expressions are applied while reading, e.g.
+
+    read_zones(path, ['L1_price', 'L2_touch_time'], filter=pc.field('timeframe') == 'H1')
+"""
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from core.models.structures import B2BZoneInfo, SignalDirection, ZONE_FIELDS
+
+_ARROW_TYPES = {
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+    bool: pa.bool_(),
+    datetime: pa.timestamp('ns'),
+    SignalDirection: pa.string(),
+}
+_DICTIONARY = ('symbol', 'timeframe', 'direction', 'parent_tf')
+_IPC_SUFFIXES = ('.arrow', '.feather', '.ipc')
+
+Zones = Union[Dict[str, List[B2BZoneInfo]], Iterable[B2BZoneInfo]]
+
+
+def zone_schema() -> pa.Schema:
+    """Arrow schema derived from the B2BZoneInfo detection and lifecycle fields."""
+    types = {name: _ARROW_TYPES[t] for name, t in B2BZoneInfo.__annotations__.items() if name in ZONE_FIELDS}
+    columns = [('symbol', pa.string())] + [(name, types[name]) for name in ZONE_FIELDS]
+    return pa.schema([(name, pa.dictionary(pa.int32(), t) if name in _DICTIONARY else t) for name, t in columns])
+
+
+def zone_table(zones: Zones, symbol: str = "") -> pa.Table:
+    """Columnar copy of the zones ({tf: [zones]} or any iterable of zones)."""
+    if isinstance(zones, dict):
+        zones = [z for tf_zones in zones.values() for z in tf_zones]
+    else:
+        zones = list(zones)
+    schema = zone_schema()
+    arrays = []
+    for field in schema:
+        if field.name == 'symbol':
+            values = [symbol] * len(zones)
+        elif field.name == 'direction':
+            values = [z.direction.value for z in zones]
+        else:
+            values = [getattr(z, field.name) for z in zones]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, field.type.value_type).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _format(path: str) -> str:
+    return 'ipc' if path.lower().endswith(_IPC_SUFFIXES) else 'parquet'
+
+
+def write_zones(path: str, zones: Zones, symbol: str = "") -> int:
+    """Writes the zone dataset of one run; returns the number of zones."""
+    table = zone_table(zones, symbol)
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    tmp = path + ".tmp"
+    if _format(path) == 'ipc':
+        with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, tmp)
+    os.replace(tmp, path)
+    return table.num_rows
+
+
+def read_zones(path: str, columns: Optional[List[str]] = None, filter: Optional[ds.Expression] = None) -> pa.Table:
+    """Zone dataset as an Arrow table; `columns` and `filter` are applied while reading."""
+    return ds.dataset(path, format=_format(path)).to_table(columns=columns, filter=filter)
+
+
+def zone_arrays(path: str, columns: Optional[List[str]] = None,
+                filter: Optional[ds.Expression] = None) -> Dict[str, np.ndarray]:
+    """
+    {column: ndarray}: numbers and flags as numeric/bool arrays, times as
+    datetime64[ns] (NaT when unset), strings as object arrays.
+    """
+    table = read_zones(path, columns, filter)
+    out = {}
+    for name, column in zip(table.column_names, table.columns):
+        if pa.types.is_dictionary(column.type):
+            column = column.cast(column.type.value_type)
+        if pa.types.is_timestamp(column.type):
+            out[name] = column.to_numpy().astype('datetime64[ns]')
+        else:
+            out[name] = column.to_numpy()
+    return out
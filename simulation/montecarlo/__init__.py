@@ -0,0 +1,8 @@
+"""
+SIGMA Monte Carlo: chunked, seeded resampling of trade sequences on a
+process pool with vectorized path metrics and streamed equity bands.
+"""
+from simulation.montecarlo.simulator import (
+    MonteCarloConfig, MonteCarloResult, RESAMPLE_MODES, path_metrics, resample_indices, run_monte_carlo,
+)
+from simulation.montecarlo.quantiles import StepHistogram
@@ -0,0 +1,91 @@
+"""
+SIGMA Streaming Quantiles
+Fixed-bin histograms, one per column, for quantile bands over a stream of
+rows (one equity path per row, one column per trade step).
+
+Memory is (columns x bins) whatever the number of rows. Bin edges are fixed
+up front from a pilot sample (its range per column, widened by `margin` on
+both sides); values outside land in the edge bins. Counts are integers, so
+histograms built on separate chunks merge exactly and in any order, which
+lets pool workers each return a histogram instead of their paths.
+Quantiles are read off the cumulative counts with linear interpolation
+inside the bin, i.e. to within one bin width, and clipped to the exact
+per-column min/max (so constant columns come out exact).
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+class StepHistogram:
+    def __init__(self, lo: np.ndarray, hi: np.ndarray, bins: int = 1024):
+        lo, hi = np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64)
+        if lo.shape != hi.shape or lo.ndim != 1:
+            raise ValueError("lo and hi must be 1-d arrays of the same length")
+        # Degenerate columns (e.g. the constant starting equity) still get a positive width
+        floor = 1e-9 * np.maximum(np.abs(lo), 1.0)
+        self.lo = lo
+        self.width = np.maximum(hi - lo, floor) / bins
+        self.bins = bins
+        self.counts = np.zeros((len(lo), bins), dtype=np.int64)
+        self.min = np.full(len(lo), np.inf)
+        self.max = np.full(len(lo), -np.inf)
+
+    @classmethod
+    def from_sample(cls, sample: np.ndarray, bins: int = 1024, margin: float = 0.5) -> "StepHistogram":
+        """Edges covering the sample's range per column, widened by margin x range each side."""
+        sample = np.atleast_2d(sample)
+        lo, hi = sample.min(axis=0), sample.max(axis=0)
+        pad = margin * (hi - lo)
+        return cls(lo - pad, hi + pad, bins)
+
+    @property
+    def columns(self) -> int:
+        return len(self.lo)
+
+    @property
+    def count(self) -> int:
+        return int(self.counts[0].sum()) if self.columns else 0
+
+    def update(self, rows: np.ndarray):
+        """Adds each row of a (rows x columns) array as one observation per column."""
+        rows = np.atleast_2d(rows)
+        if rows.shape[1] != self.columns:
+            raise ValueError(f"Expected {self.columns} columns, got {rows.shape[1]}")
+        cell = np.clip(((rows - self.lo) / self.width).astype(np.int64), 0, self.bins - 1)
+        cell += np.arange(self.columns) * self.bins
+        self.counts += np.bincount(cell.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        np.minimum(self.min, rows.min(axis=0), out=self.min)
+        np.maximum(self.max, rows.max(axis=0), out=self.max)
+
+    def merge(self, other: "StepHistogram"):
+        if other.bins != self.bins or not (np.array_equal(other.lo, self.lo) and np.array_equal(other.width, self.width)):
+            raise ValueError("Histograms have different bin edges")
+        self.counts += other.counts
+        np.minimum(self.min, other.min, out=self.min)
+        np.maximum(self.max, other.max, out=self.max)
+
+    def empty_like(self) -> "StepHistogram":
+        hist = StepHistogram.__new__(StepHistogram)
+        hist.lo, hist.width, hist.bins = self.lo, self.width, self.bins
+        hist.counts = np.zeros_like(self.counts)
+        hist.min = np.full(len(self.lo), np.inf)
+        hist.max = np.full(len(self.lo), -np.inf)
+        return hist
+
+    def quantiles(self, probs: Sequence[float]) -> Dict[float, np.ndarray]:
+        """Estimate per probability, one value per column."""
+        total = self.count
+        if total == 0:
+            raise ValueError("No observations")
+        cum = np.cumsum(self.counts, axis=1)
+        rows = np.arange(self.columns)
+        bands = {}
+        for p in probs:
+            target = p * total
+            k = np.minimum((cum < target).sum(axis=1), self.bins - 1)
+            below = np.where(k > 0, cum[rows, k - 1], 0)
+            inside = np.maximum(self.counts[rows, k], 1)
+            frac = np.clip((target - below) / inside, 0.0, 1.0)
+            bands[float(p)] = np.clip(self.lo + self.width * (k + frac), self.min, self.max)
+        return bands
@@ -0,0 +1,193 @@
+"""
+SIGMA Monte Carlo Simulator
+Resampled trade sequences evaluated as (iterations x trades) matrices.
+
+Iterations are generated in chunks of `chunk_size` rows, so memory stays at
+a few chunk-sized matrices regardless of the iteration count. Every chunk
+draws from its own RNG stream spawned from one SeedSequence, which makes
+the result a function of (seed, chunk_size) only: the same seed gives the
+same numbers serially or on any number of worker processes.
+
+Resampling modes:
+- 'permutation': reshuffle the trade order (the classic sequence-risk test)
+- 'bootstrap':   iid draws with replacement
+- 'block':       stationary block bootstrap (Politis & Romano), geometric
+                 block lengths with mean `mean_block`, wrapping around the
+                 end; keeps runs of clustered wins/losses together
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from simulation.montecarlo.quantiles import StepHistogram
+
+RESAMPLE_MODES = ('permutation', 'bootstrap', 'block')
+
+
+@dataclass
+class MonteCarloConfig:
+    iterations: int = 10000
+    initial_capital: float = 10000.0
+    years: float = 3.0                                  # Span the trade list covers (for CAGR)
+    resample: str = 'permutation'
+    mean_block: float = 5.0                             # Stationary bootstrap mean block length (trades)
+    slippage: Tuple[float, float] = (0.0001, 0.0005)    # Uniform cost per trade, fraction of initial capital
+    drop_prob: float = 0.05                             # Probability a trade is not executed
+    ruin_dd: float = 0.90                               # Drawdown counted as ruin
+    chunk_size: int = 2048
+    seed: int = 0
+    sample_paths: int = 100                             # Equity paths kept for plotting
+    fan_quantiles: Tuple[float, ...] = (0.05, 0.25, 0.5, 0.75, 0.95)  # Equity bands per trade step (empty: off)
+    fan_bins: int = 1024
+
+
+@dataclass
+class MonteCarloResult:
+    cagr: np.ndarray          # Per iteration, fraction (-1.0 when the account is wiped out)
+    max_dd: np.ndarray        # Per iteration, fraction <= 0
+    final_equity: np.ndarray  # Per iteration
+    paths: np.ndarray         # (sample_paths x trades + 1) equity curves, starting at initial capital
+    ruin_dd: float
+    bands: Dict[float, np.ndarray]  # Quantile -> equity per trade step over all iterations (trades + 1)
+
+    @property
+    def ruin_probability(self) -> float:
+        return float(np.mean(self.max_dd <= -self.ruin_dd))
+
+    def summary(self) -> dict:
+        return {
+            'iterations': len(self.cagr),
+            'cagr_mean': float(np.mean(self.cagr) * 100.0),
+            'cagr_p5': float(np.percentile(self.cagr, 5) * 100.0),
+            'max_dd_mean': float(np.mean(self.max_dd) * 100.0),
+            'max_dd_p5': float(np.percentile(self.max_dd, 5) * 100.0),
+            'ruin_pct': self.ruin_probability * 100.0,
+        }
+
+
+def resample_indices(rng: np.random.Generator, n_paths: int, n_trades: int,
+                     mode: str = 'permutation', mean_block: float = 5.0) -> np.ndarray:
+    """(n_paths x n_trades) indices into the trade list."""
+    if mode == 'permutation':
+        return rng.permuted(np.broadcast_to(np.arange(n_trades), (n_paths, n_trades)), axis=1)
+    if mode == 'bootstrap':
+        return rng.integers(0, n_trades, (n_paths, n_trades))
+    if mode == 'block':
+        # A new block starts with probability 1/mean_block; inside a block the index advances by one
+        starts = rng.random((n_paths, n_trades)) < 1.0 / max(mean_block, 1.0)
+        starts[:, 0] = True
+        origin = rng.integers(0, n_trades, (n_paths, n_trades))
+        cols = np.arange(n_trades)
+        block_start = np.maximum.accumulate(np.where(starts, cols, 0), axis=1)
+        rows = np.arange(n_paths)[:, None]
+        return (origin[rows, block_start] + (cols - block_start)) % n_trades
+    raise ValueError(f"Unknown resample mode '{mode}', expected one of {RESAMPLE_MODES}")
+
+
+def path_metrics(pnl: np.ndarray, initial_capital: float, years: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """CAGR, max drawdown and final equity per row of an (iterations x trades) P&L matrix."""
+    return _equity_metrics(_equity(pnl, initial_capital), years)
+
+
+def _equity(pnl: np.ndarray, initial_capital: float) -> np.ndarray:
+    """(rows x trades + 1) equity curves starting at initial capital."""
+    equity = np.empty((pnl.shape[0], pnl.shape[1] + 1))
+    equity[:, 0] = initial_capital
+    np.cumsum(pnl, axis=1, out=equity[:, 1:])
+    equity[:, 1:] += initial_capital
+    return equity
+
+
+def _equity_metrics(equity: np.ndarray, years: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    initial_capital = equity[:, 0]
+    peak = np.maximum.accumulate(equity, axis=1)
+    max_dd = np.min((equity - peak) / peak, axis=1)
+    final = equity[:, -1]
+    cagr = np.full(len(final), -1.0)
+    alive = final > 0
+    cagr[alive] = (final[alive] / initial_capital[alive]) ** (1.0 / years) - 1.0
+    return cagr, max_dd, final
+
+
+def _chunk_equity(pnl: np.ndarray, cfg: MonteCarloConfig, seed: np.random.SeedSequence, n_paths: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n = len(pnl)
+    sims = pnl[resample_indices(rng, n_paths, n, cfg.resample, cfg.mean_block)]
+    lo, hi = cfg.slippage
+    sims -= cfg.initial_capital * rng.uniform(lo, hi, (n_paths, n))
+    sims *= rng.random((n_paths, n)) >= cfg.drop_prob
+    return _equity(sims, cfg.initial_capital)
+
+
+def _summarize_chunk(equity: np.ndarray, cfg: MonteCarloConfig, keep: int, fan: Optional[StepHistogram]) -> tuple:
+    if fan is not None:
+        fan.update(equity)
+    return (*_equity_metrics(equity, cfg.years), equity[:keep].copy(), fan)
+
+
+def _simulate_chunk(pnl: np.ndarray, cfg: MonteCarloConfig, seed: np.random.SeedSequence,
+                    n_paths: int, keep: int, fan: Optional[StepHistogram]) -> tuple:
+    equity = _chunk_equity(pnl, cfg, seed, n_paths)
+    return _summarize_chunk(equity, cfg, keep, fan.empty_like() if fan is not None else None)
+
+
+def _collect(results, fan: Optional[StepHistogram]):
+    """Chunk metrics in order, with each chunk's histogram merged into `fan`."""
+    for *metrics, hist in results:
+        if fan is not None:
+            fan.merge(hist)
+        yield tuple(metrics)
+
+
+def run_monte_carlo(pnl, config: Optional[MonteCarloConfig] = None,
+                    processes: Optional[int] = None) -> MonteCarloResult:
+    """
+    Monte Carlo over a list of per-trade P&L (account currency).
+    Chunks run on a process pool (`processes=None` uses every core, 1 runs
+    in-process); results do not depend on the number of processes.
+
+    With `fan_quantiles` set, every path also feeds a per-step histogram
+    (StepHistogram) whose bin edges come from the first chunk; workers return
+    their chunk's counts, so the bands cover all iterations at a memory cost
+    independent of the iteration count.
+    """
+    cfg = config or MonteCarloConfig()
+    if cfg.resample not in RESAMPLE_MODES:
+        raise ValueError(f"Unknown resample mode '{cfg.resample}', expected one of {RESAMPLE_MODES}")
+    if cfg.years <= 0:
+        raise ValueError("years must be positive")
+    pnl = np.asarray(pnl, dtype=np.float64)
+    if len(pnl) == 0:
+        raise ValueError("No trades to resample")
+
+    sizes = [min(cfg.chunk_size, cfg.iterations - lo) for lo in range(0, cfg.iterations, cfg.chunk_size)]
+    seeds = np.random.SeedSequence(cfg.seed).spawn(len(sizes))
+    keep, kept = [], 0
+    for size in sizes:
+        keep.append(min(size, cfg.sample_paths - kept))
+        kept += keep[-1]
+
+    # The first chunk runs here: it fixes the fan's bin edges
+    pilot = _chunk_equity(pnl, cfg, seeds[0], sizes[0])
+    fan = StepHistogram.from_sample(pilot, cfg.fan_bins) if cfg.fan_quantiles else None
+    outputs = [_summarize_chunk(pilot, cfg, keep[0], fan)[:4]]
+    del pilot
+
+    rest = list(zip(seeds[1:], sizes[1:], keep[1:]))
+    template = fan.empty_like() if fan is not None else None  # Edges only: cheap to ship to workers
+    if processes == 1 or len(rest) <= 1:
+        outputs += _collect((_simulate_chunk(pnl, cfg, seed, size, k, template) for seed, size, k in rest), fan)
+    else:
+        workers = min(processes or os.cpu_count() or 1, len(rest))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_simulate_chunk, pnl, cfg, seed, size, k, template) for seed, size, k in rest]
+            outputs += _collect((futures.pop(0).result() for _ in range(len(futures))), fan)
+
+    cagr, max_dd, final, paths = (np.concatenate(parts) for parts in zip(*outputs))
+    return MonteCarloResult(
+        cagr=cagr, max_dd=max_dd, final_equity=final, paths=paths, ruin_dd=cfg.ruin_dd,
+        bands=fan.quantiles(cfg.fan_quantiles) if fan is not None else {},
+    )
@@ -0,0 +1,7 @@
+"""
+SIGMA parameter sweeps: detection/strategy/execution grids on a process pool
+with shared-memory market data and resumable results.
+"""
+from simulation.sweep.grid import expand_grid, point_id, split_point, group_points
+from simulation.sweep.runner import run_sweep, METRIC_COLUMNS
+from simulation.sweep.walk_forward import walk_forward, make_windows, Window, WalkForwardResult
@@ -0,0 +1,63 @@
+"""
+SIGMA Sweep Grid
+Splits parameter grid points into the three stages that consume them:
+
+1. Detection  - DetectionConfig fields. Zones are detected once per
+                distinct detection config.
+2. Strategy   - BacktestConfig knobs read by the orchestrator
+                ('gasket_multiple'). One signal tape is recorded per
+                distinct (detection, strategy) config.
+3. Execution  - SymbolParams / RiskConfig fields, 'max_concurrent' and
+                'initial_balance'. Replayed from the tape, never simulated.
+"""
+import hashlib
+import itertools
+import json
+from dataclasses import fields
+from typing import Dict, List, Tuple
+
+from core.models.structures import DetectionConfig
+from simulation.engine.replay import REPLAY_KEYS
+
+DETECTION_KEYS = {f.name for f in fields(DetectionConfig)}
+STRATEGY_KEYS = {'gasket_multiple'}
+
+
+def expand_grid(**axes) -> List[dict]:
+    """Cartesian product of named axes: expand_grid(sl_buffer=[100, 200], swing_window=[3, 5])."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+
+
+def point_id(point: dict) -> str:
+    """Stable id of a grid point (order-independent)."""
+    raw = json.dumps(point, sort_keys=True, default=str)
+    return hashlib.md5(raw.encode()).hexdigest()[:12]
+
+
+def split_point(point: dict) -> Tuple[dict, dict, dict]:
+    """Returns (detection, strategy, execution) parameter dicts."""
+    unknown = set(point) - DETECTION_KEYS - STRATEGY_KEYS - REPLAY_KEYS
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    detection = {k: v for k, v in point.items() if k in DETECTION_KEYS}
+    strategy = {k: v for k, v in point.items() if k in STRATEGY_KEYS}
+    execution = {k: v for k, v in point.items() if k in REPLAY_KEYS}
+    return detection, strategy, execution
+
+
+def group_points(grid: List[dict]) -> Dict[str, Dict[str, dict]]:
+    """
+    Groups grid points by detection config, then by strategy config:
+    {detection_key: {strategy_key: {'detection', 'strategy', 'points': [...]}}}
+    """
+    groups: Dict[str, Dict[str, dict]] = {}
+    for point in grid:
+        detection, strategy, _ = split_point(point)
+        det_key = point_id(detection)
+        strat_key = point_id({**detection, **strategy})
+        bucket = groups.setdefault(det_key, {}).setdefault(
+            strat_key, {'detection': detection, 'strategy': strategy, 'points': []}
+        )
+        bucket['points'].append(point)
+    return groups
@@ -0,0 +1,224 @@
+"""
+SIGMA Sweep Runner
+Fans a parameter grid out over a process pool with minimal repeated work:
+
+    detection config  -> zones        (once per distinct DetectionConfig)
+    strategy config   -> signal tape  (once per distinct detection + strategy)
+    execution params  -> replay       (per grid point, from the tape)
+
+Market frames live in shared memory (data.arena.MarketDataArena); workers
+attach once in the pool initializer. Finished groups are appended to a CSV results table
+keyed by point_id and tapes are cached under `work_dir`, so a restarted
+sweep skips completed points and re-uses recorded tapes. Both keys include
+base_id, a hash of the base BacktestConfig the grid is swept over (every
+field but the ledger/checkpoint/store paths), so a table or tape directory
+shared by different runs never mixes them.
+
+Grid points override the base config: detection fields are applied on top
+of base.detection, and a point without 'initial_balance' / 'max_concurrent'
+replays with base.initial_balance / base.max_open_positions.
+"""
+import contextlib
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, replace
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from core.models.structures import DetectionConfig
+from data.arena import MarketDataArena, attach_frames
+from simulation.engine.replay import replay_point
+from simulation.engine.signal_tape import SignalTape
+from simulation.engine.vectorized_backtester import VectorizedBacktester, BacktestConfig
+from simulation.sweep.grid import group_points, point_id, split_point
+
+METRIC_COLUMNS = ['trades', 'final_balance', 'net_profit', 'win_rate', 'cagr', 'max_dd_pct', 'sharpe']
+
+_worker_data: Optional[Dict[str, pd.DataFrame]] = None
+_worker_handles: list = []
+
+
+def _init_worker(blocks: dict):
+    global _worker_data, _worker_handles
+    _worker_data, _worker_handles = attach_frames(blocks)
+
+
+@contextlib.contextmanager
+def _silenced():
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        yield
+
+
+def _detection_config(base: BacktestConfig, detection: dict) -> DetectionConfig:
+    return replace(base.detection or DetectionConfig(), **detection)
+
+
+def _detect(data: Dict[str, pd.DataFrame], base: BacktestConfig, detection: dict) -> dict:
+    bt = VectorizedBacktester(replace(base, detection=_detection_config(base, detection)))
+    bt.data = data
+    with _silenced():
+        bt.run_detection_pipeline()
+    return bt.zones
+
+
+def _simulate_group(data: Dict[str, pd.DataFrame], base: BacktestConfig, group: dict,
+                    zones: Optional[dict], tape_path: str) -> List[dict]:
+    """Records (or loads) the group's signal tape and replays every point on it."""
+    if os.path.exists(tape_path):
+        tape = SignalTape.load(tape_path)
+    else:
+        bt = VectorizedBacktester(replace(base, detection=_detection_config(base, group['detection']),
+                                          **group['strategy']))
+        bt.data = data
+        bt.zones = copy.deepcopy(zones) # Simulation mutates zone status
+        with _silenced():
+            tape = bt.record_signal_tape(tape_path)
+
+    rows = []
+    for point in group['points']:
+        _, _, execution = split_point(point)
+        metrics = replay_point(tape, execution, base.initial_balance, base.max_open_positions)
+        rows.append({'point_id': point_id(point), **point, **{k: metrics[k] for k in METRIC_COLUMNS}})
+    return rows
+
+
+def _worker_detect(base: BacktestConfig, detection: dict) -> dict:
+    return _detect(_worker_data, base, detection)
+
+
+def _worker_simulate(base: BacktestConfig, group: dict, zones: Optional[dict], tape_path: str) -> List[dict]:
+    return _simulate_group(_worker_data, base, group, zones, tape_path)
+
+
+def _run_groups(data: Dict[str, pd.DataFrame], groups: Dict[str, Dict[str, dict]], base: BacktestConfig,
+                tape_path: Callable[[str], str], processes: Optional[int], on_rows: Callable[[List[dict]], None]):
+    """
+    Detects once per detection key, records every missing tape and replays
+    each group's points, handing finished rows to `on_rows` as groups land.
+    """
+    if processes == 1:
+        for det_key, strat_groups in groups.items():
+            needs_zones = any(not os.path.exists(tape_path(k)) for k in strat_groups)
+            zones = _detect(data, base, next(iter(strat_groups.values()))['detection']) if needs_zones else None
+            for strat_key, group in strat_groups.items():
+                on_rows(_simulate_group(data, base, group, zones, tape_path(strat_key)))
+        return
+    if not groups:
+        return
+
+    with MarketDataArena() as arena:
+        arena.add_frames(base.symbol, data)
+        workers = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(arena.descriptor(base.symbol),)) as pool:
+            sims = []
+            detections = {}
+            for det_key, strat_groups in groups.items():
+                cached = {k: g for k, g in strat_groups.items() if os.path.exists(tape_path(k))}
+                for strat_key, group in cached.items():
+                    sims.append(pool.submit(_worker_simulate, base, group, None, tape_path(strat_key)))
+                if len(cached) < len(strat_groups):
+                    detection = next(iter(strat_groups.values()))['detection']
+                    detections[pool.submit(_worker_detect, base, detection)] = det_key
+
+            # Chain each detection into its strategy groups as soon as it lands
+            for fut in as_completed(detections):
+                det_key = detections[fut]
+                zones = fut.result()
+                for strat_key, group in groups[det_key].items():
+                    if not os.path.exists(tape_path(strat_key)):
+                        sims.append(pool.submit(_worker_simulate, base, group, zones, tape_path(strat_key)))
+
+            for fut in as_completed(sims):
+                on_rows(fut.result())
+
+
+# BacktestConfig fields that only say where a run writes or reads, not what it computes
+_OUTPUT_FIELDS = ('ledger_path', 'ledger_format', 'ledger_batch_size', 'checkpoint_path',
+                  'checkpoint_every', 'resume', 'store_path')
+
+
+def base_id(base: BacktestConfig) -> str:
+    """Stable id of the base config a grid is swept over (every field that changes results)."""
+    config = asdict(base)
+    for name in _OUTPUT_FIELDS:
+        config.pop(name)
+    return point_id(config)
+
+
+class _ResultsTable:
+    """
+    Append-only CSV of finished grid points (the resume log), rows tagged
+    with base_id. Resuming with grid axes the file does not have yet
+    rewrites it once with the union of both column sets.
+    """
+
+    def __init__(self, path: str, keys: List[str], base: str):
+        self.path = path
+        self.base = base
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        if os.path.exists(path):
+            header = list(pd.read_csv(path, nrows=0).columns)
+            if 'base_id' not in header:
+                raise ValueError(f"{path} predates base_id keys; use a new results_path")
+            keys = sorted(set(keys) | (set(header) - {'point_id', 'base_id'} - set(METRIC_COLUMNS)))
+        self.columns = ['point_id', 'base_id'] + keys + METRIC_COLUMNS
+        if os.path.exists(path) and header != self.columns:
+            table = pd.read_csv(path, dtype={'point_id': str, 'base_id': str})
+            tmp = path + ".tmp"
+            table.reindex(columns=self.columns).to_csv(tmp, index=False)
+            os.replace(tmp, path)
+
+    def done(self) -> set:
+        if not os.path.exists(self.path):
+            return set()
+        table = pd.read_csv(self.path, usecols=['point_id', 'base_id'], dtype=str)
+        return set(table.loc[table['base_id'] == self.base, 'point_id'])
+
+    def append(self, rows: List[dict]):
+        header = not os.path.exists(self.path)
+        rows = [{**row, 'base_id': self.base} for row in rows]
+        pd.DataFrame(rows).reindex(columns=self.columns).to_csv(self.path, mode='a', header=header, index=False)
+
+    def read(self) -> pd.DataFrame:
+        table = pd.read_csv(self.path, dtype={'point_id': str, 'base_id': str})
+        return table[table['base_id'] == self.base]
+
+
+def run_sweep(
+    data: Dict[str, pd.DataFrame],
+    grid: List[dict],
+    base_config: Optional[BacktestConfig] = None,
+    results_path: str = "research/reports/sweep/results.csv",
+    work_dir: Optional[str] = None,
+    processes: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Runs every grid point and returns the results table (one row per point,
+    in grid order). Points already present in `results_path` are skipped.
+    processes=1 runs in-process without shared memory.
+    """
+    base = base_config or BacktestConfig()
+    work_dir = work_dir or os.path.join(os.path.dirname(results_path) or ".", "tapes")
+    os.makedirs(work_dir, exist_ok=True)
+
+    keys = sorted({k for p in grid for k in p})
+    run = base_id(base)
+    table = _ResultsTable(results_path, keys, run)
+    done = table.done()
+    pending = [p for p in grid if point_id(p) not in done]
+    groups = group_points(pending)
+    print(f"Sweep: {len(grid)} points, {len(grid) - len(pending)} done, "
+          f"{len(groups)} detection configs, {sum(len(g) for g in groups.values())} tapes to replay")
+
+    _run_groups(data, groups, base, lambda key: os.path.join(work_dir, f"tape_{key}_{run}.npz"), processes,
+                table.append)
+
+    results = table.read()
+    order = {pid: i for i, pid in enumerate(point_id(p) for p in grid)}
+    results = results[results['point_id'].isin(order)]
+    return results.sort_values('point_id', key=lambda s: s.map(order)).reset_index(drop=True)
@@ -0,0 +1,201 @@
+"""
+SIGMA Walk-Forward Harness
+Rolling or anchored train/test windows over one continuous history.
+
+- Zones are detected once per detection config over the full history, and
+  one signal tape is recorded per (detection, strategy) config from
+  `history_start` to the last test bar. Every window is a slice of these
+  tapes, so the structural warmup that windows share (zone book, flow
+  latches) is computed once and cached on disk under `work_dir`, keyed by
+  the sweep's base_id (the full base config over the whole history).
+- Grid points override the base config as in run_sweep: balance and
+  position cap default to base.initial_balance / base.max_open_positions.
+- Per window, every grid point is replayed on the train slice, the best
+  point by `objective` is replayed on the test slice. Windows run in
+  parallel. A window where no point has a finite train score is skipped:
+  it is not traded and its row records the reason in `skipped`.
+- Test segments are chained by returns into one out-of-sample equity curve
+  (each segment is replayed from the point's initial balance, then rescaled
+  to the running equity).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from simulation.engine.replay import replay_execution, replay_settings, summarize_replay
+from simulation.engine.signal_tape import SignalTape
+from simulation.engine.vectorized_backtester import BacktestConfig
+from simulation.sweep.grid import group_points, point_id, split_point
+from simulation.sweep.runner import METRIC_COLUMNS, _run_groups, base_id
+
+
+@dataclass
+class Window:
+    """Half-open [start, end) train and test ranges."""
+    train_start: pd.Timestamp
+    train_end: pd.Timestamp
+    test_start: pd.Timestamp
+    test_end: pd.Timestamp
+
+
+@dataclass
+class WalkForwardResult:
+    windows: pd.DataFrame  # One row per window: bounds, chosen point, train objective, OOS metrics, skip reason
+    equity: pd.Series      # Stitched out-of-sample equity
+    trades: pd.DataFrame   # Out-of-sample trades tagged with their window
+
+
+def make_windows(start, end, train_months: int = 24, test_months: int = 12,
+                 step_months: Optional[int] = None, anchored: bool = False) -> List[Window]:
+    """
+    Consecutive windows whose test ranges tile [start, end).
+    Rolling windows keep a fixed train length; anchored windows keep train_start.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    step = pd.DateOffset(months=step_months or test_months)
+    windows = []
+    train_start = start
+    train_end = start + pd.DateOffset(months=train_months)
+    while train_end < end:
+        test_end = min(train_end + pd.DateOffset(months=test_months), end)
+        windows.append(Window(train_start, train_end, train_end, test_end))
+        train_end = train_end + step
+        if not anchored:
+            train_start = train_start + step
+    return windows
+
+
+_worker_tapes: Dict[str, SignalTape] = {}
+_worker_base: Optional[BacktestConfig] = None
+
+
+def _init_worker(tape_paths: Dict[str, str], base: BacktestConfig):
+    global _worker_tapes, _worker_base
+    _worker_tapes = {key: SignalTape.load(path) for key, path in tape_paths.items()}
+    _worker_base = base
+
+
+def _replay(tape: SignalTape, execution: dict, base: BacktestConfig):
+    sym, risk, cap, balance = replay_settings(tape, execution, base.initial_balance, base.max_open_positions)
+    return replay_execution(tape, sym, risk, initial_balance=balance, max_concurrent=cap), balance
+
+
+def _run_window(tapes: Dict[str, SignalTape], window: Window, points: List[tuple], objective: str,
+                base: BacktestConfig) -> dict:
+    """Optimizes on the train slice and replays the winner on the test slice."""
+    train = {key: tape.window(window.train_start, window.train_end) for key, tape in tapes.items()}
+    best, best_score = None, -np.inf
+    for key, point in points:
+        _, _, execution = split_point(point)
+        result, balance = _replay(train[key], execution, base)
+        score = summarize_replay(train[key], result, balance)[objective]
+        if np.isfinite(score) and score > best_score:
+            best, best_score = (key, point), score
+
+    if best is None:
+        return {'window': window, 'skipped': f"no finite train {objective}"}
+    key, point = best
+    test = tapes[key].window(window.test_start, window.test_end)
+    _, _, execution = split_point(point)
+    result, balance = _replay(test, execution, base)
+    return {
+        'window': window, 'skipped': None, 'point': point, 'train_score': best_score,
+        'metrics': summarize_replay(test, result, balance),
+        'times': test.times, 'equity': result.equity, 'initial_balance': balance,
+        'trades': result.to_frame(),
+    }
+
+
+def _worker_window(window: Window, points: List[tuple], objective: str) -> dict:
+    return _run_window(_worker_tapes, window, points, objective, _worker_base)
+
+
+def walk_forward(
+    data: Dict[str, pd.DataFrame],
+    grid: List[dict],
+    windows: List[Window],
+    base_config: Optional[BacktestConfig] = None,
+    objective: str = 'sharpe',
+    history_start=None,
+    work_dir: str = "research/reports/walk_forward",
+    processes: Optional[int] = None,
+) -> WalkForwardResult:
+    """
+    Walk-forward optimization of `grid` (sweep grid points) over `windows`.
+    `history_start` is where the recorded simulation begins (default: first
+    driver bar); everything before the first train window acts as warmup.
+    """
+    if objective not in METRIC_COLUMNS:
+        raise ValueError(f"Unknown objective '{objective}', expected one of {METRIC_COLUMNS}")
+    if not windows:
+        raise ValueError("No walk-forward windows")
+    if not grid:
+        raise ValueError("Empty walk-forward grid")
+
+    base = base_config or BacktestConfig()
+    driver = data[base.timeframes[-1]]
+    start = pd.Timestamp(history_start) if history_start is not None else driver.index[0]
+    end = max(w.test_end for w in windows)
+    base = replace(base, start_date=str(start), end_date=str(end))
+
+    # 1. Full-history tapes (detection once per config, cached across runs)
+    groups = group_points(grid)
+    history = base_id(base)
+    os.makedirs(work_dir, exist_ok=True)
+
+    def tape_path(key: str) -> str:
+        return os.path.join(work_dir, f"tape_{key}_{history}.npz")
+
+    record = {}
+    for det, strat in groups.items():
+        missing = {key: {**g, 'points': []} for key, g in strat.items() if not os.path.exists(tape_path(key))}
+        if missing:
+            record[det] = missing
+    _run_groups(data, record, base, tape_path, processes, lambda rows: None)
+
+    points = [(key, p) for strat in groups.values() for key, g in strat.items() for p in g['points']]
+    tape_paths = {key: tape_path(key) for strat in groups.values() for key in strat}
+
+    # 2. Per-window optimization
+    if processes == 1:
+        tapes = {key: SignalTape.load(path) for key, path in tape_paths.items()}
+        outcomes = [_run_window(tapes, w, points, objective, base) for w in windows]
+    else:
+        workers = min(processes or os.cpu_count() or 1, len(windows))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tape_paths, base)) as pool:
+            outcomes = list(pool.map(_worker_window, windows, [points] * len(windows), [objective] * len(windows)))
+
+    # 3. Stitch the out-of-sample segments
+    rows, segments, trades = [], [], []
+    running = None
+    for k, out in enumerate(outcomes):
+        w = out['window']
+        bounds = {'window': k, 'train_start': w.train_start, 'train_end': w.train_end,
+                  'test_start': w.test_start, 'test_end': w.test_end}
+        if out['skipped']:
+            rows.append({**bounds, 'skipped': out['skipped']})
+            continue
+        rows.append({
+            **bounds, 'skipped': None,
+            'point_id': point_id(out['point']), **out['point'],
+            f'train_{objective}': out['train_score'],
+            **{f'oos_{m}': out['metrics'][m] for m in METRIC_COLUMNS},
+        })
+        if out['equity'] is not None and len(out['equity']):
+            running = out['initial_balance'] if running is None else running
+            curve = running * out['equity'] / out['initial_balance']
+            segments.append(pd.Series(curve, index=pd.DatetimeIndex(out['times'])))
+            running = curve[-1]
+        if len(out['trades']):
+            trades.append(out['trades'].assign(window=k))
+
+    equity = pd.concat(segments) if segments else pd.Series(dtype=float)
+    return WalkForwardResult(
+        windows=pd.DataFrame(rows),
+        equity=equity.rename('equity'),
+        trades=pd.concat(trades, ignore_index=True) if trades else pd.DataFrame(),
+    )
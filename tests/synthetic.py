@@ -0,0 +1,20 @@
+"""
+Helpers for the simulation tests on the synthetic market (data.synthetic).
+"""
+import contextlib
+import io
+
+from data.synthetic import make_market
+from simulation.engine.vectorized_backtester import VectorizedBacktester, BacktestConfig
+
+
+def make_backtester(n_days: int = 90, start_date: str = "2019-02-01", end_date: str = "2019-03-31", **cfg) -> VectorizedBacktester:
+    bt = VectorizedBacktester(BacktestConfig(start_date=start_date, end_date=end_date, **cfg))
+    bt.data = make_market(n_days)
+    return bt
+
+
+def quiet(fn, *args, **kwargs):
+    """Runs fn with the engine's progress prints suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
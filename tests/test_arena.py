@@ -0,0 +1,114 @@
+import gc
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from data.arena import MarketDataArena, attach_frames, attach_market
+from tests.synthetic import make_market
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Owner that attaches from spawned workers, then dies without releasing
+_KILLED_OWNER = (
+    "import multiprocessing, os\n"
+    "from concurrent.futures import ProcessPoolExecutor\n"
+    "from data.arena import MarketDataArena\n"
+    "from tests.synthetic import make_market\n"
+    "from tests.test_arena import _close_sum\n"
+    "if __name__ == '__main__':\n"
+    "    multiprocessing.set_start_method('spawn')\n"
+    "    arena = MarketDataArena()\n"
+    "    blocks = arena.add_frames('BTCUSDT', make_market(5))\n"
+    "    with ProcessPoolExecutor(max_workers=2) as pool:\n"
+    "        list(pool.map(_close_sum, [blocks] * 2))\n"
+    "    print(','.join(b.name for b in blocks.values()), flush=True)\n"
+    "    os._exit(0)\n"
+)
+
+
+def _close_sum(blocks):
+    frames, handles = attach_frames(blocks)
+    total = float(frames['M30']['close'].sum())
+    del frames
+    for h in handles:
+        h.close()
+    return total
+
+
+def _exists(name):
+    try:
+        shared_memory.SharedMemory(name=name).close()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+class TestArena(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = make_market(30)
+
+    def test_roundtrip_zero_copy(self):
+        with MarketDataArena() as arena:
+            arena.add_frames("BTCUSDT", self.data)
+            arena.add_frames("ETHUSDT", {'H4': self.data['H4']})
+            blocks = arena.descriptor("BTCUSDT")
+            self.assertEqual(blocks['M30'].columns[:4], ('open', 'high', 'low', 'close'))
+            attached, handles = attach_frames(blocks)
+            for tf, df in self.data.items():
+                pd.testing.assert_frame_equal(attached[tf], df[list(blocks[tf].columns)],
+                                              check_freq=False, check_index_type=False)
+            # Frames are views over the shared block
+            view = attached['M30']['close'].to_numpy()
+            self.assertTrue(np.shares_memory(view, np.frombuffer(handles[list(blocks).index('M30')].buf, dtype=np.float64)))
+            del attached, view
+
+            market, more = attach_market(arena.descriptor())
+            self.assertEqual(sorted(market), ["BTCUSDT", "ETHUSDT"])
+            self.assertEqual(list(market["ETHUSDT"]), ['H4'])
+            del market
+            for h in handles + more:
+                h.close()
+
+            # Publishing the same key again does not copy
+            size = arena.nbytes
+            arena.add("BTCUSDT", 'M30', self.data['M30'])
+            self.assertEqual(arena.nbytes, size)
+            with self.assertRaises(KeyError):
+                arena.descriptor("SOLUSDT")
+
+    def test_pool_workers_and_cleanup(self):
+        arena = MarketDataArena()
+        arena.add_frames("BTCUSDT", self.data)
+        blocks = arena.descriptor("BTCUSDT")
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=2, mp_context=ctx) as pool:
+            sums = list(pool.map(_close_sum, [blocks] * 2))
+        self.assertAlmostEqual(sums[0], float(self.data['M30']['close'].sum()))
+        self.assertTrue(all(_exists(b.name) for b in blocks.values()))
+
+        # Dropping the owner unlinks its blocks
+        del arena
+        gc.collect()
+        self.assertFalse(any(_exists(b.name) for b in blocks.values()))
+
+    def test_tracker_cleans_up_after_a_killed_owner(self):
+        proc = subprocess.run([sys.executable, "-c", _KILLED_OWNER], cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+        names = proc.stdout.strip().split(',')
+        self.assertEqual(len(names), len(self.data))
+        # The owner's resource tracker unlinks the leaked blocks once it sees the owner gone
+        deadline = time.monotonic() + 10
+        while any(_exists(n) for n in names) and time.monotonic() < deadline:
+            time.sleep(0.1)
+        self.assertFalse(any(_exists(n) for n in names))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from simulation.engine.checkpoint import read_checkpoint, write_checkpoint
+from tests.synthetic import make_backtester, quiet
+
+CRASH_AT = pd.Timestamp("2019-03-05 12:00")
+
+
+def run(bt, crash_at=None):
+    quiet(bt.run_detection_pipeline)
+    if crash_at is not None:
+        manage = bt.trade_manager.manage_positions
+
+        def crashing(low, high, price, time, *args, **kwargs):
+            if time >= crash_at:
+                raise RuntimeError("simulated crash")
+            return manage(low, high, price, time, *args, **kwargs)
+        with mock.patch.object(bt.trade_manager, 'manage_positions', crashing):
+            try:
+                quiet(bt.run_simulation, record_tape=True)
+            except RuntimeError:
+                return bt
+        raise AssertionError("run did not reach the crash bar")
+    quiet(bt.run_simulation, record_tape=True)
+    return bt
+
+
+class TestCheckpoint(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.full = {ff: run(make_backtester(fast_forward=ff)) for ff in (False, True)}
+
+    def assert_same_run(self, bt, ref):
+        self.assertGreater(len(ref.get_ledger()), 0)
+        pd.testing.assert_frame_equal(bt.get_ledger(), ref.get_ledger(), check_dtype=False)
+        self.assertEqual(bt.trade_manager.equity_history, ref.trade_manager.equity_history)
+        np.testing.assert_array_equal(bt.signal_tape.bar, ref.signal_tape.bar)
+        self.assertEqual(bt.orchestrator.snapshot(), ref.orchestrator.snapshot())
+        self.assertEqual(bt.bars_skipped, ref.bars_skipped)
+
+    def test_resume_after_crash(self):
+        for ff in (False, True):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "sim.ckpt")
+                run(make_backtester(fast_forward=ff, checkpoint_path=path, checkpoint_every=300), crash_at=CRASH_AT)
+                self.assertLess(read_checkpoint(path)['time'], CRASH_AT)
+
+                resumed = run(make_backtester(fast_forward=ff, checkpoint_path=path, checkpoint_every=300, resume=True))
+                self.assert_same_run(resumed, self.full[ff])
+
+    def test_resume_rewinds_streamed_ledger(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = dict(checkpoint_path=os.path.join(tmp, "sim.ckpt"), checkpoint_every=400,
+                       ledger_path=os.path.join(tmp, "ledger"), ledger_batch_size=2)
+            run(make_backtester(**cfg), crash_at=CRASH_AT)
+            resumed = run(make_backtester(resume=True, **cfg))
+            self.assert_same_run(resumed, self.full[False])
+
+    def test_warm_start_matches_continuous_structure(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "is.ckpt")
+            run(make_backtester(end_date="2019-02-28", checkpoint_path=path))
+            oos = run(make_backtester(start_date="2019-03-01", warm_start_path=path))
+
+        full = self.full[False]
+        self.assertEqual(oos.orchestrator.snapshot_flow(), full.orchestrator.snapshot_flow())
+        march = full.signal_tape.times[full.signal_tape.bar] >= np.datetime64("2019-03-01")
+        np.testing.assert_array_equal(oos.signal_tape.zone_id, full.signal_tape.zone_id[march])
+        self.assertEqual(oos.trade_manager.equity_history[0]['equity'], 10000.0)
+
+    def test_warm_start_rejects_gap(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "is.ckpt")
+            run(make_backtester(end_date="2019-02-20", checkpoint_path=path))
+            with self.assertRaises(ValueError):
+                run(make_backtester(start_date="2019-03-01", warm_start_path=path))
+
+    def test_versioned_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "x.ckpt")
+            write_checkpoint(path, {'a': 1})
+            self.assertEqual(read_checkpoint(path), {'a': 1})
+            with open(path, 'r+b') as f:
+                f.seek(8)
+                f.write(struct.pack("<H", 99))
+            with self.assertRaises(ValueError):
+                read_checkpoint(path)
+            with open(path, 'wb') as f:
+                f.write(b"not a checkpoint")
+            with self.assertRaises(ValueError):
+                read_checkpoint(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
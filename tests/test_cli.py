@@ -0,0 +1,102 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from sigma.cli import HEAVY_MODULES, IMPORT_BUDGET_S, main
+from tests.synthetic import make_backtester, quiet
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_times(stderr: str) -> dict:
+    """module -> cumulative seconds from -X importtime output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+class TestCli(unittest.TestCase):
+    def test_help_import_budget(self):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "sigma", "detect", "--help"],
+                              cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+        self.assertIn("usage: sigma detect", proc.stdout)
+
+        times = _import_times(proc.stderr)
+        heavy = sorted(m for m in times if m.split('.')[0] in HEAVY_MODULES)
+        self.assertEqual(heavy, [])
+        self.assertLess(times['sigma'] + times['sigma.cli'], IMPORT_BUDGET_S)
+
+    def test_help_leaves_heavy_modules_unloaded(self):
+        for command, option in [('backtest', '--max-open'), ('walk-forward', '--train-months'), ('fetch', '--source')]:
+            script = ("import sys\n"
+                      "from sigma.cli import HEAVY_MODULES, main\n"
+                      "try:\n"
+                      f"    main(['{command}', '--help'])\n"
+                      "except SystemExit:\n"
+                      "    pass\n"
+                      "print(','.join(sorted(m for m in sys.modules if m.split('.')[0] in HEAVY_MODULES)), file=sys.stderr)\n")
+            proc = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True)
+            self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+            self.assertIn(option, proc.stdout)
+            self.assertEqual(proc.stderr.strip(), "", command)
+
+    def test_fetch_calls_the_data_package(self):
+        with mock.patch("data.vision.download_to_raw") as vision, mock.patch("data.fetcher.fetch_to_raw") as ccxt:
+            self.assertEqual(main(["fetch", "--symbol", "ETHUSDT", "--timeframes", "D1,H4", "--out", "raw"]), 0)
+            self.assertEqual(main(["fetch", "--source", "ccxt", "--start", "2021-01-01"]), 0)
+        vision.assert_called_once_with("ETHUSDT", ["D1", "H4"], "2018-01-01", None, data_dir="raw", workers=8)
+        ccxt.assert_called_once_with("config/exchange_config.yaml", start="2021-01-01", data_dir="data/raw")
+
+    def test_walk_forward_command(self):
+        tester = make_backtester()
+        with tempfile.TemporaryDirectory() as tmp, mock.patch("sigma.cli._backtester", return_value=tester):
+            code = quiet(main, ["walk-forward", "--start", "2019-02-01", "--end", "2019-04-01",
+                                "--train-months", "1", "--test-months", "1", "--record-start", "2019-02-01",
+                                "--param", "sl_buffer=100,200", "--processes", "1", "--out", tmp])
+            self.assertEqual(code, 0)
+            windows = pd.read_csv(os.path.join(tmp, "windows.csv"))
+            self.assertEqual(len(windows), 1)
+            self.assertIn(windows['sl_buffer'][0], (100, 200))
+            self.assertTrue(os.path.exists(os.path.join(tmp, "oos_equity_curve.csv")))
+
+    def test_scripts_run_as_modules(self):
+        for name in ("run_walk_forward", "bench_portfolio_scaling", "bench_zone_model", "monte_carlo_validation",
+                     "data_fetcher", "binance_vision_downloader", "verify_data"):
+            with open(os.path.join(ROOT, "scripts", f"{name}.py"), encoding="utf-8") as f:
+                self.assertNotIn("sys.path", f.read(), name)
+        proc = subprocess.run([sys.executable, "-m", "scripts.bench_zone_model", "--help"], cwd=ROOT,
+                              capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+
+    def test_mc_command(self):
+        pnl = np.random.default_rng(0).normal(50.0, 250.0, 80)
+        with tempfile.TemporaryDirectory() as tmp:
+            log, bands = os.path.join(tmp, "trade_log.csv"), os.path.join(tmp, "bands.csv")
+            pd.DataFrame({'pnl': pnl}).to_csv(log, index=False)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = main(["mc", log, "--iterations", "500", "--processes", "1", "--bands", bands])
+            self.assertEqual(code, 0)
+            self.assertIn("ruin_pct", out.getvalue())
+            table = pd.read_csv(bands)
+            self.assertEqual(list(table.columns), ['trade', 'p5', 'p25', 'p50', 'p75', 'p95'])
+            self.assertEqual(len(table), len(pnl) + 1)
+
+    def test_sweep_param_validation(self):
+        with self.assertRaises(SystemExit):
+            main(["sweep", "--param", "sl_buffer"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -238,7 +238,7 @@ class TestFullPipeline:
         for zone in zones:
             assert zone.L1_price > 0
             assert zone.L2_price > 0
-            assert zone.zone_id != ""
+            assert zone.zone_id != 0
             assert zone.timeframe == "D1"
 
 
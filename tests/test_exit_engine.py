@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+import pandas as pd
+from core.execution.trade_manager import TradeManager, Position
+from core.risk.sizing import RiskCalculator, RiskConfig, SymbolParams
+from core.system.price_index import PriceRangeIndex
+from simulation.engine.exit_engine import ExitEngine
+
+
+def _random_walk(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 10000.0 + np.cumsum(rng.normal(0, 40, n)).round(1)
+    high = close + rng.uniform(0, 60, n).round(1)
+    low = close - rng.uniform(0, 60, n).round(1)
+    return high, low, close
+
+
+def _manage_bar_by_bar(high, low, close, start, direction, entry, sl, tp, params):
+    """Reference: one position walked through TradeManager.manage_positions."""
+    risk = RiskCalculator(RiskConfig())
+    risk.symbols['TEST'] = params
+    tm = TradeManager(risk)
+    tm.positions.append(Position(
+        ticket=1, symbol='TEST', direction=direction, entry_price=entry, sl=sl, tp=tp,
+        size=1.0, open_time=pd.Timestamp(0), comment="", zone_id=0,
+    ))
+    for i in range(start, len(close)):
+        closed = tm.manage_positions(low[i], high[i], close[i], pd.Timestamp(i))
+        if closed:
+            return i, closed[0].exit_price, closed[0].reason
+    return len(close), close[-1], "Forced Close (End of Sim)"
+
+
+class TestPriceRangeIndex(unittest.TestCase):
+    def test_queries_match_brute_force(self):
+        high, low, _ = _random_walk(1000, 3)
+        idx = PriceRangeIndex(high, low, block=16)
+        rng = np.random.default_rng(4)
+        for _ in range(300):
+            a, b = sorted(rng.integers(0, 1001, 2))
+            if a < b:
+                self.assertEqual(idx.range_max(a, b), high[a:b].max())
+                self.assertEqual(idx.range_min(a, b), low[a:b].min())
+            level = float(rng.uniform(high.min(), high.max()))
+            hits = np.flatnonzero(high[a:b] >= level)
+            self.assertEqual(idx.first_high_at_or_above(a, level, b), a + hits[0] if len(hits) else b)
+            hits = np.flatnonzero(low[a:b] <= level)
+            self.assertEqual(idx.first_low_at_or_below(a, level, b), a + hits[0] if len(hits) else b)
+
+
+class TestExitEngine(unittest.TestCase):
+    def test_matches_manage_positions(self):
+        high, low, close = _random_walk(3000, 11)
+        engine = ExitEngine(high, low, close, block=32)
+        rng = np.random.default_rng(12)
+        param_sets = [
+            None,
+            SymbolParams(sl_buffer=0.0),
+            SymbolParams(sl_buffer=0.0, be_activation=150.0, be_lockin=20.0),
+            SymbolParams(sl_buffer=0.0, trail_activation=200.0, trail_distance=120.0),
+            SymbolParams(sl_buffer=0.0, be_activation=100.0, be_lockin=10.0,
+                         trail_activation=300.0, trail_distance=250.0),
+            SymbolParams(sl_buffer=0.0, be_activation=400.0, be_lockin=50.0,
+                         trail_activation=150.0, trail_distance=100.0),
+        ]
+        for params in param_sets:
+            for _ in range(60):
+                start = int(rng.integers(0, len(close)))
+                direction = 'BULLISH' if rng.random() < 0.5 else 'BEARISH'
+                entry = float(close[start])
+                sign = 1.0 if direction == 'BULLISH' else -1.0
+                sl = entry - sign * float(rng.uniform(50, 600))
+                tp = entry + sign * float(rng.uniform(100, 1500)) if rng.random() < 0.5 else 0.0
+                expected = _manage_bar_by_bar(high, low, close, start, direction, entry, sl, tp, params)
+                got = engine.exit_for(start, direction, entry, sl, tp, params)
+                self.assertEqual(got, expected, (params, start, direction, entry, sl, tp))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import numpy as np
+import pandas as pd
+from tests.synthetic import make_backtester, quiet
+
+
+class TestFastForward(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.runs = {}
+        for ff in (False, True):
+            bt = make_backtester(fast_forward=ff)
+            quiet(bt.run_detection_pipeline)
+            quiet(bt.run_simulation, record_tape=True)
+            cls.runs[ff] = bt
+
+    def test_skips_bars(self):
+        self.assertEqual(self.runs[False].bars_skipped, 0)
+        self.assertGreater(self.runs[True].bars_skipped, 0)
+
+    def test_ledger_and_equity_identical(self):
+        full, fast = self.runs[False], self.runs[True]
+        self.assertGreater(len(full.get_ledger()), 0)
+        pd.testing.assert_frame_equal(fast.get_ledger(), full.get_ledger())
+        self.assertEqual(fast.trade_manager.equity_history, full.trade_manager.equity_history)
+        np.testing.assert_array_equal(fast.signal_tape.bar, full.signal_tape.bar)
+
+    def test_zone_and_flow_state_identical(self):
+        full, fast = self.runs[False], self.runs[True]
+        self.assertEqual(fast.orchestrator.snapshot_flow(), full.orchestrator.snapshot_flow())
+        for tf in full.zones:
+            self.assertEqual([z.as_dict() for z in fast.zones[tf]], [z.as_dict() for z in full.zones[tf]], tf)
+
+
+if __name__ == '__main__':
+    unittest.main()
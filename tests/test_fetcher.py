@@ -0,0 +1,133 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import pandas as pd
+from data.fetcher import AsyncFetcher, Checkpoint, FetchConfig, FetchError, TokenBucket, load_fetch_config
+
+HOUR = 3_600_000
+START = pd.Timestamp('2020-01-01')
+UNTIL = pd.Timestamp('2020-01-05')  # 96 H1 bars
+
+
+class NetworkError(Exception):
+    """Stands in for ccxt.NetworkError (matched by class name)."""
+
+
+class FakeExchange:
+    def __init__(self, id, rate_limit=1, fail_after=None, error=ValueError, flaky=0):
+        self.id = id
+        self.rateLimit = rate_limit
+        self.fail_after = fail_after
+        self.error = error
+        self.flaky = flaky
+        self.calls = []
+        self.closed = False
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append((symbol, timeframe, since))
+        await asyncio.sleep(0)
+        if self.flaky:
+            self.flaky -= 1
+            raise NetworkError("timeout")
+        if self.fail_after is not None and len(self.calls) > self.fail_after:
+            raise self.error("exchange down")
+        step = {'1h': HOUR, '4h': 4 * HOUR}[timeframe]
+        first = -(-since // step) * step
+        end = int((UNTIL - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1))
+        times = range(first, min(end, first + limit * step), step)
+        return [[t, 1.0, 2.0, 0.5, 1.5, 10.0] for t in times]
+
+    async def close(self):
+        self.closed = True
+
+
+async def _no_sleep(_):
+    pass
+
+
+class TestFetcher(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.checkpoint = Checkpoint(os.path.join(self.root, "ckpt"))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def config(self, **kw):
+        fields = dict(symbols=['BTC/USDT:USDT'], timeframes=['H1', 'H4'], start='2020-01-01', limit=10, backoff=0)
+        fields.update(kw)
+        return FetchConfig(**fields)
+
+    def test_concurrent_series_with_retries(self):
+        exchange = FakeExchange('mexc', flaky=2)
+        saved = {}
+        fetcher = AsyncFetcher(self.config(), [exchange], self.checkpoint, sleep=_no_sleep)
+        frames = asyncio.run(fetcher.run(sink=lambda s, tf, df: saved.setdefault(tf, len(df)), until=UNTIL))
+
+        h1 = frames[('BTC/USDT:USDT', 'H1')]
+        self.assertEqual(len(h1), 96)
+        self.assertEqual(h1['time'].iloc[0], START)
+        self.assertTrue(h1['time'].diff().iloc[1:].eq(pd.Timedelta(hours=1)).all())
+        self.assertEqual(saved, {'H1': 96, 'H4': 24})
+        self.assertTrue(exchange.closed)
+        # Both series were paginated in interleaved fashion on one loop
+        tfs = [tf for _, tf, _ in exchange.calls]
+        self.assertLess(tfs.index('4h'), len(tfs) - tfs[::-1].index('1h') - 1)
+        self.assertEqual(os.listdir(self.checkpoint.root), [])
+
+    def test_failover_follows_priority_and_resumes_cursor(self):
+        primary = FakeExchange('mexc', fail_after=3)
+        backup = FakeExchange('kraken')
+        fetcher = AsyncFetcher(self.config(timeframes=['H1']), [primary, backup], self.checkpoint, sleep=_no_sleep)
+        frame = asyncio.run(fetcher.fetch_series('BTC/USDT:USDT', 'H1', until=UNTIL))
+        self.assertEqual(len(frame), 96)
+        # The backup continues where the primary stopped
+        self.assertEqual(backup.calls[0][2], primary.calls[2][2] + 10 * HOUR)
+        with open(self.checkpoint.path('BTC/USDT:USDT', 'H1')) as f:
+            self.assertIn('"kraken"', f.read())
+
+    def test_interrupted_fetch_resumes_from_checkpoint(self):
+        broken = FakeExchange('mexc', fail_after=4, error=NetworkError)
+        fetcher = AsyncFetcher(self.config(timeframes=['H1'], retries=1), [broken], self.checkpoint, sleep=_no_sleep)
+        with self.assertRaises(FetchError):
+            asyncio.run(fetcher.run(until=UNTIL))
+        cursor, rows = self.checkpoint.load('BTC/USDT:USDT', 'H1')
+        self.assertEqual(len(rows), 40)
+        # A torn trailing line from a crash is ignored
+        with open(self.checkpoint.path('BTC/USDT:USDT', 'H1'), 'a') as f:
+            f.write('{"exchange": "mexc", "cur')
+
+        fresh = FakeExchange('mexc')
+        fetcher = AsyncFetcher(self.config(timeframes=['H1']), [fresh], self.checkpoint, sleep=_no_sleep)
+        frames = asyncio.run(fetcher.run(until=UNTIL))
+        self.assertEqual(fresh.calls[0][2], cursor)
+        self.assertEqual(len(fresh.calls), 6)
+        self.assertEqual(len(frames[('BTC/USDT:USDT', 'H1')]), 96)
+
+    def test_token_bucket_paces_requests(self):
+        bucket = TokenBucket(rate=50.0, capacity=2)
+
+        async def drain():
+            for _ in range(6):
+                await bucket.acquire()
+
+        t0 = time.perf_counter()
+        asyncio.run(drain())
+        # Two burst tokens, then four at 50/s
+        self.assertGreaterEqual(time.perf_counter() - t0, 0.07)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_config_priority(self):
+        cfg = load_fetch_config()
+        self.assertEqual([spec['name'] for spec in cfg.exchanges], ['mexc', 'kraken'])
+        self.assertEqual(cfg.symbols, ['BTC/USDT:USDT'])
+        self.assertEqual(cfg.timeframes[:3], ['MN1', 'W1', 'D1'])
+        self.assertEqual(cfg.limit, 1500)
+
+
+if __name__ == '__main__':
+    unittest.main()
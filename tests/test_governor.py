@@ -0,0 +1,60 @@
+import unittest
+import pandas as pd
+from core.models.structures import SignalDirection
+from core.strategy.engines.efficiency_governor import EfficiencyGovernor
+from core.strategy.orchestrator import StrategyOrchestrator
+from tests.synthetic import make_backtester, quiet
+
+T0 = pd.Timestamp("2020-01-01")
+
+
+class TestGovernorIsolation(unittest.TestCase):
+    def test_blocks_are_per_instance(self):
+        a, b = StrategyOrchestrator(heartbeat=False), StrategyOrchestrator(heartbeat=False)
+        a.report_trade_failure('H1', 'BEARISH', T0)
+        self.assertFalse(a.governor.is_temporally_clean('H1', 'BTCUSDT', SignalDirection.BEARISH, T0))
+        self.assertTrue(b.governor.is_temporally_clean('H1', 'BTCUSDT', SignalDirection.BEARISH, T0))
+
+    def test_snapshot_restore_reset(self):
+        gov = EfficiencyGovernor()
+        gov.report_trade_failure('BTCUSDT', 'M30', SignalDirection.BULLISH, T0)
+        snap = gov.snapshot()
+        gov.reset()
+        self.assertTrue(gov.is_temporally_clean('M30', 'BTCUSDT', SignalDirection.BULLISH, T0))
+        gov.restore(snap)
+        self.assertFalse(gov.is_temporally_clean('M30', 'BTCUSDT', SignalDirection.BULLISH, T0))
+
+    def test_orchestrator_reset_after_run(self):
+        bt = make_backtester()
+        quiet(bt.run_detection_pipeline)
+        quiet(bt.run_simulation)
+        orch = bt.orchestrator
+        snap = orch.snapshot()
+        self.assertNotEqual(snap, StrategyOrchestrator().snapshot())
+
+        orch.reset()
+        self.assertEqual(orch.snapshot(), StrategyOrchestrator().snapshot())
+        orch.restore(snap)
+        self.assertEqual(orch.snapshot(), snap)
+
+    def test_back_to_back_runs_identical(self):
+        ledgers = []
+        for _ in range(2):
+            bt = make_backtester()
+            quiet(bt.run_detection_pipeline)
+            quiet(bt.run_simulation)
+            ledgers.append(bt.get_ledger())
+        self.assertGreater(len(ledgers[0]), 0)
+        pd.testing.assert_frame_equal(ledgers[0], ledgers[1])
+
+    def test_gasket_multiple_is_configurable(self):
+        tapes = {}
+        for gasket in (0.5, 3.0):
+            bt = make_backtester(gasket_multiple=gasket)
+            quiet(bt.run_detection_pipeline)
+            tapes[gasket] = quiet(bt.record_signal_tape)
+        self.assertLess(len(tapes[0.5]), len(tapes[3.0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from core.execution.trade_manager import ClosedTrade, Position, TradeManager
+from core.risk.sizing import RiskCalculator, RiskConfig
+from simulation.engine.ledger_sink import LedgerSink, read_ledger, scan_ledger
+from tests.synthetic import make_backtester, quiet
+
+
+def _trade(i: int) -> ClosedTrade:
+    t0 = pd.Timestamp("2020-01-01") + pd.Timedelta(minutes=30 * i)
+    return ClosedTrade(
+        ticket=i, symbol="BTCUSDT", direction="BULLISH",
+        entry_price=100.0 + i, exit_price=101.0 + i, size=0.5, pnl=0.5,
+        open_time=t0, close_time=t0 + pd.Timedelta(hours=1),
+        reason="Take Profit", entry_reason="H4#000000001234abcd D1 Inertial Flow [T1]",
+        origin_id=0x1234abcd, tf="H4"
+    )
+
+
+class TestLedgerSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parquet_roundtrip_in_batches(self):
+        path = os.path.join(self.tmp.name, "ledger")
+        with LedgerSink(path, batch_size=4) as sink:
+            for i in range(10):
+                sink.append(_trade(i))
+        # 10 rows at batch_size=4 -> 3 part files
+        self.assertEqual(len(os.listdir(path)), 3)
+
+        df = read_ledger(path)
+        expected = pd.DataFrame([vars(_trade(i)) for i in range(10)])
+        pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+    def test_lazy_column_projection(self):
+        path = os.path.join(self.tmp.name, "ledger")
+        with LedgerSink(path, batch_size=3) as sink:
+            sink.extend([_trade(i) for i in range(7)])
+        batches = list(scan_ledger(path, columns=["ticket", "pnl"]))
+        self.assertEqual([b.num_rows for b in batches], [3, 3, 1])
+        self.assertEqual(batches[0].schema.names, ["ticket", "pnl"])
+
+    def test_ipc_partial_ledger_survives_crash(self):
+        path = os.path.join(self.tmp.name, "ledger.arrows")
+        sink = LedgerSink(path, batch_size=2, fmt='ipc')
+        for i in range(5):
+            sink.append(_trade(i))
+        # Simulated crash: 4 rows flushed, 1 buffered, stream never closed.
+        # Append garbage to mimic an interrupted batch write.
+        sink._stream.write(b"\xff\xff\xff\xff\x10\x00")
+        sink._stream.flush()
+
+        df = read_ledger(path)
+        self.assertEqual(df['ticket'].tolist(), [0, 1, 2, 3])
+
+    def test_trade_manager_streams_to_sink(self):
+        path = os.path.join(self.tmp.name, "ledger")
+        sink = LedgerSink(path, batch_size=2)
+        tm = TradeManager(RiskCalculator(RiskConfig()), ledger_sink=sink)
+        t0 = pd.Timestamp("2020-01-01")
+        tm.positions = [
+            Position(ticket=i, symbol="TESTUSDT", direction="BULLISH", entry_price=100.0, sl=90.0,
+                     tp=110.0 + 10 * i, size=1.0, open_time=t0, comment="", zone_id=i)
+            for i in (1, 2, 3)
+        ]
+        closed = tm.manage_positions(low=99.0, high=135.0, current_price=120.0, current_time=t0)  # TP of 1 and 2
+        self.assertEqual([t.ticket for t in closed], [1, 2])
+        tm.force_close_all(120.0, t0 + pd.Timedelta(hours=1))
+        sink.close()
+        self.assertEqual(tm.ledger, [])
+        df = read_ledger(path)
+        self.assertEqual(df['ticket'].tolist(), [1, 2, 3])
+        self.assertEqual(df['reason'].tolist(), ["Take Profit", "Take Profit", "Forced Close (End of Sim)"])
+
+    def test_new_run_replaces_previous_ledger(self):
+        path = os.path.join(self.tmp.name, "ledger")
+        ledgers = []
+        for _ in range(2):
+            bt = make_backtester(ledger_path=path, ledger_batch_size=2)
+            quiet(bt.run_detection_pipeline)
+            quiet(bt.run_simulation)
+            ledgers.append(bt.get_ledger())
+        self.assertGreater(len(ledgers[0]), 2)
+        pd.testing.assert_frame_equal(ledgers[1], ledgers[0])
+
+    def test_resumed_sink_writes_only_after_rewind(self):
+        path = os.path.join(self.tmp.name, "ledger")
+        with LedgerSink(path, batch_size=2) as sink:
+            sink.extend([_trade(i) for i in range(4)])
+            offset = sink.offset()
+            sink.extend([_trade(i) for i in range(4, 8)])
+
+        resumed = LedgerSink(path, batch_size=2, resume=True)
+        with self.assertRaises(ValueError):
+            resumed.offset()
+        resumed.rewind(offset)
+        resumed.extend([_trade(i) for i in range(10, 12)])
+        resumed.close()
+        self.assertEqual(read_ledger(path)['ticket'].tolist(), [0, 1, 2, 3, 10, 11])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from simulation.montecarlo import MonteCarloConfig, StepHistogram, path_metrics, resample_indices, run_monte_carlo
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.pnl = rng.normal(40.0, 300.0, 120)
+
+    def test_reproducible_across_processes(self):
+        cfg = MonteCarloConfig(iterations=1000, chunk_size=256, seed=11, resample='block', sample_paths=10)
+        serial = run_monte_carlo(self.pnl, cfg, processes=1)
+        pooled = run_monte_carlo(self.pnl, cfg, processes=2)
+        np.testing.assert_array_equal(serial.cagr, pooled.cagr)
+        np.testing.assert_array_equal(serial.max_dd, pooled.max_dd)
+        np.testing.assert_array_equal(serial.paths, pooled.paths)
+        for p in cfg.fan_quantiles:
+            np.testing.assert_array_equal(serial.bands[p], pooled.bands[p])
+        self.assertEqual(serial.paths.shape, (10, len(self.pnl) + 1))
+        other = run_monte_carlo(self.pnl, MonteCarloConfig(iterations=1000, chunk_size=256, seed=12), processes=1)
+        self.assertFalse(np.array_equal(serial.cagr, other.cagr))
+
+    def test_metrics_match_single_path(self):
+        sims = np.vstack([self.pnl, -np.abs(self.pnl) * 5])
+        cagr, max_dd, final = path_metrics(sims, 10000.0, 3.0)
+        for k, row in enumerate(sims):
+            equity = np.concatenate([[10000.0], 10000.0 + np.cumsum(row)])
+            peak = np.maximum.accumulate(equity)
+            self.assertAlmostEqual(max_dd[k], np.min((equity - peak) / peak))
+            self.assertAlmostEqual(final[k], equity[-1])
+        self.assertAlmostEqual(cagr[0], (final[0] / 10000.0) ** (1 / 3.0) - 1)
+        self.assertEqual(cagr[1], -1.0)
+
+    def test_bands_match_exact_quantiles(self):
+        cfg = MonteCarloConfig(iterations=3000, chunk_size=500, seed=3)
+        result = run_monte_carlo(self.pnl, cfg, processes=1)
+        spread = np.percentile(result.final_equity, 95) - np.percentile(result.final_equity, 5)
+        for p in cfg.fan_quantiles:
+            self.assertAlmostEqual(result.bands[p][-1], np.quantile(result.final_equity, p), delta=0.01 * spread)
+            self.assertEqual(result.bands[p][0], cfg.initial_capital)
+        self.assertTrue((result.bands[0.05] <= result.bands[0.5]).all())
+        self.assertTrue((result.bands[0.5] <= result.bands[0.95]).all())
+
+    def test_histogram_merge(self):
+        rng = np.random.default_rng(1)
+        rows = rng.normal(0.0, 1.0, (4000, 3))
+        whole = StepHistogram.from_sample(rows[:500], bins=256)
+        part = whole.empty_like()
+        whole.update(rows)
+        part.update(rows[:1000])
+        rest = part.empty_like()
+        rest.update(rows[1000:])
+        part.merge(rest)
+        np.testing.assert_array_equal(whole.counts, part.counts)
+        self.assertEqual(whole.count, 4000)
+        exact = np.quantile(rows, 0.25, axis=0)
+        np.testing.assert_allclose(whole.quantiles([0.25])[0.25], exact, atol=0.05)
+        with self.assertRaises(ValueError):
+            whole.merge(StepHistogram.from_sample(rows[:10], bins=256))
+
+    def test_resample_modes(self):
+        rng = np.random.default_rng(0)
+        perm = resample_indices(rng, 50, 30, 'permutation')
+        self.assertTrue((np.sort(perm, axis=1) == np.arange(30)).all())
+
+        block = resample_indices(rng, 50, 30, 'block', mean_block=1e9)
+        # An infinitely long mean block is one wrapped run per path
+        self.assertTrue((np.diff(block, axis=1) % 30 == 1).all())
+        short = resample_indices(rng, 200, 30, 'block', mean_block=4.0)
+        runs = (np.diff(short, axis=1) % 30 == 1).mean()
+        self.assertAlmostEqual(runs, 0.75, delta=0.05)
+        with self.assertRaises(ValueError):
+            resample_indices(rng, 1, 3, 'jackknife')
+
+
+if __name__ == '__main__':
+    unittest.main()
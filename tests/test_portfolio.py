@@ -0,0 +1,93 @@
+import copy
+import unittest
+import numpy as np
+import pandas as pd
+from core.detectors.b2b_engine import detect_b2b_zones
+from core.detectors.swing_points import detect_swings
+from core.detectors.zone_status import ZoneStatusBatch, update_active_zones
+from core.risk.sizing import SymbolParams
+from simulation.engine.portfolio_backtester import PortfolioBacktester, PortfolioConfig
+from tests.synthetic import make_backtester, make_market, quiet
+
+
+def make_portfolio(markets: dict, **cfg) -> PortfolioBacktester:
+    pf = PortfolioBacktester(PortfolioConfig(
+        symbols=list(markets), start_date="2019-02-01", end_date="2019-03-31", **cfg
+    ))
+    for sym, data in markets.items():
+        pf.books[sym].data = data
+    quiet(pf.run_detection_pipeline)
+    quiet(pf.run_simulation)
+    return pf
+
+
+class TestPortfolioBacktester(unittest.TestCase):
+    def test_single_symbol_matches_backtester(self):
+        bt = make_backtester()
+        quiet(bt.run_detection_pipeline)
+        quiet(bt.run_simulation)
+
+        pf = make_portfolio({"BTCUSDT": make_market(90)})
+        self.assertGreater(len(pf.get_ledger()), 0)
+        pd.testing.assert_frame_equal(pf.get_ledger(), bt.get_ledger())
+        self.assertEqual(pf.trade_manager.equity_history, bt.trade_manager.equity_history)
+
+    def test_shared_book_on_merged_clock(self):
+        eth = make_market(90, seed=11, start="2019-01-10")
+        eth['M30'] = eth['M30'].drop(eth['M30'].index[3000:3100]) # Exchange outage
+        markets = {"BTCUSDT": make_market(90), "ETHUSDT": eth}
+        params = {"ETHUSDT": SymbolParams(sl_buffer=20.0)}
+        pf = make_portfolio(markets, symbol_params=params, max_concurrent=4, initial_balance=25000.0)
+
+        self.assertIs(pf.risk_calc.symbols["ETHUSDT"], params["ETHUSDT"])
+        ledger = pf.get_ledger()
+        self.assertEqual(set(ledger['symbol']), {"BTCUSDT", "ETHUSDT"})
+        self.assertEqual(ledger['ticket'].nunique(), len(ledger))
+
+        equity = pf.get_equity()
+        self.assertEqual(len(equity), len(pf.clock))
+        self.assertTrue(equity.index.is_monotonic_increasing)
+        self.assertAlmostEqual(pf.trade_manager.account_balance, 25000.0 + ledger['pnl'].sum(), places=6)
+
+        # Portfolio-wide concurrency cap
+        opens = ledger['open_time'].values
+        closes = ledger['close_time'].values
+        for t in pf.clock.values[::50]:
+            self.assertLessEqual(int(np.sum((opens <= t) & (closes > t))), 4)
+
+
+    def test_batched_zone_status_matches_serial(self):
+        frames = [make_market(60, seed=seed)['H1'].reset_index() for seed in (3, 4, 5)]
+        books = [detect_b2b_zones(df, detect_swings(df), tf='H1') for df in frames]
+        serial = copy.deepcopy(books)
+        admitted = [0] * len(books)
+        batch = ZoneStatusBatch()
+        times = frames[0]['time']
+        for t in range(len(times)):
+            now = times[t]
+            due = np.array([t % 3 != s for s in range(3)]) # Each symbol skips every third tick
+            prices = np.array([[df['low'][t], df['high'][t], df['close'][t]] for df in frames])
+            expected = {}
+            for s in np.flatnonzero(due):
+                n = admitted[s]
+                while admitted[s] < len(books[s]) and books[s][admitted[s]].zone_created_time <= now:
+                    admitted[s] += 1
+                batch.add(s, 0, [z for z in books[s][n:admitted[s]] if z.is_valid])
+
+                active = [z for z in serial[s][:admitted[s]] if z.is_valid]
+                before = [z.touch_count for z in active]
+                update_active_zones(*prices[s], now, active)
+                moved = [z.zone_id for z, c in zip(active, before) if z.touch_count != c]
+                if moved:
+                    expected[s] = moved
+            touched, _ = batch.update(due, prices[:, 0], prices[:, 1], prices[:, 2], now)
+            self.assertEqual({s: [z.zone_id for z in zones] for s, zones in touched.items()}, expected)
+        batch.flush_ages()
+
+        for zones, reference in zip(books, serial):
+            self.assertEqual([z.as_dict() for z in zones], [z.as_dict() for z in reference])
+        self.assertTrue(any(z.L2_touched for zones in books for z in zones))
+        self.assertTrue(any(z.is_invalidated for zones in books for z in zones))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import time
+import unittest
+import numpy as np
+import pandas as pd
+from data.quality import audit, repair, summarize
+from tests.synthetic import make_market
+
+
+class TestQuality(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = make_market(120, start="2019-12-01")
+
+    def test_clean_series_has_no_issues(self):
+        for tf, df in self.data.items():
+            issues = audit(df, tf, seam=None)
+            self.assertEqual(len(issues), 0, f"{tf}: {issues}")
+
+    def test_detects_each_issue_kind(self):
+        df = self.data['M30'].copy()
+        df = df.drop(df.index[100:148])                     # One missing day
+        df.iloc[300, df.columns.get_loc('high')] = df['open'].iloc[300] - 50
+        df.iloc[400:403, df.columns.get_loc('volume')] = 0.0
+        df.iloc[500, :4] *= 1.5                             # Spike up, then back down
+        df = pd.concat([df, df.iloc[[600]]]).sort_index(kind='stable')
+        df.iloc[700, df.columns.get_loc('low')] = np.nan
+
+        issues = audit(df, 'M30', seam=None)
+        counts = summarize(issues)
+        self.assertEqual(counts['gap'], 48)
+        self.assertEqual(counts['ohlc'], 1)
+        self.assertEqual(counts['zero_volume'], 3)
+        self.assertEqual(counts['duplicate'], 1)
+        self.assertEqual(counts['nan'], 1)
+        self.assertEqual(counts['outlier'], 2)
+        gap = issues[issues['kind'] == 'gap'].iloc[0]
+        self.assertEqual((gap['start'], gap['end']), (self.data['M30'].index[100], self.data['M30'].index[147]))
+
+        shuffled = df.iloc[::-1]
+        self.assertIn('non_monotonic', summarize(audit(shuffled, 'M30', seam=None)))
+        off = self.data['H1'].copy()
+        off.index = off.index + pd.Timedelta(minutes=5)
+        self.assertEqual(summarize(audit(off, 'H1', seam=None))['off_grid'], len(off))
+
+    def test_calendar_gaps_and_seam(self):
+        mn1 = self.data['MN1'].drop(pd.Timestamp('2020-01-01'))
+        gap = audit(mn1, 'MN1', seam=None).iloc[0]
+        self.assertEqual((gap['kind'], gap['start'], gap['bars']), ('gap', pd.Timestamp('2020-01-01'), 1))
+
+        d1 = self.data['D1'].copy()
+        d1.loc[d1.index >= '2020-01-01', ['open', 'high', 'low', 'close']] *= 1.03  # Futures premium
+        issues = audit(d1, 'D1')
+        self.assertEqual(list(issues['kind']), ['seam'])
+        self.assertEqual(issues['end'].iloc[0], pd.Timestamp('2020-01-01'))
+        self.assertAlmostEqual(issues['value'].iloc[0],
+                               d1['open'].loc['2020-01-01'] / d1['close'].loc['2019-12-31'] - 1)
+
+    def test_repair(self):
+        df = self.data['H1'].copy()
+        df = df.drop(df.index[10:13])
+        df.iloc[20, df.columns.get_loc('low')] = df['close'].iloc[20] + 10
+        df = pd.concat([df, df.iloc[[30]] * 1.01])
+        frame = df.reset_index()
+
+        fixed, issues = repair(frame, 'H1')
+        self.assertEqual(set(summarize(issues)), {'gap', 'ohlc', 'duplicate', 'non_monotonic'})
+        self.assertEqual(set(summarize(audit(fixed, 'H1', seam=None))), {'gap'})
+        self.assertAlmostEqual(fixed['close'].iloc[30], self.data['H1']['close'].iloc[33] * 1.01)  # Last download wins
+
+        marked, _ = repair(frame, 'H1', gaps='mark')
+        self.assertEqual(len(marked), len(self.data['H1']))
+        self.assertEqual(int(marked['gap'].sum()), 3)
+        self.assertTrue(marked.loc[marked['gap'], 'close'].isna().all())
+
+        filled, _ = repair(frame, 'H1', gaps='ffill')
+        bars = filled.loc[filled['gap']]
+        self.assertTrue((bars['open'] == filled['close'].iloc[9]).all())
+        self.assertTrue((bars['volume'] == 0).all())
+        self.assertEqual(set(summarize(audit(filled, 'H1', seam=None))), {'zero_volume'})
+        with self.assertRaises(ValueError):
+            repair(frame, 'H1', gaps='interpolate')
+
+    def test_million_bars_speed(self):
+        n = 1_000_000
+        rng = np.random.default_rng(0)
+        close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+        open_ = np.r_[close[0], close[:-1]]
+        df = pd.DataFrame({'open': open_, 'high': np.maximum(open_, close) * 1.001,
+                           'low': np.minimum(open_, close) * 0.999, 'close': close, 'volume': 1.0},
+                          index=pd.date_range('2000-01-01', periods=n, freq='30min', name='time'))
+        audit(df, 'M30')
+        t0 = time.perf_counter()
+        issues = audit(df, 'M30')
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        self.assertEqual(len(issues), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
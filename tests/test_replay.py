@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from core.risk.sizing import SymbolParams
+from simulation.engine.replay import replay_execution, replay_sweep
+from simulation.engine.signal_tape import SignalTape
+from tests.synthetic import make_backtester, quiet
+
+
+class TestSignalTapeReplay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.bt = make_backtester()
+        quiet(cls.bt.run_detection_pipeline)
+        cls.tape = quiet(cls.bt.record_signal_tape)
+
+    def test_replay_matches_trade_manager(self):
+        """Default risk settings must reproduce the simulated ledger exactly."""
+        result = replay_execution(self.tape)
+        expected = self.bt.get_ledger()
+        self.assertGreater(len(expected), 0)
+        pd.testing.assert_frame_equal(result.to_frame(), expected, check_dtype=False)
+        self.assertEqual(result.final_balance, self.bt.trade_manager.account_balance)
+
+        equity = np.array([e['equity'] for e in self.bt.trade_manager.equity_history])
+        np.testing.assert_allclose(result.equity, equity, rtol=0, atol=1e-6)
+
+    def test_balance_and_position_cap_reach_the_engine(self):
+        bt = make_backtester(initial_balance=25000.0, max_open_positions=1)
+        quiet(bt.run_detection_pipeline)
+        tape = quiet(bt.record_signal_tape)
+        result = replay_execution(tape, initial_balance=25000.0, max_concurrent=1)
+        pd.testing.assert_frame_equal(result.to_frame(), bt.get_ledger(), check_dtype=False)
+        self.assertEqual(result.final_balance, bt.trade_manager.account_balance)
+        self.assertLess(len(result.trades), len(self.bt.get_ledger()))
+
+    def test_tape_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tape.npz")
+            self.tape.save(path)
+            loaded = SignalTape.load(path)
+        self.assertEqual(loaded.symbol, self.tape.symbol)
+        np.testing.assert_array_equal(loaded.bar, self.tape.bar)
+        np.testing.assert_array_equal(loaded.zone_id, self.tape.zone_id)
+        pd.testing.assert_frame_equal(
+            replay_execution(loaded).to_frame(), replay_execution(self.tape).to_frame()
+        )
+
+    def test_sweep_rows(self):
+        grid = [{'sl_buffer': s, 'base_risk_pct': r} for s in (100.0, 200.0) for r in (0.005, 0.01)]
+        table = replay_sweep(self.tape, grid, processes=1)
+        self.assertEqual(len(table), 4)
+        self.assertTrue({'cagr', 'max_dd_pct', 'sharpe', 'trades'} <= set(table.columns))
+
+        # Grid point equal to the defaults reproduces the default replay
+        default = replay_execution(self.tape)
+        row = table[(table.sl_buffer == 200.0) & (table.base_risk_pct == 0.01)].iloc[0]
+        self.assertAlmostEqual(row['final_balance'], default.final_balance)
+
+    def test_excursions_are_bar_exact(self):
+        ledger = self.bt.get_ledger()
+        driver = self.bt.data[self.bt.cfg.timeframes[-1]][self.bt.cfg.start_date:self.bt.cfg.end_date]
+        self.assertGreater(ledger['mfe_points'].sum(), 0)
+        for t in ledger.itertuples():
+            bars = driver[t.open_time:t.close_time]
+            hi, lo = bars['high'].max(), bars['low'].min()
+            if t.direction == 'BULLISH':
+                mfe, mae = hi - t.entry_price, t.entry_price - lo
+            else:
+                mfe, mae = t.entry_price - lo, hi - t.entry_price
+            self.assertEqual(t.mfe_points, max(mfe, 0.0))
+            self.assertEqual(t.mae_points, max(mae, 0.0))
+            self.assertAlmostEqual(t.max_adverse_excursion, t.mae_points * t.size)
+
+    def test_concurrency_cap(self):
+        capped = replay_execution(self.tape, SymbolParams(sl_buffer=200.0), max_concurrent=1)
+        spans = sorted((t.open_time, t.close_time) for t in capped.trades)
+        for (o1, c1), (o2, _) in zip(spans, spans[1:]):
+            self.assertGreaterEqual(o2, c1)
+
+
+if __name__ == '__main__':
+    unittest.main()
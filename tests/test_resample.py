@@ -0,0 +1,107 @@
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data.resample import Resampler, bucket_starts, resample_frames
+from data.store import OHLCVStore
+from data.updater import IncrementalUpdater, SeamError
+from tests.synthetic import make_market
+
+
+class TestResample(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Starts on a Thursday mid-month so W1 and MN1 have partial edges
+        cls.data = make_market(120, start="2019-01-17")
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = OHLCVStore(self.root, row_group_size=256)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_matches_pandas_bar_open_resample(self):
+        out = resample_frames(self.data['M30'], 'M30', ['H1', 'H4', 'D1', 'W1', 'MN1'], complete_only=False)
+        for tf in out:
+            pd.testing.assert_frame_equal(out[tf], self.data[tf], check_freq=False,
+                                          check_index_type=False, check_dtype=False)
+
+    def test_complete_buckets_only(self):
+        m30 = self.data['M30'].iloc[:-5]  # Last day ends at 21:00
+        out = resample_frames(m30, 'M30')
+        self.assertEqual(out['H4'].index[-1], m30.index[-1].floor('4h') - pd.Timedelta(hours=4))
+        self.assertEqual(out['D1'].index[-1], m30.index[-1].normalize() - pd.Timedelta(days=1))
+        self.assertEqual(list(out['MN1'].index), [pd.Timestamp('2019-01-01'), pd.Timestamp('2019-02-01'),
+                                                  pd.Timestamp('2019-03-01'), pd.Timestamp('2019-04-01')])
+        self.assertTrue((out['W1'].index.dayofweek == 0).all())
+        with self.assertRaises(ValueError):
+            resample_frames(m30, 'M30', ['M15'])
+
+    def test_bucket_starts_calendar(self):
+        times = pd.DatetimeIndex(['2024-02-29 23:59', '2024-03-04 00:00', '2024-03-03 12:00']).to_numpy()
+        self.assertEqual(list(bucket_starts(times, 'MN1').astype('datetime64[ns]')),
+                         list(pd.DatetimeIndex(['2024-02-01', '2024-03-01', '2024-03-01']).to_numpy()))
+        self.assertEqual(list(bucket_starts(times, 'W1').astype('datetime64[ns]')),
+                         list(pd.DatetimeIndex(['2024-02-26', '2024-03-04', '2024-02-26']).to_numpy()))
+
+    def test_incremental_extend_equals_rebuild(self):
+        m30 = self.data['M30']
+        cut = m30.index.searchsorted(pd.Timestamp('2019-03-13 13:30'))
+        self.store.write('BTCUSDT', 'M30', m30.iloc[:cut])
+        resampler = Resampler(self.store, 'M30')
+        first = {r.tf: r.rows for r in resampler.extend('BTCUSDT')}
+        self.assertEqual(set(first), {'H1', 'H4', 'D1', 'W1', 'MN1'})
+
+        # Nothing new: nothing appended
+        self.assertTrue(all(r.rows == 0 for r in resampler.extend('BTCUSDT')))
+
+        for lo, hi in [(cut, cut + 7), (cut + 7, cut + 1000), (cut + 1000, len(m30))]:
+            self.store.append('BTCUSDT', 'M30', m30.iloc[lo:hi])
+            resampler.extend('BTCUSDT')
+
+        full = resample_frames(m30, 'M30')
+        for tf, expected in full.items():
+            stored = self.store.read('BTCUSDT', tf)
+            pd.testing.assert_frame_equal(stored, expected, check_freq=False, check_index_type=False)
+            self.assertGreater(len(self.store.files('BTCUSDT', tf)), 1 if tf != 'MN1' else 0)
+
+        rebuilt = Resampler(OHLCVStore(self.root), 'M30', ['D1']).rebuild('BTCUSDT')
+        self.assertEqual(rebuilt[0].rows, len(full['D1']))
+        self.assertEqual(len(self.store.files('BTCUSDT', 'D1')), 1)
+
+    def test_extend_refuses_gaps(self):
+        m30 = self.data['M30']
+        self.store.write('BTCUSDT', 'M30', m30.iloc[:480])
+        resampler = Resampler(self.store, 'M30', ['D1'])
+        resampler.extend('BTCUSDT')
+        # A missing day in the base leaves a hole in D1
+        self.store.append('BTCUSDT', 'M30', m30.iloc[528:700])
+        with self.assertRaises(SeamError):
+            resampler.extend('BTCUSDT')
+        self.assertEqual(resampler.extend('BTCUSDT', allow_gaps=True)[0].rows, 3)
+        self.assertTrue(np.isfinite(self.store.read('BTCUSDT', 'D1')['close']).all())
+
+    def test_targets_keep_the_base_layout(self):
+        # Fetched bars carry the epoch-ms open next to `time`
+        m30 = self.data['M30'].reset_index()
+        m30.insert(0, 'timestamp', m30['time'].astype('datetime64[ms]').astype('int64'))
+        h4 = resample_frames(self.data['M30'], 'M30', ['H4'])['H4'].reset_index()
+        h4.insert(0, 'timestamp', h4['time'].astype('datetime64[ms]').astype('int64'))
+        cut = pd.Timestamp('2019-03-01')
+        self.store.write('BTCUSDT', 'M30', m30[m30['time'] < cut])
+        Resampler(self.store, 'M30', ['H4']).rebuild('BTCUSDT')
+        self.assertEqual(self.store.schema('BTCUSDT', 'H4').names, self.store.schema('BTCUSDT', 'M30').names)
+
+        updater = IncrementalUpdater(self.store, lambda symbol, tf, since: h4[h4['time'] >= since])
+        result = updater.update('BTCUSDT', 'H4', now=pd.Timestamp('2019-03-10'))
+        self.assertEqual(result.last, pd.Timestamp('2019-03-09 20:00'))
+        stored = self.store.read('BTCUSDT', 'H4')
+        expected = h4[h4['time'] < pd.Timestamp('2019-03-10')].set_index('time')
+        pd.testing.assert_frame_equal(stored, expected, check_freq=False, check_index_type=False,
+                                      check_dtype=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
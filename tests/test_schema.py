@@ -0,0 +1,85 @@
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from core.detectors.b2b_engine import detect_b2b_zones
+from core.detectors.breakouts import detect_breakouts
+from core.detectors.swing_points import detect_swings
+from data.arena import MarketDataArena, attach_frames
+from data.schema import compact_frame
+from data.store import OHLCVStore
+from tests.synthetic import make_backtester, make_market, quiet
+
+
+class TestSchema(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = make_market(60)
+
+    def test_compact_frame(self):
+        legacy = self.data['H1'].reset_index()
+        legacy['timestamp'] = (legacy['time'] - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+        legacy['time'] = legacy['time'].astype('datetime64[us]')
+        legacy['symbol'] = 'BTCUSDT'
+
+        df = compact_frame(legacy)
+        self.assertEqual(df.index.dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(list(df.columns), ['open', 'high', 'low', 'close', 'volume'])
+        pd.testing.assert_frame_equal(df, self.data['H1'], check_freq=False, check_index_type=False)
+
+        small = compact_frame(legacy, 'float32')
+        self.assertTrue((small.dtypes == np.float32).all())
+        n = len(legacy)
+        self.assertEqual(df.memory_usage(deep=True).sum(), n * (8 + 5 * 8))
+        self.assertEqual(small.memory_usage(deep=True).sum(), n * (8 + 5 * 4))
+        np.testing.assert_allclose(small['close'], df['close'], rtol=1e-6)
+        with self.assertRaises(ValueError):
+            compact_frame(legacy, 'float16')
+
+    def test_arena_keeps_float32(self):
+        small = compact_frame(self.data['M30'], 'float32')
+        with MarketDataArena() as arena:
+            block = arena.add("BTCUSDT", 'M30', small)
+            self.assertEqual(block.dtype, 'float32')
+            self.assertEqual(arena.nbytes, len(small) * (8 + 4 * 5))
+            frames, handles = attach_frames({'M30': block})
+            pd.testing.assert_frame_equal(frames['M30'], small, check_freq=False)
+            del frames
+            for h in handles:
+                h.close()
+
+    def test_detectors_emit_datetimes(self):
+        df = self.data['H4'].reset_index()
+        swings = detect_swings(df)
+        self.assertTrue(swings)
+        bar_times = set(df['time'])
+        for s in swings:
+            self.assertIs(type(s.time), datetime)
+            self.assertIn(pd.Timestamp(s.time), bar_times)
+        for b in detect_breakouts(df, detect_swings(df)):
+            self.assertIs(type(b.breakout_bar_time), datetime)
+            self.assertEqual(pd.Timestamp(b.breakout_bar_time), df['time'].iloc[b.breakout_bar_index])
+        for z in detect_b2b_zones(df, swings, tf='H4'):
+            self.assertIs(type(z.zone_created_time), datetime)
+
+    def test_backtester_loads_compact_frames(self):
+        root = tempfile.mkdtemp()
+        try:
+            store = OHLCVStore(root)
+            for tf, df in self.data.items():
+                store.write('BTCUSDT', tf, df)
+            bt = make_backtester(store_path=root, price_dtype='float32')
+            bt.data = {}
+            quiet(bt.load_data)
+            self.assertEqual(set(bt.data), set(self.data))
+            for df in bt.data.values():
+                self.assertTrue((df.dtypes == np.float32).all())
+                self.assertEqual(df.index.dtype, np.dtype('datetime64[ns]'))
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import copy
+import unittest
+import numpy as np
+import pandas as pd
+from core.detectors.zone_status import replay_zone_statuses
+from core.system.price_index import PriceRangeIndex
+from simulation.engine.sharded import plan_shards, run_sharded
+from tests.synthetic import make_backtester, quiet
+
+STATUS = ['L1_touched', 'fifty_touched', 'L2_touched', 'L1_touch_time', 'fifty_touch_time', 'L2_touch_time',
+          'touch_count', 'is_valid', 'is_invalidated', 'invalidation_time', 'zone_age_bars']
+
+
+class TestShardedRun(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.serial = make_backtester(120, end_date="2019-04-30")
+        quiet(cls.serial.run_detection_pipeline)
+        cls.detected = copy.deepcopy(cls.serial.zones)
+        quiet(cls.serial.run_simulation, record_tape=True)
+
+    def fresh(self):
+        bt = make_backtester(120, end_date="2019-04-30")
+        bt.zones = copy.deepcopy(self.detected)
+        return bt
+
+    def test_replay_zone_statuses_matches_bar_loop(self):
+        zones = copy.deepcopy(self.detected)
+        sim = self.serial.data['M30']["2019-02-01":"2019-04-30"]
+        close = sim['close'].to_numpy()
+        wicks = PriceRangeIndex(sim['high'].to_numpy(), sim['low'].to_numpy())
+        for tf in zones:
+            replay_zone_statuses(zones[tf], sim.index, wicks, PriceRangeIndex(close, close), len(sim))
+            for got, want in zip(zones[tf], self.serial.zones[tf]):
+                self.assertEqual([getattr(got, f) for f in STATUS], [getattr(want, f) for f in STATUS])
+
+    def test_plan_shards(self):
+        plan = plan_shards(1000, 4, 100)
+        self.assertEqual(plan[0], (0, 0, 250))
+        self.assertEqual(plan[1], (150, 250, 500))
+        self.assertEqual(plan[-1][2], 1000)
+
+    def test_stitched_run_matches_serial(self):
+        expected = self.serial.get_ledger()
+        self.assertGreater(len(expected), 0)
+        for warmup, processes in ((1200, 2), (1, 1)):
+            run = quiet(run_sharded, self.fresh(), 3, warmup, processes=processes)
+            pd.testing.assert_frame_equal(run.result.to_frame(), expected, check_dtype=False)
+            np.testing.assert_array_equal(run.tape.bar, self.serial.signal_tape.bar)
+            np.testing.assert_array_equal(run.tape.zone_id, self.serial.signal_tape.zone_id)
+            self.assertEqual(len(run.shards), 3)
+            if warmup == 1:
+                # One bar of overlap cannot settle the flow state: stitched by serial re-runs
+                self.assertTrue(run.shards['rerun'].iloc[1:].all())
+            else:
+                self.assertFalse(run.shards['rerun'].iloc[1:].all())
+
+
+if __name__ == '__main__':
+    unittest.main()
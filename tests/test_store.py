@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from data.store import OHLCVStore
+from simulation.engine.vectorized_backtester import VectorizedBacktester, BacktestConfig
+from tests.synthetic import make_market, quiet
+
+
+class TestStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = make_market(500, start="2019-06-01")  # Spans 2019-2020
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = OHLCVStore(self.tmp.name)
+        for tf, df in self.data.items():
+            self.store.write("BTCUSDT", tf, df)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_layout_and_bounds(self):
+        self.assertEqual(self.store.symbols(), ["BTCUSDT"])
+        self.assertEqual(sorted(self.store.timeframes("BTCUSDT")), sorted(self.data))
+        self.assertTrue(os.path.isdir(os.path.join(self.tmp.name, "symbol=BTCUSDT", "tf=M30", "year=2020")))
+        m30 = self.data['M30']
+        self.assertEqual(self.store.bounds("BTCUSDT", "M30"), (m30.index[0], m30.index[-1]))
+        self.assertIsNone(self.store.bounds("ETHUSDT", "M30"))
+
+    def test_range_read_prunes_row_groups(self):
+        m30 = self.data['M30']
+        full = self.store.plan("BTCUSDT", "M30")
+        window = self.store.plan("BTCUSDT", "M30", "2020-03-01", "2020-03-14")
+        self.assertGreater(full.row_groups, 8)
+        self.assertLessEqual(window.row_groups, 2)
+        self.assertTrue(all("year=2020" in path for path, _ in window.files))
+
+        df = self.store.read("BTCUSDT", "M30", "2020-03-01", "2020-03-14")
+        pd.testing.assert_frame_equal(df, m30["2020-03-01":"2020-03-14"], check_freq=False, check_dtype=False,
+                                      check_index_type=False)
+        closes = self.store.read("BTCUSDT", "M30", "2019-12-31 12:00", "2020-01-01 12:00", columns=['close'])
+        self.assertEqual(list(closes.columns), ['close'])
+        self.assertEqual(len(closes), 49)  # Crosses the year partition boundary
+
+    def test_load_data_from_store(self):
+        cfg = BacktestConfig(start_date="2020-03-01", end_date="2020-03-14", store_path=self.tmp.name)
+        full = VectorizedBacktester(cfg)
+        quiet(full.load_data)
+        for tf, df in self.data.items():
+            pd.testing.assert_frame_equal(full.data[tf], df, check_freq=False, check_dtype=False,
+                                          check_index_type=False)
+
+        windowed = VectorizedBacktester(BacktestConfig(start_date="2020-03-01", end_date="2020-03-14",
+                                                       store_path=self.tmp.name, history_start="2020-01-01"))
+        quiet(windowed.load_data)
+        self.assertEqual(windowed.data['M30'].index[0], pd.Timestamp("2020-01-01"))
+        self.assertEqual(windowed.data['M30'].index[-1], pd.Timestamp("2020-03-14 23:30"))
+
+
+if __name__ == '__main__':
+    unittest.main()
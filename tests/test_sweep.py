@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+import pandas as pd
+from core.models.structures import DetectionConfig
+from simulation.engine.replay import replay_execution, summarize_replay
+from simulation.engine.vectorized_backtester import BacktestConfig
+from simulation.sweep import expand_grid, group_points, run_sweep
+from tests.synthetic import make_backtester, make_market, quiet
+
+BASE = BacktestConfig(start_date="2019-02-01", end_date="2019-03-31")
+
+
+class TestSweep(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = make_market(90)
+
+    def test_grouping_dedupes_detection(self):
+        grid = expand_grid(swing_window=[3, 5], gasket_multiple=[2.0, 3.0], sl_buffer=[100.0, 200.0])
+        groups = group_points(grid)
+        self.assertEqual(len(groups), 2)
+        self.assertTrue(all(len(g) == 2 for g in groups.values()))
+        with self.assertRaises(ValueError):
+            group_points([{'not_a_param': 1}])
+
+    def test_sweep_matches_replay_and_resumes(self):
+        grid = expand_grid(gasket_multiple=[3.0], sl_buffer=[100.0, 200.0])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.csv")
+            table = quiet(run_sweep, self.data, grid, BASE, results_path=path, processes=2)
+            self.assertEqual(len(table), 2)
+            self.assertEqual(len(os.listdir(os.path.join(tmp, "tapes"))), 1)
+
+            # Default gasket + sl_buffer=200 is the plain backtest
+            bt = make_backtester()
+            tape = quiet(bt.record_signal_tape)
+            expected = summarize_replay(tape, replay_execution(tape))
+            row = table[table.sl_buffer == 200.0].iloc[0]
+            self.assertEqual(row['trades'], expected['trades'])
+            self.assertAlmostEqual(row['cagr'], expected['cagr'])
+
+            # Restart with one extra point: only the new point is computed
+            more = grid + [{'gasket_multiple': 3.0, 'sl_buffer': 300.0}]
+            table2 = quiet(run_sweep, self.data, more, BASE, results_path=path, processes=1)
+            self.assertEqual(len(table2), 3)
+            self.assertEqual(len(pd.read_csv(path)), 3)
+            pd.testing.assert_frame_equal(table2.iloc[:2], table)
+
+    def test_changed_base_config_is_not_resumed(self):
+        grid = expand_grid(gasket_multiple=[3.0], sl_buffer=[200.0])
+        shorter = BacktestConfig(start_date="2019-02-01", end_date="2019-03-10")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.csv")
+            full = quiet(run_sweep, self.data, grid, BASE, results_path=path, processes=1)
+            short = quiet(run_sweep, self.data, grid, shorter, results_path=path, processes=1)
+            self.assertEqual((len(full), len(short)), (1, 1))
+            self.assertEqual(full.iloc[0]['point_id'], short.iloc[0]['point_id'])
+            self.assertNotEqual(full.iloc[0]['base_id'], short.iloc[0]['base_id'])
+            self.assertEqual(len(pd.read_csv(path)), 2)
+            self.assertEqual(len(os.listdir(os.path.join(tmp, "tapes"))), 2)
+
+            # The shorter window matches its own plain backtest
+            bt = make_backtester(end_date="2019-03-10")
+            tape = quiet(bt.record_signal_tape)
+            self.assertEqual(short.iloc[0]['trades'], summarize_replay(tape, replay_execution(tape))['trades'])
+
+            # Rerunning the original window resumes from its own rows
+            again = quiet(run_sweep, self.data, grid, BASE, results_path=path, processes=1)
+            pd.testing.assert_frame_equal(again, full)
+            self.assertEqual(len(pd.read_csv(path)), 2)
+
+    def test_points_inherit_the_base_config(self):
+        grid = [{'sl_buffer': 200.0}]
+        base = replace(BASE, gasket_multiple=0.5, detection=DetectionConfig(swing_window=5),
+                       initial_balance=50000.0, max_open_positions=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.csv")
+            default = quiet(run_sweep, self.data, grid, BASE, results_path=path, processes=1)
+            row = quiet(run_sweep, self.data, grid, base, results_path=path, processes=1).iloc[0]
+            deeper = quiet(run_sweep, self.data, [{'sl_buffer': 200.0, 'min_age_bars': 12}], base,
+                           results_path=path, processes=1).iloc[0]
+
+        bt = make_backtester(gasket_multiple=0.5, detection=DetectionConfig(swing_window=5))
+        tape = quiet(bt.record_signal_tape)
+        expected = summarize_replay(tape, replay_execution(tape, initial_balance=50000.0, max_concurrent=1), 50000.0)
+        self.assertNotEqual(row['base_id'], default.iloc[0]['base_id'])
+        self.assertNotEqual(row['trades'], default.iloc[0]['trades'])
+        self.assertEqual(row['trades'], expected['trades'])
+        self.assertAlmostEqual(row['final_balance'], expected['final_balance'])
+
+        # Detection axes apply on top of base.detection
+        bt = make_backtester(gasket_multiple=0.5, detection=DetectionConfig(swing_window=5, min_age_bars=12))
+        tape = quiet(bt.record_signal_tape)
+        expected = summarize_replay(tape, replay_execution(tape, initial_balance=50000.0, max_concurrent=1), 50000.0)
+        self.assertEqual(deeper['trades'], expected['trades'])
+        self.assertAlmostEqual(deeper['final_balance'], expected['final_balance'])
+
+    def test_resume_with_new_axes_keeps_columns_aligned(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.csv")
+            first = quiet(run_sweep, self.data, [{'sl_buffer': 200.0}], BASE, results_path=path, processes=1)
+            both = quiet(run_sweep, self.data, [{'sl_buffer': 200.0}, {'base_risk_pct': 0.02}], BASE,
+                         results_path=path, processes=1)
+            stored = pd.read_csv(path)
+
+        self.assertEqual(list(stored.columns[:4]), ['point_id', 'base_id', 'base_risk_pct', 'sl_buffer'])
+        self.assertEqual(len(stored), 2)
+        self.assertEqual(stored['sl_buffer'].tolist()[0], 200.0)
+        self.assertTrue(pd.isna(stored['base_risk_pct'][0]) and pd.isna(stored['sl_buffer'][1]))
+        self.assertEqual(both.iloc[0]['trades'], first.iloc[0]['trades'])
+        self.assertEqual(both.iloc[1]['base_risk_pct'], 0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
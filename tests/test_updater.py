@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from data.store import OHLCVStore
+from data.updater import IncrementalUpdater, SeamError, check_seam
+from tests.synthetic import make_market
+
+
+class TestUpdater(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = make_market(60, start="2019-12-01")
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = OHLCVStore(self.tmp.name)
+        self.m30 = self.data['M30']
+        self.store.write("BTCUSDT", "M30", self.m30[:"2019-12-20"])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _source(self, frame, overlap=1):
+        def fetch(symbol, tf, since):
+            return frame[frame.index >= since - pd.Timedelta(minutes=30) * overlap]
+        return fetch
+
+    def test_appends_only_new_bars(self):
+        before = set(self.store.files("BTCUSDT", "M30"))
+        sizes = {f: os.path.getsize(f) for f in before}
+        updater = IncrementalUpdater(self.store, self._source(self.m30))
+        result = updater.update("BTCUSDT", "M30", now=pd.Timestamp("2020-01-10 12:10"))
+
+        # The bar opened at 12:00 is still open at 12:10
+        self.assertEqual(result.last, pd.Timestamp("2020-01-10 11:30"))
+        self.assertEqual(len(result.files), 2)  # Crosses into the 2020 partition
+        self.assertTrue(before <= set(self.store.files("BTCUSDT", "M30")))
+        self.assertTrue(all(os.path.getsize(f) == n for f, n in sizes.items()))
+        pd.testing.assert_frame_equal(self.store.read("BTCUSDT", "M30"), self.m30[:"2020-01-10 11:30"],
+                                      check_freq=False, check_dtype=False, check_index_type=False)
+
+        # Nothing new: no files
+        again = updater.update("BTCUSDT", "M30", now=pd.Timestamp("2020-01-10 12:10"))
+        self.assertEqual((again.rows, again.files), (0, []))
+
+    def test_seam_gap_is_rejected(self):
+        gapped = self.m30.drop(pd.Timestamp("2019-12-21 00:00"))
+        updater = IncrementalUpdater(self.store, self._source(gapped, overlap=0))
+        files = self.store.files("BTCUSDT", "M30")
+        with self.assertRaises(SeamError):
+            updater.update("BTCUSDT", "M30", now=pd.Timestamp("2020-02-01"))
+        self.assertEqual(self.store.files("BTCUSDT", "M30"), files)
+        self.assertFalse(any(f.endswith('.tmp') for _, _, fs in os.walk(self.tmp.name) for f in fs))
+
+        inner = self.m30.loc["2019-12-21"].drop(pd.Timestamp("2019-12-21 05:00")).reset_index()
+        with self.assertRaises(SeamError):
+            check_seam(pd.Timestamp("2019-12-20 23:30"), inner, "M30")
+
+    def test_monthly_seam(self):
+        mn1 = self.data['MN1'].reset_index()
+        check_seam(pd.Timestamp("2019-11-01"), mn1, "MN1")
+        with self.assertRaises(SeamError):
+            check_seam(pd.Timestamp("2019-10-01"), mn1, "MN1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+from data.vision import Archive, ChecksumError, VisionClient, read_kline_zip
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def _rows(start, periods, step='1D'):
+    times = pd.date_range(start, periods=periods, freq=step)
+    ms = (times - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+    close = 100 + np.arange(periods, dtype=float)
+    return [f"{t},{c - 1},{c + 2},{c - 2},{c},{10.5},{t + 86399999},0,0,0,0,0" for t, c in zip(ms, close)]
+
+
+class TestVision(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.www = os.path.join(self.root, "www")
+        server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_Handler, directory=self.www))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.server = server
+        self.base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.root)
+
+    def publish(self, archive, lines, header=False, corrupt=False):
+        body = ("open_time,open,high,low,close,volume,close_time,qv,count,tbv,tbqv,ignore\n" if header else "")
+        body += "\n".join(lines) + "\n"
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as z:
+            z.writestr(os.path.basename(archive.path).replace('.zip', '.csv'), body)
+        data = buf.getvalue()
+        path = os.path.join(self.www, archive.path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        digest = hashlib.sha256(b"x" if corrupt else data).hexdigest()
+        with open(path + ".CHECKSUM", 'w') as f:
+            f.write(f"{digest}  {os.path.basename(path)}\n")
+
+    def client(self):
+        return VisionClient(cache_dir=os.path.join(self.root, "cache"), base_url=self.base, workers=4, retries=0)
+
+    def test_monthly_daily_fallback_and_cache(self):
+        self.publish(Archive('spot', 'monthly', 'BTCUSDT', '1d', '2019-12'), _rows('2019-12-01', 31))
+        self.publish(Archive('um', 'monthly', 'BTCUSDT', '1d', '2020-01'), _rows('2020-01-01', 31), header=True)
+        # February only has daily archives (as the current month does)
+        for day in range(1, 4):
+            self.publish(Archive('um', 'daily', 'BTCUSDT', '1d', f"2020-02-{day:02d}"),
+                         _rows(f"2020-02-{day:02d}", 1))
+
+        with self.client() as client:
+            df = client.klines('BTCUSDT', '1d', '2019-12-01', '2020-02-15')
+            first_run = client.requests
+        self.assertEqual(len(df), 31 + 31 + 3)
+        self.assertEqual(df['timestamp'].dtype, np.int64)
+        self.assertEqual(df['close'].dtype, np.float64)
+        self.assertEqual(df['time'].iloc[0], pd.Timestamp('2019-12-01'))
+        self.assertEqual(df['time'].iloc[-1], pd.Timestamp('2020-02-03'))
+        self.assertTrue(df['time'].is_monotonic_increasing)
+
+        # Re-run: verified archives come from the cache; only the missing ones are asked for again
+        with self.client() as client:
+            again = client.klines('BTCUSDT', '1d', '2019-12-01', '2020-02-15')
+            self.assertEqual(client.requests, first_run - 2 * 2 - 3 * 2)
+        pd.testing.assert_frame_equal(again, df)
+
+    def test_checksum_mismatch_raises_and_caches_nothing(self):
+        archive = Archive('um', 'monthly', 'BTCUSDT', '1d', '2021-03')
+        self.publish(archive, _rows('2021-03-01', 31), corrupt=True)
+        with self.client() as client:
+            with self.assertRaises(ChecksumError):
+                client.fetch(archive)
+        objects = os.path.join(self.root, "cache", "objects")
+        self.assertEqual([f for _, _, files in os.walk(objects) for f in files], [])
+
+    def test_microsecond_timestamps(self):
+        archive = Archive('spot', 'monthly', 'BTCUSDT', '1d', '2025-01')
+        lines = [line.split(',', 1) for line in _rows('2025-01-01', 3)]
+        self.publish(archive, [f"{int(t) * 1000},{rest}" for t, rest in lines])
+        with self.client() as client:
+            df = read_kline_zip(client.fetch(archive))
+        self.assertEqual(list(df['time']), list(pd.date_range('2025-01-01', periods=3, freq='D')))
+
+
+if __name__ == '__main__':
+    unittest.main()
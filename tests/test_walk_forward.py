@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+from unittest import mock
+import numpy as np
+import pandas as pd
+from simulation.engine.replay import replay_execution, summarize_replay
+from simulation.engine.vectorized_backtester import BacktestConfig
+from simulation.sweep import expand_grid, make_windows, walk_forward
+from tests.synthetic import make_backtester, make_market, quiet
+
+
+class TestWalkForward(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = make_market(180)
+        cls.grid = expand_grid(sl_buffer=[100.0, 300.0], base_risk_pct=[0.01, 0.02])
+        cls.windows = make_windows("2019-03-01", "2019-06-29", train_months=2, test_months=1)
+
+    def test_make_windows(self):
+        self.assertEqual(len(self.windows), 2)
+        self.assertEqual(self.windows[0].test_end, self.windows[1].test_start)
+        anchored = make_windows("2019-01-01", "2019-12-31", train_months=3, test_months=3, anchored=True)
+        self.assertEqual({w.train_start for w in anchored}, {pd.Timestamp("2019-01-01")})
+        self.assertEqual(anchored[-1].test_end, pd.Timestamp("2019-12-31"))
+
+    def test_tape_window_slices_signals(self):
+        bt = make_backtester()
+        quiet(bt.run_detection_pipeline)
+        tape = quiet(bt.record_signal_tape)
+        whole = tape.window(tape.times[0], tape.times[-1] + np.timedelta64(1, 'ns'))
+        pd.testing.assert_frame_equal(replay_execution(whole).to_frame(), replay_execution(tape).to_frame())
+
+        part = tape.window(tape.times[100], tape.times[500])
+        self.assertEqual(part.n_bars, 400)
+        self.assertEqual(len(part), int(np.sum((tape.bar >= 100) & (tape.bar < 500))))
+        np.testing.assert_array_equal(part.times[part.bar], tape.times[tape.bar[(tape.bar >= 100) & (tape.bar < 500)]])
+
+    def test_parallel_matches_serial_and_stitches(self):
+        base = BacktestConfig()
+        with tempfile.TemporaryDirectory() as tmp:
+            serial = quiet(walk_forward, self.data, self.grid, self.windows, base,
+                           history_start="2019-01-15", work_dir=tmp, processes=1)
+            self.assertEqual(len(os.listdir(tmp)), 1)  # One tape: risk axes are replay-only
+            pooled = quiet(walk_forward, self.data, self.grid, self.windows, base,
+                           history_start="2019-01-15", work_dir=tmp, processes=2)
+
+        pd.testing.assert_frame_equal(serial.windows, pooled.windows)
+        pd.testing.assert_series_equal(serial.equity, pooled.equity)
+        self.assertEqual(len(serial.windows), 2)
+
+        equity = serial.equity
+        self.assertTrue(equity.index.is_monotonic_increasing)
+        self.assertGreaterEqual(equity.index[0], self.windows[0].test_start)
+        self.assertLess(equity.index[-1], self.windows[-1].test_end)
+        # Second segment starts from the first segment's final equity
+        seam = equity.index.searchsorted(self.windows[1].test_start)
+        first_return = serial.windows['oos_final_balance'][0] / 10000.0
+        self.assertAlmostEqual(equity.iloc[seam - 1], 10000.0 * first_return, places=6)
+
+    def test_empty_grid_and_unscorable_window(self):
+        with self.assertRaises(ValueError):
+            walk_forward(self.data, [], self.windows)
+
+        def nan_first_train(tape, result, balance=10000.0):
+            row = summarize_replay(tape, result, balance)
+            if tape.times[0] < self.windows[1].train_start:
+                row['sharpe'] = float('nan')
+            return row
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch('simulation.sweep.walk_forward.summarize_replay', nan_first_train):
+                result = quiet(walk_forward, self.data, self.grid, self.windows, BacktestConfig(),
+                               history_start="2019-01-15", work_dir=tmp, processes=1)
+            full = quiet(walk_forward, self.data, self.grid, self.windows, BacktestConfig(),
+                         history_start="2019-01-15", work_dir=tmp, processes=1)
+
+        rows = result.windows
+        self.assertEqual(rows.loc[0, 'skipped'], "no finite train sharpe")
+        self.assertTrue(pd.isna(rows.loc[1, 'skipped']) and full.windows['skipped'].isna().all())
+        self.assertTrue(rows.loc[0, ['point_id', 'train_sharpe', 'oos_trades']].isna().all())
+        self.assertEqual(rows.loc[1, 'point_id'], full.windows.loc[1, 'point_id'])
+        # Only the second window trades, starting from the initial balance
+        self.assertGreaterEqual(result.equity.index[0], self.windows[1].test_start)
+        self.assertTrue((result.trades['window'] == 1).all())
+        self.assertAlmostEqual(result.equity.iloc[-1], rows.loc[1, 'oos_final_balance'], places=6)
+
+    def test_tapes_and_defaults_follow_the_base_config(self):
+        grid = [{'sl_buffer': 200.0}]
+        base = BacktestConfig(gasket_multiple=0.5, initial_balance=50000.0, max_open_positions=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            default = quiet(walk_forward, self.data, grid, self.windows, BacktestConfig(),
+                            history_start="2019-01-15", work_dir=tmp, processes=1)
+            result = quiet(walk_forward, self.data, grid, self.windows, base,
+                           history_start="2019-01-15", work_dir=tmp, processes=1)
+            self.assertEqual(len(os.listdir(tmp)), 2)
+            capped = quiet(walk_forward, self.data, grid, self.windows, replace(base, max_open_positions=10),
+                           history_start="2019-01-15", work_dir=tmp, processes=1)
+
+        self.assertNotEqual(list(result.windows['oos_trades']), list(default.windows['oos_trades']))
+        self.assertLess(result.windows['oos_trades'].sum(), capped.windows['oos_trades'].sum())
+        first = result.windows['oos_final_balance'][0] / 50000.0
+        seam = result.equity.index.searchsorted(self.windows[1].test_start)
+        self.assertAlmostEqual(result.equity.iloc[seam - 1], 50000.0 * first, places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+from core.models.structures import ZONE_FIELDS
+from simulation.engine.zone_dataset import read_zones, write_zones, zone_arrays, zone_schema
+from tests.synthetic import make_backtester, quiet
+
+
+class TestZoneDataset(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.bt = make_backtester()
+        quiet(cls.bt.run_detection_pipeline)
+        quiet(cls.bt.run_simulation)
+        cls.zones = [z for zones in cls.bt.zones.values() for z in zones]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip_matches_zones(self):
+        path = os.path.join(self.tmp.name, "run", "zones.parquet")
+        self.assertEqual(self.bt.export_zones(path), len(self.zones))
+        table = read_zones(path)
+        self.assertEqual(table.schema, zone_schema())
+        self.assertEqual(table.column_names, ['symbol'] + list(ZONE_FIELDS))
+
+        df = table.to_pandas()
+        self.assertTrue((df['symbol'] == 'BTCUSDT').all())
+        self.assertEqual(list(df['zone_id']), [z.zone_id for z in self.zones])
+        self.assertEqual(list(df['direction']), [z.direction.value for z in self.zones])
+        for col in ('L1_price', 'created_bar_index', 'touch_count', 'L2_touched', 'was_traded', 'parent_zone_id'):
+            self.assertEqual(list(df[col]), [getattr(z, col) for z in self.zones], col)
+        for col in ('zone_created_time', 'L1_touch_time', 'L2_touch_time', 'invalidation_time'):
+            expected = [pd.Timestamp(getattr(z, col)) if getattr(z, col) is not None else pd.NaT for z in self.zones]
+            self.assertEqual(list(df[col]), expected, col)
+        # The run left a mix of touched/traded and pristine zones
+        self.assertTrue(df['L1_touch_time'].notna().any() and df['L1_touch_time'].isna().any())
+        self.assertTrue(df['was_traded'].any())
+
+    def test_filtered_arrays_and_ipc(self):
+        for name in ("zones.parquet", "zones.arrow"):
+            path = os.path.join(self.tmp.name, name)
+            write_zones(path, self.bt.zones, "BTCUSDT")
+            arrays = zone_arrays(path, ['zone_id', 'L1_price', 'L2_touch_time', 'timeframe'],
+                                 filter=(pc.field('timeframe') == 'H1') & pc.field('L2_touched'))
+            expected = [z for z in self.zones if z.timeframe == 'H1' and z.L2_touched]
+            self.assertEqual(list(arrays['zone_id']), [z.zone_id for z in expected])
+            self.assertEqual(arrays['L1_price'].dtype, np.float64)
+            self.assertEqual(arrays['L2_touch_time'].dtype, np.dtype('datetime64[ns]'))
+            self.assertFalse(np.isnat(arrays['L2_touch_time']).any())
+            self.assertTrue((arrays['timeframe'] == 'H1').all())
+
+    def test_empty(self):
+        path = os.path.join(self.tmp.name, "empty.parquet")
+        self.assertEqual(write_zones(path, {}), 0)
+        self.assertEqual(read_zones(path).schema, zone_schema())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+import pandas as pd
+from core.detectors.b2b_engine import detect_b2b_zones
+from core.detectors.swing_points import detect_swings
+from core.models.structures import NO_ZONE, SignalDirection, generate_zone_id, zone_keys, zone_label
+from tests.synthetic import make_backtester, make_market, quiet
+
+
+class TestZoneKeys(unittest.TestCase):
+    def test_vectorized_matches_scalar(self):
+        rng = np.random.default_rng(1)
+        n = 1000
+        l1 = rng.uniform(1000, 70000, n)
+        l2 = l1 - rng.uniform(10, 500, n)
+        t = pd.date_range("2020-01-01", periods=n, freq="h")
+        dirs = [SignalDirection.BULLISH, SignalDirection.BEARISH] * (n // 2)
+        keys = zone_keys(l1, l2, 'H1', dirs, t.as_unit('ns').asi8)
+        self.assertEqual(keys.dtype, np.int64)
+        self.assertEqual(len(np.unique(keys)), n)
+        self.assertFalse((keys == NO_ZONE).any())
+        for k in (0, 17, n - 1):
+            self.assertEqual(generate_zone_id(l1[k], l2[k], 'H1', dirs[k], t[k].to_pydatetime()), keys[k])
+
+    def test_every_component_changes_the_key(self):
+        t = pd.Timestamp("2021-05-03 04:00")
+        base = generate_zone_id(50000.0, 49000.0, 'H4', SignalDirection.BULLISH, t)
+        self.assertEqual(base, generate_zone_id(50000.0 + 1e-10, 49000.0, 'H4', SignalDirection.BULLISH, t))
+        variants = [
+            generate_zone_id(50000.01, 49000.0, 'H4', SignalDirection.BULLISH, t),
+            generate_zone_id(50000.0, 49000.01, 'H4', SignalDirection.BULLISH, t),
+            generate_zone_id(50000.0, 49000.0, 'H1', SignalDirection.BULLISH, t),
+            generate_zone_id(50000.0, 49000.0, 'H4', SignalDirection.BEARISH, t),
+            generate_zone_id(50000.0, 49000.0, 'H4', SignalDirection.BULLISH, t + pd.Timedelta(1, 'ns')),
+        ]
+        self.assertEqual(len({base, *variants}), 6)
+
+    def test_label(self):
+        self.assertEqual(zone_label(0x1234abcd), "000000001234abcd")
+        self.assertEqual(zone_label(-1), "ffffffffffffffff")
+        self.assertEqual(zone_label("D1_PARENT"), "D1_PARENT")
+
+    def test_detected_zones_and_tape_carry_integer_keys(self):
+        df = make_market(200)['H1'].reset_index()
+        zones = detect_b2b_zones(df, detect_swings(df), tf='H1')
+        self.assertTrue(zones)
+        ids = [z.zone_id for z in zones]
+        self.assertTrue(all(type(i) is int for i in ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(zones[0].label, zone_label(ids[0]))
+
+        bt = make_backtester()
+        quiet(bt.run_detection_pipeline)
+        quiet(bt.run_simulation, record_tape=True)
+        tape = bt.signal_tape
+        self.assertEqual(tape.zone_id.dtype, np.int64)
+        self.assertEqual(tape.origin_id.dtype, np.int64)
+        self.assertGreater(len(tape), 0)
+        for trade in bt.trade_manager.ledger:
+            self.assertIsInstance(trade.origin_id, int)
+
+
+if __name__ == '__main__':
+    unittest.main()
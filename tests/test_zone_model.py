@@ -0,0 +1,63 @@
+import copy
+import pickle
+import sys
+import unittest
+from dataclasses import replace
+import pandas as pd
+from core.models.structures import B2BZoneInfo, OUTCOME_FIELDS, ZONE_FIELDS, SignalDirection, ZoneTradeOutcome
+
+
+class TestZoneModel(unittest.TestCase):
+    def setUp(self):
+        self.zone = B2BZoneInfo(zone_id=42, timeframe="H1", direction=SignalDirection.BULLISH,
+                                L1_price=100.0, L2_price=90.0, zone_created_time=pd.Timestamp("2020-01-01"))
+
+    def test_slotted(self):
+        self.assertFalse(hasattr(self.zone, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.zone.not_a_field = 1
+        self.assertLess(sys.getsizeof(self.zone), 600)
+
+    def test_outcome_attached_on_first_write(self):
+        z = self.zone
+        self.assertIsNone(z.outcome)
+        self.assertEqual((z.pnl_money, z.exit_reason, z.trade_open_time), (0.0, "", None))
+        z.rr_planned = 0.0  # Writing a default does not allocate
+        self.assertIsNone(z.outcome)
+
+        z.pnl_money = 125.5
+        z.exit_reason = "Take Profit"
+        self.assertIsInstance(z.outcome, ZoneTradeOutcome)
+        self.assertEqual((z.pnl_money, z.outcome.exit_reason), (125.5, "Take Profit"))
+
+    def test_constructor_compatibility(self):
+        # Positional order of the detection/lifecycle fields is unchanged
+        z = B2BZoneInfo(7, "H4", SignalDirection.BEARISH, 200.0, 210.0, 205.0)
+        self.assertEqual((z.zone_id, z.timeframe, z.fifty_percent), (7, "H4", 205.0))
+        self.assertEqual(ZONE_FIELDS[:4], ('zone_id', 'timeframe', 'direction', 'L1_price'))
+        self.assertEqual(ZONE_FIELDS[-3:], ('atr_at_creation', 'session_created', 'was_traded'))
+
+        # Outcome fields are keyword-only and fill the lazy record
+        traded = B2BZoneInfo(zone_id=8, was_traded=True, entry_price=101.5, exit_reason="Stop Loss")
+        self.assertIsInstance(traded.outcome, ZoneTradeOutcome)
+        self.assertEqual((traded.entry_price, traded.outcome.exit_reason), (101.5, "Stop Loss"))
+        self.assertIsNone(B2BZoneInfo(zone_id=9, pnl_money=0.0).outcome)
+        with self.assertRaises(TypeError):
+            B2BZoneInfo(*range(len(ZONE_FIELDS) + 1))
+
+    def test_copies_and_records(self):
+        z = self.zone
+        z.L1_touched = True
+        z.pnl_points = 3.0
+        for other in (pickle.loads(pickle.dumps(z)), copy.deepcopy(z), replace(z)):
+            self.assertEqual(other, z)
+            self.assertEqual(other.pnl_points, 3.0)
+
+        row = z.as_dict()
+        self.assertEqual(list(row), list(ZONE_FIELDS) + list(OUTCOME_FIELDS))
+        self.assertNotIn('outcome', row)
+        self.assertEqual((row['zone_id'], row['L1_touched'], row['pnl_points'], row['pnl_money']), (42, True, 3.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()